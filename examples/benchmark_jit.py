@@ -0,0 +1,98 @@
+# examples/benchmark_jit.py
+"""Benchmark the numba fused loop against the pandas and NumPy scoring paths.
+
+    python examples/benchmark_jit.py --rows 1000000 10000000
+
+Each path scores the same synthetic parts against one frozen state. The
+"kernel" rows time only features, weighted sum and boosts
+(``kernel.boosted_scores``); the "score" rows time ``PartScorer.score``
+end to end, including normalization, percentiles and the output frame.
+The first jit call compiles the loop and is reported separately.
+"""
+
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from part_priority_scoring import PartScorer
+from part_priority_scoring.config.settings import get_default_config
+from part_priority_scoring.core import kernel
+from part_priority_scoring.core.fused import NUMBA_AVAILABLE
+
+
+def synthetic_parts(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'pn': np.arange(n),
+        'inventory': rng.integers(0, 5000, n),
+        'leadtime_weeks': rng.integers(0, 26, n).astype(float),
+        'moq': rng.integers(1, 500, n).astype(float),
+        'demand_all_time': rng.integers(0, 2000, n),
+        'source_type': pd.Categorical(rng.choice(['Authorized', 'Broker'], n)),
+        'datasheet': rng.choice(['url', None], n),
+    })
+
+
+def make_config(engine: str, jit: bool = False) -> dict:
+    config = get_default_config()
+    config['engine'] = engine
+    config['jit'] = jit
+    config['percentile'] = 'reference'
+    return config
+
+
+def best_of(function, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000, 10_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--skip-pandas', action='store_true', help="Skip the slow pandas engine")
+    args = parser.parse_args(argv)
+
+    if not NUMBA_AVAILABLE:
+        print("numba is not installed: the jit rows below use the NumPy fallback")
+
+    # The pandas engine fits the features the weights and boosts use, like the others
+    config = make_config('numpy')
+    state = PartScorer(make_config('pandas')).fit(synthetic_parts(100_000, seed=1)).state
+    engines = [('numpy', False), ('numpy', True)]
+    if not args.skip_pandas:
+        engines.insert(0, ('pandas', False))
+
+    start = time.perf_counter()
+    kernel.boosted_scores(synthetic_parts(10), config['weights'], config['features'], state, jit=True)
+    print(f"jit warm-up (includes compilation): {time.perf_counter() - start:.2f}s")
+
+    for n_rows in args.rows:
+        df = synthetic_parts(n_rows)
+        print(f"\n{n_rows:,} rows")
+
+        numpy_seconds = None
+        for jit in (False, True):
+            seconds = best_of(lambda: kernel.boosted_scores(df, config['weights'], config['features'],
+                                                            state, jit=jit), args.repeat)
+            numpy_seconds = numpy_seconds or seconds
+            label = 'kernel + jit' if jit else 'kernel'
+            print(f"  {label:<18} {seconds:8.3f}s  {numpy_seconds / seconds:5.1f}x")
+
+        baseline = None
+        for engine, jit in engines:
+            part_scorer = PartScorer(make_config(engine, jit), state)
+            seconds = best_of(lambda: part_scorer.score(df), args.repeat)
+            baseline = baseline or seconds
+            label = f"score {engine}{' + jit' if jit else ''}"
+            print(f"  {label:<18} {seconds:8.3f}s  {baseline / seconds:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
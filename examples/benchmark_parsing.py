@@ -0,0 +1,89 @@
+# examples/benchmark_parsing.py
+"""Benchmark vectorized lead-time and demand JSON parsing against row-wise Python.
+
+    python examples/benchmark_parsing.py --rows 1000000 5000000
+
+The raw columns mimic an export of ``datadojo.prod.panda`` and
+``demand_normalized``. Most lead times read "<n> Weeks" and most demand
+JSON is in the compact layout, with a share in other formats that take
+the slower paths. The row-wise baseline applies ``re`` and ``json.loads``
+per row, as a pandas ``.map`` would.
+"""
+
+import re
+import json
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from part_priority_scoring.core.parsing import parse_leadtime, parse_demand_totals
+
+
+def raw_columns(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    leadtimes = np.array([f'{w} Weeks' for w in range(1, 53)] +
+                         ['1 Week', 'In Stock', '10 Days', '3 days', 'Call for availability'], dtype=object)
+    leadtime = leadtimes[rng.integers(0, len(leadtimes), n)]
+    leadtime[rng.random(n) < 0.1] = None
+
+    index = rng.lognormal(1, 1, n).round(3)
+    layouts = rng.random(n)
+    demand_totals = np.where(
+        layouts < 0.9,
+        [f'{{"demand_totals": [{{"demand_index": {d}, "period": "all"}}]}}' for d in index],
+        [f'{{"pn": "X", "demand_totals": [{{"period": "all", "demand_index": {d}}}]}}' for d in index]
+    ).astype(object)
+    demand_totals[layouts > 0.98] = None
+    return pd.DataFrame({'leadtime': pd.Series(leadtime, dtype='str'),
+                         'demand_totals': pd.Series(demand_totals, dtype='str')})
+
+
+def leadtime_rowwise(value) -> float:
+    if not isinstance(value, str):
+        return np.nan
+    match = re.search(r'(\d+)\s*Week', value)
+    return float(match.group(1)) if match else np.nan
+
+
+def demand_rowwise(value) -> float:
+    try:
+        return float(json.loads(value)['demand_totals'][0]['demand_index'])
+    except (TypeError, ValueError, KeyError, IndexError):
+        return np.nan
+
+
+def best_of(function, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000, 5_000_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--skip-rowwise', action='store_true', help="Skip the slow row-wise baseline")
+    args = parser.parse_args(argv)
+
+    for n_rows in args.rows:
+        df = raw_columns(n_rows)
+        print(f"\n{n_rows:,} rows")
+
+        cases = [('leadtime', parse_leadtime, leadtime_rowwise),
+                 ('demand_totals', parse_demand_totals, demand_rowwise)]
+        for column, vectorized, rowwise in cases:
+            seconds = best_of(lambda: vectorized(df[column]), args.repeat)
+            line = f"  {column:<14} vectorized {seconds:7.3f}s  {n_rows / seconds / 1e6:6.1f}M rows/s"
+            if not args.skip_rowwise:
+                baseline = best_of(lambda: df[column].map(rowwise), 1)
+                line += f"  row-wise {baseline:7.3f}s  {baseline / seconds:5.1f}x"
+            print(line)
+
+
+if __name__ == '__main__':
+    main()
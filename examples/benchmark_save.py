@@ -0,0 +1,142 @@
+# examples/benchmark_save.py
+"""Benchmark the chunked result writer against a single-job save.
+
+    python examples/benchmark_save.py --rows 1000000 5000000 --mbps 200
+
+Both paths write a scored frame with the ``part_scores`` columns to a
+local directory. The single-job baseline does what ``save_results`` used
+to do before handing the frame to ``load_table_from_dataframe``: copy the
+frame, add the metadata columns and serialize everything to one Parquet
+file. ``--mbps`` simulates the upload bandwidth of one connection, so the
+concurrent chunk uploads show up in the timings. Extra memory is the
+peak resident set size above the level before each run (Linux only).
+"""
+
+import os
+import time
+import shutil
+import threading
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from part_priority_scoring.core.result_writer import (ResultWriter, LocalSink, PART_SCORES_SCHEMA,
+                                                      PIPELINE_VERSION)
+
+
+class ThrottledSink(LocalSink):
+    """Local sink that takes as long as uploading at ``mbps`` would."""
+
+    def __init__(self, path, mbps: float):
+        super().__init__(path)
+        self.mbps = mbps
+
+    def upload(self, part, data):
+        super().upload(part, data)
+        time.sleep(data.size / (self.mbps * 1e6 / 8))
+
+
+def scored_parts(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'pn': [f'PART{i:08d}' for i in range(n)],
+        'category': rng.choice(['ic', 'passive', 'connector'], n),
+        'inventory': rng.integers(0, 5000, n),
+        'leadtime_weeks': rng.integers(0, 26, n),
+        'moq': rng.integers(1, 500, n).astype(float),
+        'demand_all_time': rng.integers(0, 2000, n),
+        'source_type': rng.choice(['Authorized', 'Broker'], n),
+        'datasheet': rng.choice(['url', None], n),
+        'base_score': rng.random(n),
+        'boosted_score': rng.random(n),
+        'priority_score': rng.random(n) * 100,
+        'score_percentile': rng.random(n) * 100,
+    })
+
+
+class PeakMemory:
+    """Samples the resident set size on a thread while in the block."""
+
+    def __enter__(self):
+        self.start = self.peak = _rss()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    @property
+    def extra(self) -> int:
+        return self.peak - self.start
+
+    def _sample(self):
+        while not self._stop.wait(0.005):
+            self.peak = max(self.peak, _rss())
+
+
+def _rss() -> int:
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        return 0
+
+
+def single_job(df: pd.DataFrame, path: Path, mbps: float):
+    df = df.copy()
+    df['processed_at'] = pd.Timestamp.now()
+    df['pipeline_version'] = PIPELINE_VERSION
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    path.mkdir()
+    pq.write_table(table, path / 'part-00000.parquet')
+    time.sleep((path / 'part-00000.parquet').stat().st_size / (mbps * 1e6 / 8))
+
+
+def chunked(df: pd.DataFrame, path: Path, mbps: float, chunk_rows: int, workers: int):
+    metadata = {'processed_at': pd.Timestamp.now(tz='UTC'), 'pipeline_version': PIPELINE_VERSION}
+    ResultWriter(ThrottledSink(path, mbps), chunk_rows=chunk_rows, max_workers=workers).write(
+        df, metadata, PART_SCORES_SCHEMA)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000, 5_000_000])
+    parser.add_argument('--mbps', type=float, default=200, help="Simulated upload bandwidth per connection")
+    parser.add_argument('--chunk-rows', type=int, default=1_000_000)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args(argv)
+
+    pool = pa.default_memory_pool()
+    if not _rss():
+        print("/proc/self/statm is not available: extra memory reads 0")
+    for n_rows in args.rows:
+        df = scored_parts(n_rows)
+        print(f"\n{n_rows:,} rows, frame {df.memory_usage(deep=True).sum() / 2 ** 20:,.0f} MiB")
+
+        cases = [('single job', lambda path: single_job(df, path, args.mbps)),
+                 ('chunked', lambda path: chunked(df, path, args.mbps, args.chunk_rows, args.workers))]
+        baseline = None
+        for label, run in cases:
+            directory = Path(tempfile.mkdtemp())
+            pool.release_unused()
+            with PeakMemory() as memory:
+                start = time.perf_counter()
+                run(directory / 'out')
+                seconds = time.perf_counter() - start
+            shutil.rmtree(directory)
+
+            baseline = baseline or seconds
+            print(f"  {label:<11} {seconds:7.2f}s  {n_rows / seconds / 1e6:5.2f}M rows/s  "
+                  f"{baseline / seconds:4.1f}x  extra memory {memory.extra / 2 ** 20:,.0f} MiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,10 +2,20 @@
 
 from .core.scorer import PartScorer
 from .core.data_loader import DataLoader
+from .core.file_loader import FileDataLoader
 from .core.feature_engineer import FeatureEngineer
+from .core.state import ScalingState
+from .core.explain import ScoreExplanation
+from .core.streaming import ChunkedScorer, score_parts_iter
+from .core.parallel import ParallelScorer
+from .core.incremental import IncrementalScorer
+from .core.compiled import CompiledScorer
+from .core.parsing import parse_raw_columns
 
 __version__ = "1.0.0"
-__all__ = ["PartScorer", "DataLoader", "FeatureEngineer", "score_parts"]
+__all__ = ["PartScorer", "DataLoader", "FileDataLoader", "FeatureEngineer", "ScalingState", "ScoreExplanation",
+           "ChunkedScorer", "ParallelScorer", "IncrementalScorer", "CompiledScorer",
+           "score_parts", "score_parts_iter", "parse_raw_columns"]
 
 def score_parts(df, weights_config=None, feature_config=None):
     """Convenience function to score parts dataframe."""
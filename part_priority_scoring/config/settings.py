@@ -25,6 +25,13 @@ def get_default_config() -> Dict[str, Any]:
     return {
         'features': feature_config,
         'weights': weights_config.get('base_weights', weights_config),
+        'weight_variants': weights_config.get('weight_variants', {}),
+        'boosts': weights_config.get('business_boosts', _get_default_boosts_config()),
+        'engine': 'pandas',  # 'pandas', 'numpy' (fused kernel, result columns only) or 'arrow' (Arrow/Polars in and out)
+        'percentile': 'rank',  # 'rank', 'histogram' or 'reference' (fitted state)
+        'compact': False,  # float32 features, uint8 flags, categorical strings
+        'jit': False,  # numba-compiled fused loop for the numpy/arrow engines, if numba is installed
+        'inplace': False,  # pandas/numpy engines append to the caller's frame instead of copying it
         'project_id': None,  # To be set by user
         'dataset': 'datadojo.part_priority_scoring'
     }
@@ -35,7 +42,8 @@ def _get_default_feature_config() -> Dict[str, Any]:
         'log_transforms': ['inventory', 'moq'],  
         'inverse_transforms': ['leadtime_weeks', 'moq'], 
         'binary_features': ['is_authorized', 'has_datasheet', 'in_stock', 'immediate_availability'],
-        'composite_features': ['availability_score', 'demand_score']
+        'composite_features': ['availability_score', 'demand_score'],
+        'scaling_error': None
     }
 
 def _get_default_weights_config() -> Dict[str, Any]:
@@ -50,6 +58,19 @@ def _get_default_weights_config() -> Dict[str, Any]:
         # Removed: 'has_datasheet': 0.05 (redistributed to other weights)
     }
 
+def _get_default_boosts_config() -> Dict[str, Any]:
+    """Default business rule boosts, mirroring weights.yaml."""
+    return {
+        'ample_stock': {
+            'condition': 'inventory >= 10 * moq',
+            'multiplier': 1.1,
+            'defaults': {'moq': 1}
+        },
+        'immediate_ship': {'condition': 'leadtime_weeks == 0', 'multiplier': 1.15},
+        'authorized_source': {'condition': "source_type == 'Authorized'", 'multiplier': 1.05},
+        'high_demand': {'condition': 'demand_all_time > 100', 'multiplier': 1.08}
+    }
+
 def load_config_file(config_path: str) -> Dict[str, Any]:
     """Load configuration from YAML file."""
     with open(config_path, 'r') as f:
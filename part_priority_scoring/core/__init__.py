@@ -2,6 +2,15 @@
 
 from .scorer import PartScorer
 from .data_loader import DataLoader
+from .file_loader import FileDataLoader
 from .feature_engineer import FeatureEngineer
+from .state import ScalingState
+from .explain import ScoreExplanation
+from .streaming import ChunkedScorer, score_parts_iter
+from .parallel import ParallelScorer
+from .incremental import IncrementalScorer
+from .compiled import CompiledScorer
+from .parsing import parse_raw_columns
 
-__all__ = ["PartScorer", "DataLoader", "FeatureEngineer"]
+__all__ = ["PartScorer", "DataLoader", "FileDataLoader", "FeatureEngineer", "ScalingState", "ScoreExplanation",
+           "ChunkedScorer", "ParallelScorer", "IncrementalScorer", "CompiledScorer", "score_parts_iter", "parse_raw_columns"]
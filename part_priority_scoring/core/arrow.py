@@ -0,0 +1,101 @@
+"""Apache Arrow input and output for the scoring engines.
+
+The ``'arrow'`` engine is a conversion layer around the NumPy kernel, not
+a separate compute engine. Tables (and Polars frames, which are Arrow
+underneath) are read column by column with ``pyarrow.compute`` into the
+float arrays the kernel works on, without a detour through pandas, and the
+score arrays are appended back as Arrow columns. Columns that are already
+float64 with no nulls are used in place. Pandas dataframes are scored by
+the numpy engine path directly instead of being converted.
+"""
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from typing import Any, Dict
+
+# Strings that pandas.to_numeric accepts, for coercing string columns
+_NUMBER = r'^\s*[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?\s*$'
+
+
+def is_polars(data: Any) -> bool:
+    """True for Polars DataFrames and LazyFrames, without importing polars."""
+    return type(data).__module__.split('.')[0] == 'polars'
+
+
+def to_arrow(data: Any) -> pa.Table:
+    """Arrow table for a Table, RecordBatch or Polars frame.
+
+    Polars frames convert without copying; LazyFrames are collected first.
+    """
+    if isinstance(data, pa.Table):
+        return data
+    if isinstance(data, pa.RecordBatch):
+        return pa.Table.from_batches([data])
+    if is_polars(data):
+        if hasattr(data, 'collect'):
+            data = data.collect()
+        return data.to_arrow()
+    raise ValueError(f"Cannot score data of type {type(data).__name__} with the arrow engine")
+
+
+def from_arrow(table: pa.Table, like: Any) -> Any:
+    """Table converted back to the kind of input it was built from."""
+    if is_polars(like):
+        import polars as pl
+
+        return pl.from_arrow(table)
+    return table
+
+
+def column_as_float(column: pa.ChunkedArray, name: str) -> np.ndarray:
+    """Arrow equivalent of ``kernel._column_as_float``: float64, NaN for missing values."""
+    column = _decode(column)
+    if name == 'source_type':
+        column = pc.fill_null(pc.equal(column, 'Authorized'), False)
+    elif name == 'datasheet':
+        valid = pc.is_valid(column)
+        if pa.types.is_floating(column.type):
+            valid = pc.and_(valid, pc.invert(pc.is_nan(column)))
+        column = valid
+    elif pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+        column = pc.if_else(pc.match_substring_regex(column, _NUMBER), pc.utf8_trim_whitespace(column), None)
+
+    if column.type != pa.float64():
+        column = pc.cast(column, pa.float64())
+    return _to_numpy(column)
+
+
+def column_as_object(column: pa.ChunkedArray) -> np.ndarray:
+    """Raw values for string comparisons, None for missing values."""
+    return _decode(column).to_numpy(zero_copy_only=False)
+
+
+def group_codes(column: pa.ChunkedArray) -> np.ndarray:
+    """Integer code of each row's value, with missing values as their own group."""
+    encoded = pc.dictionary_encode(_decode(column), null_encoding='encode').combine_chunks()
+    return encoded.indices.to_numpy(zero_copy_only=False).astype(np.int64)
+
+
+def with_columns(table: pa.Table, columns: Dict[str, np.ndarray]) -> pa.Table:
+    """Table with the given columns appended, replacing any of the same name."""
+    for name, values in columns.items():
+        if name in table.column_names:
+            table = table.set_column(table.column_names.index(name), name, pa.array(values))
+        else:
+            table = table.append_column(name, pa.array(values))
+    return table
+
+
+def _decode(column: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Dictionary-encoded (e.g. Polars categorical) columns as plain values."""
+    if pa.types.is_dictionary(column.type):
+        return pc.cast(column, column.type.value_type)
+    return column
+
+
+def _to_numpy(column: pa.ChunkedArray) -> np.ndarray:
+    """Float64 column as a NumPy array; a view when it is one chunk with no nulls."""
+    if column.num_chunks == 1 and column.null_count == 0:
+        return column.chunk(0).to_numpy(zero_copy_only=True)
+    return column.to_numpy()
@@ -0,0 +1,183 @@
+"""Declarative business rule boosts compiled into a vectorized evaluator."""
+
+import re
+import operator
+import pandas as pd
+import numpy as np
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Mapping
+
+logger = logging.getLogger(__name__)
+
+OPERATORS = {
+    '>=': operator.ge,
+    '<=': operator.le,
+    '>': operator.gt,
+    '<': operator.lt,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+_CONDITION = re.compile(r"^\s*([A-Za-z_]\w*)\s*(>=|<=|==|!=|>|<)\s*(.+?)\s*$")
+_STRING = re.compile(r"^(['\"])(.*)\1$")
+_SCALED_COLUMN = re.compile(r"^([-+]?[\d.]+(?:[eE][-+]?\d+)?)\s*\*\s*([A-Za-z_]\w*)$")
+_COLUMN_SCALED = re.compile(r"^([A-Za-z_]\w*)\s*\*\s*([-+]?[\d.]+(?:[eE][-+]?\d+)?)$")
+_IDENTIFIER = re.compile(r"^[A-Za-z_]\w*$")
+
+
+@dataclass
+class BoostRule:
+    """One business boost: ``column <operator> value [* value_column]``."""
+    name: str
+    column: str
+    operator: str
+    value: Any = None
+    value_column: str = None
+    multiplier: float = 1.0
+    defaults: Dict[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if self.operator not in OPERATORS:
+            raise ValueError(f"Unknown operator {self.operator!r} in boost {self.name}")
+        if self.value is None and self.value_column is None:
+            raise ValueError(f"Boost {self.name} needs a value or value_column")
+        if self.is_string and self.value_column is not None:
+            raise ValueError(f"Boost {self.name} cannot scale a column by a string")
+
+    @property
+    def is_string(self) -> bool:
+        """True when the rule compares the column against a string."""
+        return isinstance(self.value, str)
+
+    @property
+    def columns(self) -> List[str]:
+        """Input columns the rule reads."""
+        return [self.column] + ([self.value_column] if self.value_column else [])
+
+    @classmethod
+    def from_config(cls, name: str, spec: Dict[str, Any]) -> 'BoostRule':
+        """Build a rule from config.
+
+        The spec either has explicit ``column``/``operator``/``value``/
+        ``value_column`` fields or a ``condition`` string such as
+        ``"inventory >= 10 * moq"``, ``"leadtime_weeks == 0"`` or
+        ``"source_type == 'Authorized'"``.
+        """
+        spec = dict(spec)
+        multiplier = float(spec.pop('multiplier', 1.0))
+        defaults = spec.pop('defaults', None) or {}
+        spec.pop('description', None)
+
+        if 'condition' in spec:
+            spec.update(_parse_condition(name, spec.pop('condition')))
+
+        return cls(name=name, multiplier=multiplier, defaults=defaults, **spec)
+
+    def evaluate(self, columns: Mapping[str, Any], n_rows: int) -> np.ndarray:
+        """Boolean mask of rows the rule applies to.
+
+        Columns missing from the input use ``defaults``; without a default
+        the rule matches no rows.
+        """
+        left = self._values(columns, self.column, n_rows)
+        if left is None:
+            return np.zeros(n_rows, dtype=bool)
+
+        if self.value_column is None:
+            right = self.value
+        else:
+            right = self._values(columns, self.value_column, n_rows)
+            if right is None:
+                return np.zeros(n_rows, dtype=bool)
+            if self.value is not None:
+                right = self.value * right
+
+        return np.asarray(OPERATORS[self.operator](left, right), dtype=bool)
+
+    def _values(self, columns: Mapping[str, Any], name: str, n_rows: int):
+        """Column values as an array, falling back to the configured default."""
+        if name not in columns:
+            if name in self.defaults:
+                return np.full(n_rows, self.defaults[name], dtype=object if self.is_string else np.float64)
+            return None
+
+        values = columns[name]
+        if isinstance(values, pd.Series):
+            if self.is_string:
+                return values.to_numpy(dtype=object)
+            return pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        return values
+
+
+class CompiledBoosts:
+    """Boost rules compiled once and applied as a single multiplier array."""
+
+    def __init__(self, rules: List[BoostRule]):
+        """Initialize with validated rules, applied in order."""
+        self.rules = list(rules)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Dict[str, Any]]) -> 'CompiledBoosts':
+        """Compile the ``business_boosts`` mapping of rule name to spec."""
+        return cls([BoostRule.from_config(name, spec) for name, spec in (config or {}).items()])
+
+    @property
+    def columns(self) -> List[str]:
+        """Input columns read by any rule."""
+        return list(dict.fromkeys(col for rule in self.rules for col in rule.columns))
+
+    @property
+    def string_columns(self) -> List[str]:
+        """Columns compared against strings, which must stay unconverted."""
+        return list(dict.fromkeys(rule.column for rule in self.rules if rule.is_string))
+
+    def masks(self, columns: Mapping[str, Any], n_rows: int) -> Dict[str, np.ndarray]:
+        """Evaluate every rule, keyed by rule name."""
+        return {rule.name: rule.evaluate(columns, n_rows) for rule in self.rules}
+
+    def multiplier(self, columns: Mapping[str, Any], n_rows: int, factors: List = None) -> np.ndarray:
+        """Combined multiplier of all rules for each row.
+
+        When a ``factors`` list is given, each rule's per-row multiplier is
+        appended to it, for score explanations.
+        """
+        product = np.ones(n_rows, dtype=np.float64)
+        for rule in self.rules:
+            factor = np.where(rule.evaluate(columns, n_rows), rule.multiplier, 1.0)
+            if factors is not None:
+                factors.append(factor)
+            product *= factor
+        return product
+
+
+def _parse_condition(name: str, condition: str) -> Dict[str, Any]:
+    """Parse a condition string into rule fields."""
+    match = _CONDITION.match(condition)
+    if not match:
+        raise ValueError(f"Cannot parse condition for boost {name}: {condition!r}")
+
+    column, op, rhs = match.groups()
+    fields = {'column': column, 'operator': op}
+
+    string = _STRING.match(rhs)
+    scaled_column = _SCALED_COLUMN.match(rhs)
+    column_scaled = _COLUMN_SCALED.match(rhs)
+
+    if string:
+        fields['value'] = string.group(2)
+    elif scaled_column:
+        fields['value'] = float(scaled_column.group(1))
+        fields['value_column'] = scaled_column.group(2)
+    elif column_scaled:
+        fields['value'] = float(column_scaled.group(2))
+        fields['value_column'] = column_scaled.group(1)
+    elif _IDENTIFIER.match(rhs):
+        fields['value_column'] = rhs
+    else:
+        try:
+            fields['value'] = float(rhs)
+        except ValueError:
+            raise ValueError(f"Cannot parse condition for boost {name}: {condition!r}")
+
+    return fields
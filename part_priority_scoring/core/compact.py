@@ -0,0 +1,86 @@
+"""Compact dtypes to cut scoring memory."""
+
+import pandas as pd
+import numpy as np
+import logging
+from typing import Iterable
+
+logger = logging.getLogger(__name__)
+
+# Dtype of 0/1 flags such as is_authorized in compact mode
+FLAG_DTYPE = np.uint8
+
+FLOAT_DTYPE = np.float32
+
+# Bound on the float32 roundings a boosted score accumulates relative to its
+# magnitude: log/inverse features, robust scaling, the weighted sum and the
+# boost multipliers. Measured errors stay below 3 units of roundoff.
+SCORE_ROUNDINGS = 16
+
+
+def priority_tolerance(score_min: float, score_max: float) -> float:
+    """Largest priority_score difference between compact and full-precision scoring.
+
+    A boosted score off by ``d`` moves its priority by ``100 * d / range``,
+    and ``score_min`` and ``score_max`` are each off by as much, so the
+    normalized score moves by up to three times that. ``d`` is at most
+    ``SCORE_ROUNDINGS`` float32 roundings of the largest score magnitude,
+    and normalizing in float32 adds as many roundings on the 0-100 scale.
+    Rounding to 2 decimals can then flip the result by one 0.01 step.
+
+    Args:
+        score_min: Smallest full-precision boosted score
+        score_max: Largest full-precision boosted score
+
+    Returns:
+        Tolerance in priority_score points
+    """
+    unit = float(np.finfo(FLOAT_DTYPE).eps) / 2
+    magnitude = max(abs(score_min), abs(score_max)) / (score_max - score_min)
+    return 0.01 + 100 * (3 * magnitude + 1) * SCORE_ROUNDINGS * unit
+
+
+# Tolerance for any score range that contains zero, as it does for
+# robust-scaled features centered on their medians: about 0.0104
+PRIORITY_TOLERANCE = priority_tolerance(0.0, 1.0)
+
+
+def compact_frame(df: pd.DataFrame, columns: Iterable[str] = None,
+                  category_ratio: float = 0.5) -> pd.DataFrame:
+    """Dataframe with compact dtypes for the given columns.
+
+    - Integer columns are downcast to the smallest integer type that holds
+      their values (e.g. int8 for ``leadtime_weeks``), which is lossless.
+    - Float columns become float32.
+    - String columns with at most ``category_ratio`` distinct values per row
+      (``category``, ``manuf``, ``source_type``) become categoricals;
+      mostly-unique ones such as ``pn`` and ``desc`` are left as they are.
+
+    Other columns are shared with ``df`` rather than copied.
+
+    Args:
+        df: Input dataframe
+        columns: Columns to convert, e.g. the scoring inputs; missing ones
+            are skipped. All columns when None.
+        category_ratio: Maximum share of distinct values for a string
+            column to become categorical
+
+    Returns:
+        New dataframe with the same columns and index
+    """
+    columns = df.columns if columns is None else [col for col in dict.fromkeys(columns) if col in df.columns]
+    compacted = df.copy(deep=False)
+    for col in columns:
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series):
+            continue
+        elif pd.api.types.is_integer_dtype(series):
+            compacted[col] = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_float_dtype(series):
+            compacted[col] = series.astype(FLOAT_DTYPE)
+        elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            if len(series) and series.nunique(dropna=True) <= category_ratio * len(series):
+                compacted[col] = series.astype('category')
+
+    logger.debug(f"Compacted {len(columns)} of {len(df.columns)} columns")
+    return compacted
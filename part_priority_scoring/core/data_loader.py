@@ -1,48 +1,137 @@
 """Data loading utilities for BigQuery and other sources."""
 
+import uuid
 import pandas as pd
 import logging
-from typing import Optional, Dict, Any
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Union
 from google.cloud import bigquery
 from google.cloud.exceptions import GoogleCloudError
 
+from .storage_read import QueryResultStream, default_read_client
+from .query_cache import QueryCache
+from .score_snapshot import ScoreSnapshot
+from .result_writer import (ResultWriter, ResultSink, BigQuerySink, OUTPUT_SCHEMAS,
+                            PIPELINE_VERSION)
+
 logger = logging.getLogger(__name__)
 
 class DataLoader:
     """Load part and demand data from various sources."""
     
-    def __init__(self, project_id: str = None, dataset: str = None):
+    def __init__(self, project_id: str = None, dataset: str = None,
+                 cache: Union[QueryCache, str, Path] = None, credentials=None):
         """Initialize data loader.
         
         Args:
             project_id: Google Cloud Project ID
             dataset: BigQuery dataset name for output tables
+            cache: ``QueryCache`` or cache directory for query results,
+                see ``core/query_cache.py``
+            credentials: Google credentials for the query and Storage Read
+                clients, from ``google.auth.default()`` when None
         """
         self.project_id = project_id
         self.dataset = dataset or 'datadojo.part_priority_scoring'
         self.source_dataset = 'datadojo.prod'
+        self.cache = cache if cache is None or isinstance(cache, QueryCache) else QueryCache(cache)
+        self.credentials = credentials
         
         if project_id:
-            self.client = bigquery.Client(project=project_id)
+            self.client = bigquery.Client(project=project_id, credentials=credentials)
         else:
             self.client = None
     
-    def load_sample_data(self, limit: int = 10000) -> pd.DataFrame:
+    def load_sample_data(self, limit: int = 10000, as_arrow: bool = False, refresh: bool = False):
         """Load sample data from BigQuery - PRICING REMOVED.
         
+        With a ``cache``, a result cached for the same query is returned
+        without running it, so the random sample stays the same until the
+        entry expires.
+        
         Args:
             limit: Maximum number of rows to load
+            as_arrow: Return the query result as a ``pyarrow.Table`` for the
+                ``'arrow'`` scoring engine, skipping the pandas conversion
+            refresh: Run the query even if its result is cached, and
+                replace the cached result
             
         Returns:
-            Merged dataframe with part and demand data
+            Merged dataframe (or Arrow table) with part and demand data
         """
+        query = self._sample_query(limit)
+        params = {'project_id': self.project_id}
+        
+        if self.cache is not None and not refresh:
+            table = self.cache.get(query, params)
+            if table is not None:
+                return table if as_arrow else table.to_pandas()
+        
         if not self.client:
             raise ValueError("BigQuery client not initialized. Provide project_id.")
         
         logger.info(f"Loading sample data with limit {limit}")
         
+        try:
+            job = self.client.query(query)
+            if self.cache is None:
+                result_df = job.to_arrow() if as_arrow else job.to_dataframe()
+            else:
+                table = job.to_arrow()
+                self.cache.put(query, table, params)
+                result_df = table if as_arrow else table.to_pandas()
+            logger.info(f"Loaded {len(result_df)} rows")
+            return result_df
+        except GoogleCloudError as e:
+            logger.error(f"BigQuery error: {e}")
+            raise
+
+    def stream_sample_data(self, limit: int = 10000, max_streams: int = 4, columns: List[str] = None,
+                           read_client=None, prefetch: int = 8) -> QueryResultStream:
+        """Run the sample query and stream its result over the Storage Read API.
+
+        Unlike ``load_sample_data`` nothing is materialized: the result table
+        is read as Arrow record batches from parallel read streams while the
+        caller scores earlier batches.
+
+        Every iteration opens a new read session and downloads the result
+        again. ``ChunkedScorer`` and ``score_parts_iter`` iterate three times
+        to fit scaling, find the score range and score. To read the result
+        once, score each chunk with a ``PartScorer`` whose state was fitted
+        or loaded beforehand.
+
+        Args:
+            limit: Maximum number of rows to load
+            max_streams: Upper bound on the number of parallel read streams
+            columns: Columns to read, all when None
+            read_client: ``BigQueryReadClient`` to read with, created with
+                the loader's ``credentials`` when None
+            prefetch: Record batches buffered ahead of the consumer
+
+        Returns:
+            Re-iterable ``QueryResultStream`` of dataframe chunks, for
+            ``ChunkedScorer`` or ``score_parts_iter``
+        """
+        if not self.client:
+            raise ValueError("BigQuery client not initialized. Provide project_id.")
+
+        logger.info(f"Streaming sample data with limit {limit}")
+
+        try:
+            job = self.client.query(self._sample_query(limit))
+            job.result()  # Wait for the result table
+        except GoogleCloudError as e:
+            logger.error(f"BigQuery error: {e}")
+            raise
+
+        if read_client is None:
+            read_client = default_read_client(self.credentials)
+        return QueryResultStream(read_client, job.destination, max_streams, columns, prefetch)
+
+    def _sample_query(self, limit: int) -> str:
+        """SQL joining a random sample of parts with their demand."""
         # Query to join panda and demand data - REMOVED PRICING
-        query = f"""
+        return f"""
         WITH panda_sample AS (
           SELECT 
             pn,
@@ -84,43 +173,93 @@ class DataLoader:
         FROM panda_sample p
         LEFT JOIN demand_sample d ON p.pn = d.pn
         """
-        
-        try:
-            result_df = self.client.query(query).to_dataframe()
-            logger.info(f"Loaded {len(result_df)} rows")
-            return result_df
-        except GoogleCloudError as e:
-            logger.error(f"BigQuery error: {e}")
-            raise
     
-    def save_results(self, df: pd.DataFrame, table_name: str = 'part_scores'):
+    def save_results(self, df: pd.DataFrame, table_name: str = 'part_scores', batch_id: str = None,
+                     sink: ResultSink = None, chunk_rows: int = 1_000_000, max_workers: int = 4,
+                     mode: str = 'truncate', snapshot: Union[ScoreSnapshot, str, Path] = None) -> int:
         """Save scoring results to BigQuery.
         
+        The frame is not copied. It is converted to Parquet ``chunk_rows``
+        rows at a time, with ``processed_at``, ``pipeline_version`` and
+        ``batch_id`` added as constant columns, and the chunks are uploaded
+        concurrently (see ``core/result_writer.py``). For ``part_scores``
+        only the columns of its schema in ``sql/create_output_table.sql``
+        are written.
+        
+        In ``'merge'`` mode only parts that are new or whose written
+        columns changed since the last write recorded in ``snapshot`` are
+        uploaded, and they are merged into the table on ``pn``. Rows of
+        parts missing from ``df`` are kept. A given ``sink`` must merge on
+        ``pn``, e.g. ``LocalSink(path, merge_key='pn')``.
+        
         Args:
             df: Dataframe with scoring results
             table_name: Target table name
+            batch_id: Value of the ``batch_id`` column, generated from the
+                current time when None
+            sink: Destination to write to instead of the BigQuery table,
+                e.g. a ``LocalSink``
+            chunk_rows: Rows per uploaded Parquet chunk
+            max_workers: Chunks uploaded concurrently
+            mode: ``'truncate'`` to replace the table, ``'merge'`` to
+                upsert changed rows
+            snapshot: ``ScoreSnapshot`` or snapshot file of the rows last
+                written; required for ``'merge'``, and refreshed after a
+                ``'truncate'`` write when given. ``pn`` must then be unique.
+        
+        Returns:
+            Number of rows written
         """
-        if not self.client:
-            raise ValueError("BigQuery client not initialized. Provide project_id.")
+        if mode not in ('truncate', 'merge'):
+            raise ValueError(f"Unknown write mode: {mode}")
+        if snapshot is not None and not isinstance(snapshot, ScoreSnapshot):
+            snapshot = ScoreSnapshot(snapshot)
+        if mode == 'merge' and snapshot is None:
+            raise ValueError("Merge mode needs a snapshot of the last written scores")
+        if mode == 'merge' and sink is not None and sink.merge_key != 'pn':
+            raise ValueError("Merge mode needs a sink that merges on pn, e.g. LocalSink(path, merge_key='pn')")
         
-        # Add metadata
-        df = df.copy()
-        df['processed_at'] = pd.Timestamp.now()
-        df['pipeline_version'] = '1.0.0'
+        if sink is None:
+            if not self.client:
+                raise ValueError("BigQuery client not initialized. Provide project_id.")
+            table_id = f"{self.dataset}.{table_name}"
+            sink = BigQuerySink(self.client, table_id, write_disposition="WRITE_TRUNCATE",
+                                merge_key='pn' if mode == 'merge' else None)
+        else:
+            table_id = table_name
         
-        # Configure job
-        job_config = bigquery.LoadJobConfig(
-            write_disposition="WRITE_TRUNCATE",
-            create_disposition="CREATE_IF_NEEDED"
-        )
+        processed_at = pd.Timestamp.now(tz='UTC')
+        metadata = {
+            'processed_at': processed_at,
+            'pipeline_version': PIPELINE_VERSION,
+            'batch_id': batch_id or f"{processed_at:%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        }
+        schema = OUTPUT_SCHEMAS.get(table_name)
         
-        # Get table reference
-        table_id = f"{self.dataset}.{table_name}"
+        if snapshot is not None:
+            # Snapshot hashes and MERGE both match at most one row per part
+            if df['pn'].duplicated().any():
+                raise ValueError("Scores to diff against a snapshot must have unique pn values")
+            columns = schema.names if schema is not None else list(df.columns)
+            changed, keys = snapshot.diff(df, [col for col in columns if col not in metadata])
+        if mode == 'merge':
+            rows = df[changed]
+            if len(rows) == 0:
+                logger.info(f"No changed scores to save to {table_id}")
+                return 0
+        else:
+            rows = df
         
+        writer = ResultWriter(sink, chunk_rows=chunk_rows, max_workers=max_workers)
         try:
-            job = self.client.load_table_from_dataframe(df, table_id, job_config=job_config)
-            job.result()  # Wait for completion
-            logger.info(f"Saved {len(df)} rows to {table_id}")
+            writer.write(rows, metadata, schema)
+            logger.info(f"Saved {len(rows)} rows to {table_id} (batch {metadata['batch_id']})")
         except GoogleCloudError as e:
             logger.error(f"Error saving to BigQuery: {e}")
             raise
+        
+        if mode == 'merge':
+            snapshot.update(rows['pn'], keys[changed])
+        elif snapshot is not None:
+            snapshot.replace(df['pn'], keys)
+        return len(rows)
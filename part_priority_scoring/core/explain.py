@@ -0,0 +1,67 @@
+"""Per-feature score explanations collected during scoring."""
+
+import pandas as pd
+import numpy as np
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+# Explanations are stored at reduced precision to keep them small
+EXPLAIN_DTYPE = np.float32
+
+
+@dataclass
+class ScoreExplanation:
+    """Breakdown of each scored row, aligned with the scored dataframe.
+
+    ``base_score`` is the sum of a row's contributions, or 0 where
+    ``unavailable`` is set. ``boosted_score`` is the base score times the
+    product of the row's boost multipliers.
+    """
+    index: pd.Index
+    features: List[str]
+    # (rows, features): scaled feature value x weight
+    contributions: np.ndarray
+    rules: List[str]
+    # (rows, rules): multiplier each boost rule applied, 1.0 where it did not match
+    boost_multipliers: np.ndarray
+    # (rows,): base score zeroed for no inventory and lead time over 12 weeks
+    unavailable: np.ndarray
+
+    @classmethod
+    def from_collected(cls, collected: Dict[str, Any], index: pd.Index) -> 'ScoreExplanation':
+        """Build from the dict filled by ``kernel.boosted_scores`` or ``PartScorer``."""
+        n_rows = len(index)
+        return cls(
+            index=index,
+            features=list(collected.get('features', [])),
+            contributions=_stack(collected.get('contributions', []), n_rows),
+            rules=list(collected.get('rules', [])),
+            boost_multipliers=_stack(collected.get('boost_multipliers', []), n_rows),
+            unavailable=np.asarray(collected.get('unavailable', np.zeros(n_rows, dtype=bool)), dtype=bool),
+        )
+
+    def take(self, positions: np.ndarray) -> 'ScoreExplanation':
+        """Explanation of the rows at ``positions``, in that order."""
+        return ScoreExplanation(
+            index=self.index[positions],
+            features=self.features,
+            contributions=self.contributions[positions],
+            rules=self.rules,
+            boost_multipliers=self.boost_multipliers[positions],
+            unavailable=self.unavailable[positions],
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """One column per feature contribution and boost rule, plus ``unavailable``."""
+        frame = pd.DataFrame(self.contributions, index=self.index, columns=self.features)
+        boosts = pd.DataFrame(self.boost_multipliers, index=self.index,
+                              columns=[f'boost_{rule}' for rule in self.rules])
+        return pd.concat([frame, boosts], axis=1).assign(unavailable=self.unavailable)
+
+
+def _stack(columns: List[np.ndarray], n_rows: int) -> np.ndarray:
+    """Column arrays as one (rows, columns) float32 matrix."""
+    matrix = np.empty((n_rows, len(columns)), dtype=EXPLAIN_DTYPE)
+    for j, values in enumerate(columns):
+        matrix[:, j] = values
+    return matrix
@@ -3,22 +3,73 @@
 import pandas as pd
 import numpy as np
 import logging
-from sklearn.preprocessing import RobustScaler
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List
+
+from .state import ScalingState
+from .compact import FLAG_DTYPE, FLOAT_DTYPE, compact_frame
+from .features import SCALED_PREFIXES, feature_graph, resolve_features
+from .scaler import SketchScaler
 
 logger = logging.getLogger(__name__)
 
 class FeatureEngineer:
     """Create and transform features for part scoring."""
     
-    def __init__(self, config: Dict[str, Any] = None):
+    def __init__(self, config: Dict[str, Any] = None, state: ScalingState = None,
+                 compact: bool = False, features: Iterable[str] = None, inplace: bool = False):
         """Initialize feature engineer.
         
         Args:
             config: Feature engineering configuration
+            state: Frozen scaling state; when set, transform reuses it
+                instead of refitting the scaler on every batch
+            compact: Downcast inputs and build float32 features and uint8
+                flags (see ``core/compact.py``)
+            features: Features and columns needed downstream, e.g. weight
+                keys and boost rule columns. Only these and the features
+                they depend on are built, and only these are scaled. All
+                features are built when None.
+            inplace: Append features to the given frame instead of a copy.
+                Each feature is computed into one preallocated array that
+                becomes its column, and scaled input columns such as
+                ``demand_all_time`` are overwritten, so no input column is
+                duplicated. Cannot be combined with ``compact``.
         """
+        if inplace and compact:
+            raise ValueError("inplace and compact feature engineering cannot be combined")
+        
         self.config = config or {}
-        self.scaler = RobustScaler()
+        self.plan = resolve_features(features, self.config) if features is not None else None
+        self.scaler = self._new_scaler()
+        self.state = state
+        self.compact = compact
+        self.inplace = inplace
+    
+    def fit(self, df: pd.DataFrame) -> 'FeatureEngineer':
+        """Fit scaling state on a reference population.
+        
+        Args:
+            df: Reference dataframe
+            
+        Returns:
+            Self, with ``state`` holding the fitted medians and IQRs
+        """
+        if self.inplace:
+            return self._fit_arrays(df)
+        
+        df = self._create_features(self._compact(df) if self.compact else df.copy())
+        
+        scale_features = self._scale_columns(df)
+        self.state = ScalingState(n_rows=len(df))
+        
+        if scale_features:
+            self.scaler = self._new_scaler().update(df[scale_features])
+            stats = self.scaler.stats()
+            self.state.centers = {feature: stats[feature][0] for feature in scale_features}
+            self.state.scales = {feature: stats[feature][1] for feature in scale_features}
+            logger.info(f"Fitted scaling state for {len(scale_features)} features on {len(df)} rows")
+        
+        return self
     
     def transform(self, df: pd.DataFrame) -> pd.DataFrame:
         """Transform dataframe with engineered features.
@@ -27,9 +78,23 @@ class FeatureEngineer:
             df: Input dataframe
             
         Returns:
-            DataFrame with engineered features
+            DataFrame with engineered features; ``df`` itself in inplace mode
         """
-        df = df.copy()
+        if self.inplace:
+            return self._transform_inplace(df)
+        
+        df = self._compact(df) if self.compact else df.copy()
+        
+        # Create log, inverse, binary and composite features
+        df = self._create_features(df)
+        
+        # Scale features
+        df = self._scale_features(df)
+        
+        return df
+    
+    def _create_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Create all unscaled features."""
         
         # Create log features
         df = self._create_log_features(df)
@@ -43,9 +108,6 @@ class FeatureEngineer:
         # Create composite features
         df = self._create_composite_features(df)
         
-        # Scale features
-        df = self._scale_features(df)
-        
         return df
     
     def _create_log_features(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -53,8 +115,8 @@ class FeatureEngineer:
         log_features = self.config.get('log_transforms', ['inventory', 'moq']) 
         
         for feature in log_features:
-            if feature in df.columns:
-                df[f'log_{feature}'] = np.log1p(df[feature].fillna(0).clip(lower=0))
+            if feature in df.columns and self._builds(f'log_{feature}'):
+                df[f'log_{feature}'] = np.log1p(self._source(df, feature).fillna(0).clip(lower=0))
         
         return df
     
@@ -63,8 +125,8 @@ class FeatureEngineer:
         inverse_features = self.config.get('inverse_transforms', ['leadtime_weeks', 'moq'])  
         
         for feature in inverse_features:
-            if feature in df.columns:
-                df[f'inv_{feature}'] = 1 / (1 + df[feature].fillna(0).clip(lower=0))
+            if feature in df.columns and self._builds(f'inv_{feature}'):
+                df[f'inv_{feature}'] = 1 / (1 + self._source(df, feature).fillna(0).clip(lower=0))
         
         return df
     
@@ -72,20 +134,20 @@ class FeatureEngineer:
         """Create binary indicator features."""
         
         # Authorized source
-        if 'source_type' in df.columns:
-            df['is_authorized'] = (df['source_type'] == 'Authorized').astype(int)
+        if 'source_type' in df.columns and self._builds('is_authorized'):
+            df['is_authorized'] = (df['source_type'] == 'Authorized').astype(self._flag_dtype)
         
         # Has datasheet
-        if 'datasheet' in df.columns:
-            df['has_datasheet'] = df['datasheet'].notna().astype(int)
+        if 'datasheet' in df.columns and self._builds('has_datasheet'):
+            df['has_datasheet'] = df['datasheet'].notna().astype(self._flag_dtype)
         
         # In stock
-        if 'inventory' in df.columns:
-            df['in_stock'] = (df['inventory'] > 0).astype(int)
+        if 'inventory' in df.columns and self._builds('in_stock'):
+            df['in_stock'] = (df['inventory'] > 0).astype(self._flag_dtype)
         
         # Immediate availability
-        if 'leadtime_weeks' in df.columns:
-            df['immediate_availability'] = (df['leadtime_weeks'] == 0).astype(int)
+        if 'leadtime_weeks' in df.columns and self._builds('immediate_availability'):
+            df['immediate_availability'] = (df['leadtime_weeks'] == 0).astype(self._flag_dtype)
         
         return df
     
@@ -93,38 +155,203 @@ class FeatureEngineer:
         """Create composite features from multiple signals."""
         
         # Availability score (unchanged)
-        if all(col in df.columns for col in ['inventory', 'moq']):
+        if all(col in df.columns for col in ['inventory', 'moq']) and self._builds('availability_score'):
             in_stock_score = df.get('in_stock', 0) * 0.5
             immediate_score = df.get('immediate_availability', 0) * 0.3
-            inventory_ratio = (df['inventory'] / df['moq'].clip(lower=1)).clip(upper=10) * 0.2
+            inventory = self._source(df, 'inventory')
+            inventory_ratio = (inventory / self._source(df, 'moq').clip(lower=1)).clip(upper=10) * 0.2
             
-            df['availability_score'] = (in_stock_score + immediate_score + inventory_ratio).clip(0, 2)
+            availability_score = (in_stock_score + immediate_score + inventory_ratio).clip(0, 2)
+            df['availability_score'] = availability_score.astype(FLOAT_DTYPE) if self.compact else availability_score
         
         # Demand score (unchanged)
-        if 'demand_all_time' in df.columns:
-            df['demand_score'] = df['demand_all_time'].fillna(0)
+        if 'demand_all_time' in df.columns and self._builds('demand_score'):
+            df['demand_score'] = self._source(df, 'demand_all_time').fillna(0)
         
         return df
     
+    def _new_scaler(self) -> SketchScaler:
+        """Robust scaler, exact unless the config sets a ``scaling_error`` rank bound."""
+        return SketchScaler(error=self.config.get('scaling_error'))
+    
+    def _builds(self, feature: str) -> bool:
+        """Whether ``feature`` is needed, given the requested features."""
+        return self.plan is None or feature in self.plan.features
+    
+    def _compact(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Frame with compact dtypes for the raw columns features are built from."""
+        if self.plan is not None:
+            columns = self.plan.columns
+        else:
+            columns = [col for spec in feature_graph(self.config).values() for col in spec.inputs + spec.optional]
+        return compact_frame(df, columns)
+    
+    @property
+    def _flag_dtype(self):
+        """Dtype of binary indicator features."""
+        return FLAG_DTYPE if self.compact else int
+    
+    def _source(self, df: pd.DataFrame, col: str) -> pd.Series:
+        """Input column for feature arithmetic.
+        
+        In compact mode inputs may be downcast to int8/int16, so they are
+        widened to float32 first; ``1 + x`` must not overflow.
+        """
+        return df[col].astype(FLOAT_DTYPE) if self.compact else df[col]
+    
+    def _scale_columns(self, df: pd.DataFrame, features: Dict[str, np.ndarray] = None) -> List[str]:
+        """Columns that receive robust scaling: requested ones, or every prefixed column.
+        
+        ``features`` holds features not yet attached to ``df`` (inplace mode).
+        """
+        columns = list(df.columns) + [name for name in features or {} if name not in df.columns]
+        if self.plan is not None:
+            return [col for col in self.plan.scaled if col in columns]
+        return [col for col in columns if col.startswith(SCALED_PREFIXES)]
+    
     def _scale_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Apply robust scaling to continuous features."""
         
         # Features to scale
-        scale_features = [col for col in df.columns 
-                         if col.startswith(('log_', 'inv_', 'availability_', 'demand_'))]
-        scale_features = [f for f in scale_features if f in df.columns]
+        scale_features = self._scale_columns(df)
+        
+        if self.state is not None:
+            return self._apply_state(df, scale_features)
         
         if scale_features:
             try:
-                # Fill missing values
-                df[scale_features] = df[scale_features].fillna(0)
+                # Fit medians and IQRs on this batch, missing values as 0
+                self.scaler = self._new_scaler().update(df[scale_features])
                 
-                # Apply scaling
-                scaled_values = self.scaler.fit_transform(df[scale_features])
-                df[scale_features] = scaled_values
+                for feature, (center, scale) in self.scaler.stats().items():
+                    df[feature] = (df[feature].fillna(0) - center) / scale
                 
                 logger.info(f"Scaled {len(scale_features)} features")
             except Exception as e:
                 logger.warning(f"Error in feature scaling: {e}")
         
-        return df
\ No newline at end of file
+        return df
+    
+    def _apply_state(self, df: pd.DataFrame, scale_features: List[str]) -> pd.DataFrame:
+        """Scale features with the frozen state instead of refitting."""
+        for feature in scale_features:
+            if feature not in self.state.centers:
+                logger.warning(f"Feature {feature} not in scaling state, left unscaled")
+                continue
+            
+            values = df[feature].fillna(0).astype(FLOAT_DTYPE if self.compact else float)
+            df[feature] = (values - self.state.centers[feature]) / self.state.scales[feature]
+        
+        return df
+    
+    def _fit_arrays(self, df: pd.DataFrame) -> 'FeatureEngineer':
+        """Fit scaling state from feature arrays, leaving ``df`` untouched."""
+        features = self._feature_arrays(df)
+        self.state = ScalingState(n_rows=len(df))
+        
+        for col in self._scale_columns(df, features):
+            values = features[col] if col in features else self._float_column(df, col)
+            self.state.centers[col], self.state.scales[col] = self._column_stats(col, values)
+        
+        logger.info(f"Fitted scaling state for {len(self.state.centers)} features on {len(df)} rows")
+        return self
+    
+    def _transform_inplace(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Append features to ``df`` and scale them in their own arrays."""
+        features = self._feature_arrays(df)
+        scale_features = self._scale_columns(df, features)
+        for col in scale_features:
+            if col not in features:
+                # Scaled raw inputs such as demand_all_time are replaced by a float column
+                features[col] = self._filled_column(df, col, np.empty(len(df)))
+            values = features[col]
+            if self.state is None:
+                center, scale = self._column_stats(col, values)
+            elif col in self.state.centers:
+                center, scale = self.state.centers[col], self.state.scales[col]
+            else:
+                logger.warning(f"Feature {col} not in scaling state, left unscaled")
+                continue
+            values[np.isnan(values)] = 0
+            np.subtract(values, center, out=values)
+            np.divide(values, scale, out=values)
+        
+        # Series wrappers share the arrays, so attaching them copies nothing
+        for name, values in features.items():
+            df[name] = pd.Series(values, index=df.index, copy=False)
+        
+        logger.info(f"Appended {len(features)} features in place, scaled {len(scale_features)}")
+        return df
+    
+    def _column_stats(self, col: str, values: np.ndarray):
+        """Median and IQR of one column, from a scaler dropped right after."""
+        return self._new_scaler().update({col: values}).stats()[col]
+    
+    def _feature_arrays(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Unscaled features as arrays, each allocated once and filled with ``out=`` ufuncs.
+        
+        Values equal the column-wise features of ``_create_features``.
+        Input columns are read one at a time and never copied as a whole.
+        """
+        features = {}
+        n_rows = len(df)
+        
+        for col in self.config.get('log_transforms', ['inventory', 'moq']):
+            if col in df.columns and self._builds(f'log_{col}'):
+                values = self._filled_column(df, col, np.empty(n_rows))
+                np.maximum(values, 0, out=values)
+                features[f'log_{col}'] = np.log1p(values, out=values)
+        
+        for col in self.config.get('inverse_transforms', ['leadtime_weeks', 'moq']):
+            if col in df.columns and self._builds(f'inv_{col}'):
+                values = self._filled_column(df, col, np.empty(n_rows))
+                np.maximum(values, 0, out=values)
+                np.add(values, 1, out=values)
+                features[f'inv_{col}'] = np.divide(1, values, out=values)
+        
+        flags = {
+            'is_authorized': ('source_type', lambda col: col == 'Authorized'),
+            'has_datasheet': ('datasheet', lambda col: col.notna()),
+            'in_stock': ('inventory', lambda col: col > 0),
+            'immediate_availability': ('leadtime_weeks', lambda col: col == 0),
+        }
+        for name, (col, flag) in flags.items():
+            if col in df.columns and self._builds(name):
+                features[name] = flag(df[col]).to_numpy(dtype=int)
+        
+        if all(col in df.columns for col in ['inventory', 'moq']) and self._builds('availability_score'):
+            values = self._float_column(df, 'moq', np.empty(n_rows))
+            np.maximum(values, 1, out=values)
+            np.divide(self._float_column(df, 'inventory'), values, out=values)
+            np.minimum(values, 10, out=values)
+            np.multiply(values, 0.2, out=values)
+            flags = 0.0
+            if 'in_stock' in features:
+                flags = features['in_stock'] * 0.5
+            if 'immediate_availability' in features:
+                flags = flags + features['immediate_availability'] * 0.3
+            np.add(flags, values, out=values)
+            features['availability_score'] = np.clip(values, 0, 2, out=values)
+        
+        if 'demand_all_time' in df.columns and self._builds('demand_score'):
+            features['demand_score'] = self._filled_column(df, 'demand_all_time', np.empty(n_rows))
+        
+        return features
+    
+    @staticmethod
+    def _float_column(df: pd.DataFrame, col: str, out: np.ndarray = None) -> np.ndarray:
+        """One input column as float64, NaN for missing, written to ``out`` when given.
+        
+        Without ``out`` a float64 column is returned as a read-only view.
+        """
+        values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        if out is None:
+            return values
+        np.copyto(out, values)
+        return out
+    
+    def _filled_column(self, df: pd.DataFrame, col: str, out: np.ndarray) -> np.ndarray:
+        """Input column in ``out`` with missing values as 0, like ``fillna(0)``."""
+        values = self._float_column(df, col, out)
+        values[np.isnan(values)] = 0
+        return values
@@ -0,0 +1,88 @@
+"""Feature dependency graph.
+
+Every engineered feature is declared with the raw columns it reads and
+the features it builds on, so scoring can resolve which features the
+active weights and boost rules need and compute only those.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Tuple
+
+# Feature name prefixes that FeatureEngineer scales with a robust scaler
+SCALED_PREFIXES = ('log_', 'inv_', 'availability_', 'demand_')
+
+
+@dataclass(frozen=True)
+class FeatureSpec:
+    """One engineered feature and what it is computed from."""
+    name: str
+    # Raw columns that must all be present for the feature to exist
+    inputs: Tuple[str, ...]
+    # Raw columns read when present (lead time for the availability blend)
+    optional: Tuple[str, ...] = ()
+    # Features used when they can be built, computed first
+    depends: Tuple[str, ...] = ()
+
+    @property
+    def scaled(self) -> bool:
+        return self.name.startswith(SCALED_PREFIXES)
+
+
+@dataclass
+class FeaturePlan:
+    """Features and raw columns needed for a set of requested names."""
+    # Engineered features to build, dependencies before dependents
+    features: List[str] = field(default_factory=list)
+    # Features and raw columns to robust-scale
+    scaled: List[str] = field(default_factory=list)
+    # Raw columns read by the features, plus requested raw columns
+    columns: List[str] = field(default_factory=list)
+
+
+def feature_graph(feature_config: Dict[str, Any]) -> Dict[str, FeatureSpec]:
+    """All engineered features for a feature config, keyed by name."""
+    log_features = feature_config.get('log_transforms', ['inventory', 'moq'])
+    inverse_features = feature_config.get('inverse_transforms', ['leadtime_weeks', 'moq'])
+
+    specs = [FeatureSpec(f'log_{col}', (col,)) for col in log_features]
+    specs += [FeatureSpec(f'inv_{col}', (col,)) for col in inverse_features]
+    specs += [
+        FeatureSpec('is_authorized', ('source_type',)),
+        FeatureSpec('has_datasheet', ('datasheet',)),
+        FeatureSpec('in_stock', ('inventory',)),
+        FeatureSpec('immediate_availability', ('leadtime_weeks',)),
+        FeatureSpec('availability_score', ('inventory', 'moq'), optional=('leadtime_weeks',),
+                    depends=('in_stock', 'immediate_availability')),
+        FeatureSpec('demand_score', ('demand_all_time',)),
+    ]
+    return {spec.name: spec for spec in specs}
+
+
+def resolve_features(names: Iterable[str], feature_config: Dict[str, Any]) -> FeaturePlan:
+    """Plan for making ``names`` available, e.g. weight keys plus boost rule columns.
+
+    Names that are not engineered features are taken as raw input columns.
+    Anything with a scaled prefix is scaled, including raw columns such as
+    ``demand_all_time`` that boost rules compare after scaling.
+    """
+    names = list(names)
+    graph = feature_graph(feature_config)
+    plan = FeaturePlan()
+
+    def visit(name: str):
+        if name in plan.features or name in plan.columns:
+            return
+        spec = graph.get(name)
+        if spec is None:
+            plan.columns.append(name)
+            return
+        for dependency in spec.depends:
+            visit(dependency)
+        plan.columns.extend(col for col in spec.inputs + spec.optional if col not in plan.columns)
+        plan.features.append(name)
+
+    for name in names:
+        visit(name)
+
+    plan.scaled = [name for name in dict.fromkeys(names) if name.startswith(SCALED_PREFIXES)]
+    return plan
@@ -0,0 +1,160 @@
+"""Data loading from local Parquet, CSV and Arrow files."""
+
+import logging
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence, Union
+
+from .boosts import CompiledBoosts, OPERATORS, _parse_condition
+from .features import resolve_features
+from .parsing import parse_raw_columns
+
+logger = logging.getLogger(__name__)
+
+# File suffixes by pyarrow dataset format
+FORMATS = {
+    '.parquet': 'parquet', '.pq': 'parquet',
+    '.csv': 'csv',
+    '.arrow': 'ipc', '.ipc': 'ipc', '.feather': 'ipc',
+}
+
+# Raw columns that parse_raw_columns turns into scoring inputs
+RAW_SOURCES = {'leadtime_weeks': 'leadtime', 'demand_index': 'demand_totals'}
+
+# Columns kept for identifying and reporting parts
+ID_COLUMNS = ['pn', 'pn_clean', 'category']
+
+Filters = Union[ds.Expression, str, Sequence[Union[str, tuple]]]
+
+
+class FileDataLoader:
+    """Load parts from local files, such as GCS exports copied to disk.
+
+    ``path`` is a file or a directory of files, optionally hive-partitioned
+    (``category=ic/part-0.parquet``). Reads go through a pyarrow dataset:
+    only the columns the scoring config uses are read, filters are pushed
+    down to the reader (Parquet row groups and partitions that cannot
+    match are skipped), and files are read on several threads.
+    """
+
+    def __init__(self, path: Union[str, Path], format: str = None, partitioning: str = 'hive',
+                 config: Dict = None):
+        """Initialize file data loader.
+
+        Args:
+            path: File or directory to read
+            format: ``'parquet'``, ``'csv'`` or ``'ipc'`` (Arrow/Feather),
+                inferred from the file suffix when None
+            partitioning: Directory partitioning scheme, ``'hive'`` or None
+            config: Scoring configuration whose columns are read, defaults
+                to ``get_default_config()``
+        """
+        from ..config.settings import get_default_config
+
+        self.path = Path(path)
+        self.format = format or _infer_format(self.path)
+        self.config = config or get_default_config()
+        self.dataset = ds.dataset(str(self.path), format=self.format, partitioning=partitioning)
+
+    def scoring_columns(self) -> List[str]:
+        """Columns of the dataset that scoring with ``config`` reads.
+
+        These are the raw inputs of the features the weights use, the
+        columns the boost rules compare and ``ID_COLUMNS``. Where an input
+        such as ``leadtime_weeks`` is missing but its raw source
+        (``leadtime``) is present, the raw source is read and parsed.
+        """
+        boosts_config = self.config.get('boosts')
+        if boosts_config is None:
+            from ..config.settings import get_default_config
+            boosts_config = get_default_config()['boosts']
+        names = list(self.config.get('weights', {})) + CompiledBoosts.from_config(boosts_config).columns
+        plan = resolve_features(names, self.config.get('features', {}))
+
+        available = set(self.dataset.schema.names)
+        columns = []
+        for col in ID_COLUMNS + plan.columns:
+            if col not in available and RAW_SOURCES.get(col) in available:
+                col = RAW_SOURCES[col]
+            if col in available and col not in columns:
+                columns.append(col)
+        return columns
+
+    def load(self, filters: Filters = None, columns: List[str] = None, as_arrow: bool = False):
+        """Read all matching rows.
+
+        Args:
+            filters: Row filter, see ``to_expression``
+            columns: Columns to read, ``scoring_columns()`` when None
+            as_arrow: Return a ``pyarrow.Table`` for the ``'arrow'`` engine
+
+        Returns:
+            Dataframe (or Arrow table) of the matching rows
+        """
+        table = parse_raw_columns(self._scanner(filters, columns).to_table())
+        logger.info(f"Loaded {table.num_rows} rows from {self.path}")
+        return table if as_arrow else table.to_pandas()
+
+    def iter_batches(self, filters: Filters = None, columns: List[str] = None,
+                     batch_rows: int = 256 * 1024) -> Iterator[pd.DataFrame]:
+        """Yield matching rows as dataframes of at most ``batch_rows`` rows.
+
+        Files are read ahead on background threads while batches are
+        consumed. Wrap the call in a lambda to use it as a ``ChunkedScorer``
+        chunk source.
+        """
+        for batch in self._scanner(filters, columns, batch_rows).to_batches():
+            if batch.num_rows:
+                yield parse_raw_columns(batch.to_pandas())
+
+    def _scanner(self, filters: Filters, columns: List[str], batch_rows: int = None) -> ds.Scanner:
+        options = {'batch_size': batch_rows} if batch_rows else {}
+        return self.dataset.scanner(columns=columns if columns is not None else self.scoring_columns(),
+                                    filter=to_expression(filters), use_threads=True, **options)
+
+
+def to_expression(filters: Filters) -> ds.Expression:
+    """Dataset filter expression from conditions.
+
+    Accepts a pyarrow expression, a condition string in the boost rule
+    syntax (``"inventory >= 0"``, ``"category == 'ic'"``,
+    ``"inventory >= 10 * moq"``), a list of such strings, or pyarrow-style
+    ``(column, op, value)`` tuples. List entries must all hold.
+    """
+    if filters is None or isinstance(filters, ds.Expression):
+        return filters
+    if isinstance(filters, str):
+        filters = [filters]
+
+    expression = None
+    for condition in filters:
+        if isinstance(condition, str):
+            term = _condition_expression(condition)
+        elif isinstance(condition, ds.Expression):
+            term = condition
+        else:
+            term = pq.filters_to_expression([condition])
+        expression = term if expression is None else expression & term
+    return expression
+
+
+def _condition_expression(condition: str) -> ds.Expression:
+    fields = _parse_condition('filter', condition)
+    if 'value_column' in fields:
+        right = ds.field(fields['value_column'])
+        if fields.get('value') is not None:
+            right = right * fields['value']
+    else:
+        right = ds.scalar(fields['value'])
+    return OPERATORS[fields['operator']](ds.field(fields['column']), right)
+
+
+def _infer_format(path: Path) -> str:
+    files = [path] if path.is_file() else sorted(p for p in path.rglob('*') if p.is_file())
+    for file in files:
+        if file.suffix.lower() in FORMATS:
+            return FORMATS[file.suffix.lower()]
+    raise ValueError(f"Cannot infer file format of {path}; pass format=")
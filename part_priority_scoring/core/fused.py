@@ -0,0 +1,316 @@
+"""Optional Numba-compiled fused scoring loop.
+
+``kernel.boosted_scores`` builds each feature, the weighted sum and every
+boost mask as whole-array NumPy expressions, each with its own
+temporaries. This module compiles the same arithmetic into one parallel
+loop over rows that reads the raw float block once and writes only the
+base and boosted scores.
+
+Features and boost rules are encoded as small integer/float tables so the
+loop needs no Python objects. When numba is not installed the loop
+functions stay plain Python (used by the tests on small inputs), and
+``kernel.boosted_scores`` keeps using the NumPy path.
+"""
+
+import math
+import logging
+import numpy as np
+from typing import Any, Dict, Tuple
+
+from .state import ScalingState
+from .boosts import CompiledBoosts
+from . import kernel
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+# Feature op codes
+PASS, LOG, INV, IN_STOCK, IMMEDIATE, FILL, AVAILABILITY = range(7)
+
+# Rule op codes, in the order of boosts.OPERATORS
+RULE_OPERATORS = ('>=', '<=', '>', '<', '==', '!=')
+
+# Rule kinds: compared in the loop, or read from a precomputed mask
+NUMERIC_RULE, MASK_RULE = range(2)
+
+
+def _compile(parallel: bool = False):
+    """``njit`` when numba is installed, else leave the function as Python."""
+    def decorate(function):
+        if NUMBA_AVAILABLE:
+            return njit(parallel=parallel, cache=True)(function)
+        return function
+    return decorate
+
+
+@_compile()
+def _feature_value(op: int, inputs: np.ndarray, block: np.ndarray, i: int) -> float:
+    """Unscaled feature of row i, as ``kernel.compute_feature`` computes it."""
+    if op == PASS:
+        return block[inputs[0], i]
+    value = block[inputs[0], i]
+    if op == LOG or op == INV or op == FILL:
+        if value != value:
+            value = 0.0
+        if op == FILL:
+            return value
+        if value < 0.0:
+            value = 0.0
+        return math.log1p(value) if op == LOG else 1.0 / (1.0 + value)
+    if op == IN_STOCK:
+        return 1.0 if value > 0.0 else 0.0
+    if op == IMMEDIATE:
+        return 1.0 if value == 0.0 else 0.0
+
+    # AVAILABILITY: inventory, moq and optional lead time
+    in_stock_score = 0.5 if value > 0.0 else 0.0
+    immediate_score = 0.0
+    if inputs[2] >= 0:
+        immediate_score = (1.0 if block[inputs[2], i] == 0.0 else 0.0) * 0.3
+    moq = block[inputs[1], i]
+    if moq < 1.0:
+        moq = 1.0
+    ratio = value / moq
+    if ratio > 10.0:
+        ratio = 10.0
+    blend = in_stock_score + immediate_score + ratio * 0.2
+    if blend < 0.0:
+        blend = 0.0
+    if blend > 2.0:
+        blend = 2.0
+    return blend
+
+
+@_compile()
+def _compare(op: int, left: float, right: float) -> bool:
+    if op == 0:
+        return left >= right
+    if op == 1:
+        return left <= right
+    if op == 2:
+        return left > right
+    if op == 3:
+        return left < right
+    if op == 4:
+        return left == right
+    return left != right
+
+
+@_compile()
+def _operand(index: int, constant: float, center: float, scale: float,
+             block: np.ndarray, i: int) -> float:
+    """Rule operand: a constant, or a block value, robust-scaled when scale is set."""
+    if index < 0:
+        return constant
+    value = block[index, i]
+    if scale != 0.0:
+        if value != value:
+            value = 0.0
+        value = (value - center) / scale
+    return value
+
+
+@_compile(parallel=True)
+def _fused_loop(block, feature_ops, feature_inputs, centers, scales, weights,
+                zeroing, rule_kinds, rule_ops, rule_operands, rule_stats, rule_values, masks,
+                base_score, boosted_score):
+    """Score every row in one pass; ``scales`` of 0 mark unscaled features."""
+    n_rows = block.shape[1]
+    for i in prange(n_rows):
+        base = 0.0
+        for f in range(len(feature_ops)):
+            value = _feature_value(feature_ops[f], feature_inputs[f], block, i)
+            if value != value:
+                value = 0.0
+            if scales[f] != 0.0:
+                value = (value - centers[f]) / scales[f]
+            base += value * weights[f]
+
+        if zeroing[0] >= 0 and block[zeroing[0], i] == 0.0 and block[zeroing[1], i] > 12.0:
+            base = 0.0
+
+        multiplier = 1.0
+        for r in range(len(rule_kinds)):
+            if rule_kinds[r] == MASK_RULE:
+                match = masks[r, i]
+            else:
+                left = _operand(rule_operands[r, 0], rule_values[r, 0],
+                                rule_stats[r, 0], rule_stats[r, 1], block, i)
+                right = _operand(rule_operands[r, 1], rule_values[r, 1],
+                                 rule_stats[r, 2], rule_stats[r, 3], block, i) * rule_values[r, 2]
+                match = _compare(rule_ops[r], left, right)
+            if match:
+                multiplier *= rule_values[r, 3]
+
+        base_score[i] = base
+        boosted_score[i] = base * multiplier
+
+
+@_compile(parallel=True)
+def _feature_loop(block, feature_ops, feature_inputs, out):
+    """Unscaled, NaN-filled values of the given features, one row per feature."""
+    n_rows = block.shape[1]
+    for i in prange(n_rows):
+        for f in range(len(feature_ops)):
+            value = _feature_value(feature_ops[f], feature_inputs[f], block, i)
+            out[f, i] = 0.0 if value != value else value
+
+
+def fused_scores(df, weights: Dict[str, float], feature_config: Dict[str, Any],
+                 state: ScalingState = None, boosts: CompiledBoosts = None) -> Tuple[np.ndarray, np.ndarray, Dict]:
+    """Drop-in for ``kernel.boosted_scores`` using the fused row loop.
+
+    Scores equal the NumPy kernel up to the last bit of ``log1p``, which
+    libm and NumPy's vectorized implementation can round differently.
+    Statistics missing from ``state`` are fitted on the batch first, from
+    a feature-only pass of the same loop.
+    """
+    n_rows = len(df)
+    boosts = boosts or kernel.default_boosts()
+    columns = kernel.required_columns(weights, feature_config, boosts)
+    block, cols = kernel.extract_block(df, columns)
+    rows = {col: row for row, col in enumerate(col for col in columns if col in cols)}
+
+    features = []
+    for feature, weight in weights.items():
+        encoded = _encode_feature(feature, rows, feature_config)
+        if encoded is None:
+            logger.warning(f"Feature {feature} not found in dataframe")
+            continue
+        features.append((feature, weight) + encoded)
+
+    fitted = _fit_missing(block, features, rows, boosts, state)
+    stats = {**fitted}
+    if state is not None:
+        stats.update({name: (state.centers[name], state.scales[name]) for name in state.centers})
+
+    feature_ops = np.array([op for _, _, op, _ in features], dtype=np.int64)
+    feature_inputs = np.array([inputs for _, _, _, inputs in features], dtype=np.int64).reshape(-1, 3)
+    centers = np.array([stats[name][0] if _is_scaled(name) else 0.0 for name, *_ in features])
+    scales = np.array([stats[name][1] if _is_scaled(name) else 0.0 for name, *_ in features])
+    feature_weights = np.array([weight for _, weight, _, _ in features], dtype=np.float64)
+
+    zeroing = np.array([rows.get(col, -1) for col in kernel.ZEROING_COLUMNS], dtype=np.int64)
+    if (zeroing < 0).any():
+        zeroing[:] = -1
+
+    rule_tables = _encode_rules(df, boosts, rows, stats, n_rows)
+
+    base_score = np.empty(n_rows, dtype=np.float64)
+    boosted_score = np.empty(n_rows, dtype=np.float64)
+    _fused_loop(block, feature_ops, feature_inputs, centers, scales, feature_weights,
+                zeroing, *rule_tables, base_score, boosted_score)
+    return base_score, boosted_score, fitted
+
+
+def _is_scaled(name: str) -> bool:
+    return name.startswith(kernel.SCALED_PREFIXES)
+
+
+def _encode_feature(feature: str, rows: Dict[str, int],
+                    feature_config: Dict[str, Any]):
+    """(op, input rows) for a feature, mirroring ``kernel.compute_feature``; None if unavailable."""
+    inputs = kernel.feature_inputs(feature, feature_config)
+    if feature == 'availability_score':
+        inputs = inputs[:2]
+
+    if inputs and all(col in rows for col in inputs):
+        if feature == 'availability_score':
+            return AVAILABILITY, [rows['inventory'], rows['moq'], rows.get('leadtime_weeks', -1)]
+        op = PASS
+        if feature.startswith('log_'):
+            op = LOG
+        elif feature.startswith('inv_'):
+            op = INV
+        elif feature == 'in_stock':
+            op = IN_STOCK
+        elif feature == 'immediate_availability':
+            op = IMMEDIATE
+        elif feature == 'demand_score':
+            op = FILL
+        return op, [rows[inputs[0]], -1, -1]
+
+    if feature in rows:
+        return PASS, [rows[feature], -1, -1]
+    return None
+
+
+def _fit_missing(block: np.ndarray, features: list, rows: Dict[str, int],
+                 boosts: CompiledBoosts, state: ScalingState) -> Dict[str, Tuple[float, float]]:
+    """Robust statistics of scaled features and rule columns that ``state`` lacks."""
+    known = state.centers if state is not None else {}
+    missing = [(name, op, inputs) for name, _, op, inputs in features
+               if _is_scaled(name) and name not in known]
+    missing += [(col, PASS, [rows[col], -1, -1]) for col in boosts.columns
+                if col in rows and _is_scaled(col) and col not in boosts.string_columns and col not in known]
+    missing = list({name: (name, op, inputs) for name, op, inputs in missing}.values())
+    if not missing:
+        return {}
+
+    values = np.empty((len(missing), block.shape[1]), dtype=np.float64)
+    _feature_loop(block, np.array([op for _, op, _ in missing], dtype=np.int64),
+                  np.array([inputs for _, _, inputs in missing], dtype=np.int64), values)
+    return {name: kernel.robust_stats(values[j]) for j, (name, _, _) in enumerate(missing)}
+
+
+def _encode_rules(df, boosts: CompiledBoosts, rows: Dict[str, int],
+                  stats: Dict[str, Tuple[float, float]], n_rows: int) -> tuple:
+    """Rule tables for the loop: kinds, ops, operand rows, operand stats, values and masks.
+
+    String comparisons and rules on missing columns without defaults are
+    evaluated up front into ``masks``; numeric rules run inside the loop.
+    """
+    n_rules = len(boosts.rules)
+    kinds = np.zeros(n_rules, dtype=np.int64)
+    ops = np.zeros(n_rules, dtype=np.int64)
+    operands = np.full((n_rules, 2), -1, dtype=np.int64)
+    rule_stats = np.zeros((n_rules, 4), dtype=np.float64)
+    # left constant, right constant, right factor, multiplier
+    values = np.zeros((n_rules, 4), dtype=np.float64)
+    masks = np.zeros((n_rules, n_rows if any(_is_mask_rule(rule, rows) for rule in boosts.rules) else 0),
+                     dtype=np.bool_)
+
+    for r, rule in enumerate(boosts.rules):
+        values[r, 3] = rule.multiplier
+        if _is_mask_rule(rule, rows):
+            kinds[r] = MASK_RULE
+            names = kernel.column_names(df)
+            columns = {col: _string_values(df, col) for col in rule.columns if col in names}
+            masks[r] = rule.evaluate(columns, n_rows)
+            continue
+
+        kinds[r] = NUMERIC_RULE
+        ops[r] = RULE_OPERATORS.index(rule.operator)
+        for side, column in enumerate([rule.column, rule.value_column]):
+            if column is None:
+                values[r, side] = rule.value
+            elif column in rows:
+                operands[r, side] = rows[column]
+                if _is_scaled(column):
+                    rule_stats[r, 2 * side:2 * side + 2] = stats[column]
+            else:
+                values[r, side] = rule.defaults[column]
+        values[r, 2] = rule.value if rule.value_column is not None and rule.value is not None else 1.0
+
+    return kinds, ops, operands, rule_stats, values, masks
+
+
+def _is_mask_rule(rule, rows: Dict[str, int]) -> bool:
+    if rule.is_string:
+        return True
+    return any(col not in rows and col not in rule.defaults for col in rule.columns)
+
+
+def _string_values(df, col: str) -> np.ndarray:
+    from .arrow import column_as_object
+    import pyarrow as pa
+
+    if isinstance(df, pa.Table):
+        return column_as_object(df.column(col))
+    return df[col].to_numpy(dtype=object)
@@ -0,0 +1,26 @@
+"""Row hashes for detecting changed parts."""
+
+import numpy as np
+import pandas as pd
+from typing import List
+
+
+def row_keys(df: pd.DataFrame, columns: List[str]) -> np.ndarray:
+    """64-bit hash of each row's values in ``columns``.
+
+    Numeric columns are hashed as float64, so a column that comes back as
+    float instead of int (e.g. after a NULL appears) hashes the same.
+    Columns missing from ``df`` are skipped.
+    """
+    keys = np.zeros(len(df), dtype=np.uint64)
+    for col in columns:
+        if col not in df.columns:
+            continue
+        series = df[col]
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            values = series.to_numpy(dtype=object)
+        # Multiply-xor combine, wrapping in uint64
+        keys = (keys * np.uint64(1000003)) ^ pd.util.hash_array(values)
+    return keys
@@ -0,0 +1,337 @@
+"""Incremental rescoring of a persistent score set keyed by part number."""
+
+import os
+import pandas as pd
+import numpy as np
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Union
+
+from .state import ScalingState
+from .boosts import CompiledBoosts
+from .hashing import row_keys
+from . import kernel
+
+logger = logging.getLogger(__name__)
+
+# Columns stored per part; priority scores and the histogram are derived from them
+STORED_COLUMNS = ['row_hash', 'base_score', 'boosted_score']
+
+
+@dataclass
+class DeltaReport:
+    """Outcome of ``IncrementalScorer.apply_delta``."""
+    # pn, previous_score (NaN for new parts) and priority_score of every part whose score moved
+    changed: pd.DataFrame
+    n_received: int
+    n_rescored: int
+    renormalized: bool
+
+
+class IncrementalScorer:
+    """Persistent score set that rescores only parts whose inputs changed.
+
+    The directory at ``path`` holds ``state.json`` (the frozen feature
+    scaling), ``scores.parquet`` (one row per ``pn`` with a hash of its
+    scoring inputs and its base and boosted scores, as of the last
+    compaction) and ``deltas/``, one Parquet segment per applied delta
+    holding only the parts it rescored. Priority scores, the score range
+    and the histogram are derived from the boosted scores when loading.
+
+    Feature scaling is fitted once by ``build``. After each ``apply_delta``
+    the stored scores equal scoring the current table against that scaling,
+    with the score range taken over the current table:
+
+    - Only delta rows whose inputs hash differently are rescored, and only
+      they are written. Numeric inputs are hashed as float64, so a column
+      read back as float instead of int does not count as a change.
+    - The range is recomputed only when a rescored part reaches past it or
+      previously held one of its ends. All priorities are renormalized only
+      when the range actually moves.
+    - The priority histogram is updated by subtracting old counts and adding
+      new ones. Percentiles are derived from it when the scores are read.
+
+    Once the delta segments hold more rows than ``scores.parquet``, they
+    are folded into it, so a delta costs amortized time in its own size.
+    """
+
+    def __init__(self, path: Union[str, Path], config: Dict = None):
+        """Initialize incremental scorer, loading the score set at ``path`` if present.
+
+        Args:
+            path: Directory holding the score set
+            config: Scoring configuration, defaults to ``get_default_config()``
+        """
+        from ..config.settings import get_default_config
+
+        self.path = Path(path)
+        self.config = config or get_default_config()
+        self.weights = self.config.get('weights', {})
+        self.feature_config = self.config.get('features', {})
+        boosts_config = self.config.get('boosts')
+        if boosts_config is None:
+            boosts_config = get_default_config()['boosts']
+        self.boosts = CompiledBoosts.from_config(boosts_config)
+
+        self.state = None
+        # Parts as of the last compaction, and positions of parts added since
+        self._base_index = None
+        self._added: Dict[str, int] = {}
+        # Column arrays with spare capacity; the first _size rows are parts
+        self._pns = None
+        self._columns = None
+        self._size = 0
+        self._delta_rows = 0
+        if (self.path / 'state.json').exists():
+            self.load()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def input_columns(self) -> List[str]:
+        """Columns hashed to detect changed parts."""
+        columns = kernel.required_columns(self.weights, self.feature_config, self.boosts)
+        return list(dict.fromkeys(columns + self.boosts.string_columns))
+
+    def build(self, df: pd.DataFrame) -> 'IncrementalScorer':
+        """Fit scaling on the full table, score every part and save the score set."""
+        if len(df) == 0:
+            raise ValueError("Cannot build score set from an empty dataframe")
+        df = self._dedupe(df)
+
+        # Scores against the statistics fitted on the table equal scoring against the state
+        base_score, boosted_score, fitted = kernel.boosted_scores(
+            df, self.weights, self.feature_config, boosts=self.boosts
+        )
+        self.state = ScalingState(
+            centers={name: stats[0] for name, stats in fitted.items()},
+            scales={name: stats[1] for name, stats in fitted.items()},
+        )
+        self._set_parts(df['pn'].to_numpy(dtype=object), {
+            'row_hash': self._row_hashes(df),
+            'base_score': base_score,
+            'boosted_score': boosted_score,
+        })
+
+        logger.info(f"Built score set of {len(self)} parts")
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.state.save(self.path / 'state.json')
+        self.compact()
+        return self
+
+    def apply_delta(self, df: pd.DataFrame) -> DeltaReport:
+        """Merge updated and new parts into the score set and save the rescored ones.
+
+        Args:
+            df: Raw rows for updated or new parts, e.g. from
+                ``sql/incremental_scoring.sql``; the last row wins for a repeated ``pn``
+
+        Returns:
+            Report of the parts whose ``priority_score`` changed
+        """
+        if self.state is None:
+            raise ValueError("No score set. Call build() first.")
+
+        n_received = len(df)
+        df = self._dedupe(df)
+        hashes = self._row_hashes(df)
+        positions = self._positions(df['pn'].to_numpy(dtype=object))
+
+        existing = positions >= 0
+        stored = self._columns['row_hash'][np.where(existing, positions, 0)]
+        modified = ~existing | (stored != hashes)
+        if not modified.any():
+            logger.info(f"No changed parts among {n_received} delta rows")
+            return DeltaReport(self._changes(np.empty(0, dtype=np.int64), np.empty(0)), n_received, 0, False)
+
+        delta, positions, hashes = df[modified], positions[modified], hashes[modified]
+        base_score, boosted_score, _ = kernel.boosted_scores(
+            delta, self.weights, self.feature_config, self.state, self.boosts
+        )
+
+        # Updated parts are overwritten in place, new parts appended
+        updated = positions >= 0
+        old_boosted = self._columns['boosted_score'][positions[updated]]
+        old_priority = self._columns['priority_score'][positions[updated]]
+        new = ~updated
+        if new.any():
+            positions[new] = self._append(delta['pn'].to_numpy(dtype=object)[new])
+
+        self._columns['row_hash'][positions] = hashes
+        self._columns['base_score'][positions] = base_score
+        self._columns['boosted_score'][positions] = boosted_score
+
+        self.state.n_rows = len(self)
+        renormalized = self._update_range(boosted_score, old_boosted)
+        if renormalized:
+            previous = self._column('priority_score').copy()
+            previous[positions[new]] = np.nan
+            self._renormalize()
+            moved = np.flatnonzero(~(self._column('priority_score') == previous))
+            changes = self._changes(moved, previous[moved])
+        else:
+            priority = kernel.normalize_scores(boosted_score, self.state.score_min, self.state.score_max)
+            histogram = np.asarray(self.state.score_histogram)
+            histogram -= kernel.score_histogram(old_priority)
+            histogram += kernel.score_histogram(priority)
+            self.state.score_histogram = histogram.tolist()
+            self._columns['priority_score'][positions] = priority
+
+            previous = np.full(len(positions), np.nan)
+            previous[updated] = old_priority
+            moved = ~(priority == previous)
+            changes = self._changes(positions[moved], previous[moved])
+
+        logger.info(f"Rescored {len(delta)} of {n_received} delta rows; "
+                    f"{len(changes)} scores changed" + (" after renormalizing" if renormalized else ""))
+        self._write_delta(positions)
+        return DeltaReport(changes, n_received, len(delta), renormalized)
+
+    def scores(self) -> pd.DataFrame:
+        """Current score set, with percentiles within it."""
+        if self.state is None:
+            raise ValueError("No score set. Call build() first.")
+
+        priority = self._column('priority_score')
+        return pd.DataFrame({
+            'pn': self._pns[:self._size],
+            'base_score': self._column('base_score'),
+            'boosted_score': self._column('boosted_score'),
+            'priority_score': priority,
+            'score_percentile': kernel.compute_percentiles(priority, 'reference', self.state),
+        })
+
+    def compact(self):
+        """Rewrite ``scores.parquet`` with every part and drop the delta segments."""
+        frame = pd.DataFrame({name: self._column(name) for name in STORED_COLUMNS},
+                             index=pd.Index(self._pns[:self._size], name='pn'))
+        staged = self.path / 'scores.parquet.tmp'
+        frame.to_parquet(staged)
+        os.replace(staged, self.path / 'scores.parquet')
+        # Segments left behind by a crash here only repeat rows already in scores.parquet
+        for segment in self._segments():
+            segment.unlink()
+
+        self._base_index = pd.Index(self._pns[:self._size], name='pn')
+        self._added = {}
+        self._delta_rows = 0
+        logger.info(f"Compacted score set of {len(self)} parts")
+
+    def load(self) -> 'IncrementalScorer':
+        """Read the state, the compacted score set and the delta segments from ``path``."""
+        self.state = ScalingState.load(self.path / 'state.json')
+        base = pd.read_parquet(self.path / 'scores.parquet')
+        segments = [pd.read_parquet(segment) for segment in self._segments()]
+        frame = pd.concat([base] + segments) if segments else base
+        if segments:
+            # Parts keep the position they were added at and the values of their last write
+            order = frame.index[~frame.index.duplicated(keep='first')]
+            frame = frame[~frame.index.duplicated(keep='last')].reindex(order)
+
+        self._set_parts(frame.index.to_numpy(dtype=object),
+                        {name: frame[name].to_numpy(copy=True) for name in STORED_COLUMNS})
+        self._base_index = pd.Index(base.index, name='pn')
+        self._added = {pn: i for i, pn in enumerate(self._pns[len(base):self._size], len(base))}
+        self._delta_rows = sum(len(segment) for segment in segments)
+        return self
+
+    def _set_parts(self, pns: np.ndarray, columns: Dict[str, np.ndarray]):
+        """Replace all parts, then derive the score range, priorities and histogram."""
+        self._pns = pns
+        self._columns = columns
+        self._size = len(pns)
+        boosted_score = columns['boosted_score']
+        self.state.score_min = float(np.nanmin(boosted_score))
+        self.state.score_max = float(np.nanmax(boosted_score))
+        self.state.n_rows = self._size
+        self._renormalize()
+
+    def _positions(self, pns: np.ndarray) -> np.ndarray:
+        """Position of each part number, -1 for unknown parts."""
+        positions = self._base_index.get_indexer(pns)
+        if self._added:
+            missing = np.flatnonzero(positions < 0)
+            positions[missing] = [self._added.get(pn, -1) for pn in pns[missing]]
+        return positions
+
+    def _append(self, pns: np.ndarray) -> np.ndarray:
+        """Add rows for new parts, doubling capacity when full; returns their positions."""
+        needed = self._size + len(pns)
+        if needed > len(self._pns):
+            capacity = max(needed, 2 * len(self._pns))
+            self._pns = np.resize(self._pns, capacity)
+            for name, values in self._columns.items():
+                grown = np.zeros(capacity, dtype=values.dtype)
+                grown[:self._size] = values[:self._size]
+                self._columns[name] = grown
+
+        positions = np.arange(self._size, needed)
+        self._pns[positions] = pns
+        self._added.update(zip(pns, positions))
+        self._size = needed
+        return positions
+
+    def _column(self, name: str) -> np.ndarray:
+        return self._columns[name][:self._size]
+
+    def _write_delta(self, positions: np.ndarray):
+        """Write the rescored parts as a new segment, compacting once segments outgrow the base."""
+        frame = pd.DataFrame({name: self._columns[name][positions] for name in STORED_COLUMNS},
+                             index=pd.Index(self._pns[positions], name='pn'))
+        directory = self.path / 'deltas'
+        directory.mkdir(parents=True, exist_ok=True)
+        number = max((int(segment.stem.split('-')[1]) for segment in self._segments()), default=0) + 1
+        staged = directory / f'delta-{number:06d}.parquet.tmp'
+        frame.to_parquet(staged)
+        os.replace(staged, directory / f'delta-{number:06d}.parquet')
+
+        self._delta_rows += len(positions)
+        if self._delta_rows > len(self._base_index):
+            self.compact()
+
+    def _segments(self) -> List[Path]:
+        return sorted((self.path / 'deltas').glob('delta-*.parquet'))
+
+    def _update_range(self, boosted_score: np.ndarray, old_boosted: np.ndarray) -> bool:
+        """Recompute the score range if it may have moved; True when it did."""
+        score_min, score_max = self.state.score_min, self.state.score_max
+        reaches_past = boosted_score.min() < score_min or boosted_score.max() > score_max
+        held_end = np.isin(old_boosted, [score_min, score_max]).any()
+        if not (reaches_past or held_end):
+            return False
+
+        all_boosted = self._column('boosted_score')
+        self.state.score_min = float(np.nanmin(all_boosted))
+        self.state.score_max = float(np.nanmax(all_boosted))
+        return (self.state.score_min, self.state.score_max) != (score_min, score_max)
+
+    def _renormalize(self):
+        """Normalize every part on the current range and rebuild the histogram."""
+        priority = kernel.normalize_scores(
+            self._column('boosted_score'), self.state.score_min, self.state.score_max
+        )
+        column = np.zeros(len(self._pns))
+        column[:self._size] = priority
+        self._columns['priority_score'] = column
+        self.state.score_histogram = kernel.score_histogram(priority).tolist()
+
+    def _changes(self, positions: np.ndarray, previous: np.ndarray) -> pd.DataFrame:
+        """Report rows for the parts at ``positions``."""
+        return pd.DataFrame({
+            'pn': self._pns[positions],
+            'previous_score': previous,
+            'priority_score': self._columns['priority_score'][positions],
+        })
+
+    def _row_hashes(self, df: pd.DataFrame) -> np.ndarray:
+        """Hash of each row's scoring inputs."""
+        return row_keys(df, self.input_columns)
+
+    @staticmethod
+    def _dedupe(df: pd.DataFrame) -> pd.DataFrame:
+        """Keep the last row for each part number."""
+        if 'pn' not in df.columns:
+            raise ValueError("Column pn not found")
+        return df.drop_duplicates('pn', keep='last')
@@ -0,0 +1,545 @@
+"""Vectorized NumPy scoring kernel.
+
+Mirrors the pandas pipeline in ``FeatureEngineer`` and ``PartScorer`` but
+reads the raw columns once into a contiguous float block and computes
+features, the weighted sum, unavailable-zeroing and boosts on plain arrays.
+"""
+
+import pandas as pd
+import numpy as np
+import pyarrow as pa
+import logging
+from typing import Dict, List, Tuple, Any
+
+from .state import ScalingState
+from .boosts import CompiledBoosts
+from .explain import EXPLAIN_DTYPE
+from .features import SCALED_PREFIXES, feature_graph
+from . import arrow
+
+logger = logging.getLogger(__name__)
+
+# Normalized priority scores are rounded to 2 decimals in 0-100
+SCORE_GRID = np.arange(10001) / 100.0
+
+PERCENTILE_MODES = ('rank', 'histogram', 'reference')
+
+# Raw columns read by unavailable-zeroing
+ZEROING_COLUMNS = ['inventory', 'leadtime_weeks']
+
+
+def default_boosts() -> CompiledBoosts:
+    """Compile the configured business boosts."""
+    from ..config.settings import get_default_config
+
+    return CompiledBoosts.from_config(get_default_config()['boosts'])
+
+
+def feature_inputs(feature: str, feature_config: Dict[str, Any]) -> List[str]:
+    """Raw input columns a feature is derived from, required ones first."""
+    spec = feature_graph(feature_config).get(feature)
+    return list(spec.inputs + spec.optional) if spec is not None else []
+
+
+def required_columns(weights: Dict[str, float], feature_config: Dict[str, Any],
+                     boosts: CompiledBoosts) -> List[str]:
+    """Raw numeric columns needed to score with the given weights and boosts."""
+    columns = []
+    for feature in weights:
+        columns.extend(feature_inputs(feature, feature_config) + [feature])
+    columns.extend(ZEROING_COLUMNS)
+    columns.extend(col for col in boosts.columns if col not in boosts.string_columns)
+    return list(dict.fromkeys(columns))
+
+
+def column_names(df) -> List[str]:
+    """Column names of a pandas dataframe or an Arrow table."""
+    return df.column_names if isinstance(df, pa.Table) else list(df.columns)
+
+
+def extract_block(df, columns: List[str],
+                  dtype=np.float64) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Pull columns into one contiguous (k, n) float block.
+
+    String columns are reduced to the flags the pipeline uses:
+    ``source_type`` becomes ``== 'Authorized'`` and ``datasheet`` becomes
+    ``notna()``. Compact mode passes ``np.float32`` to halve the block.
+    ``df`` may also be an Arrow table, read with Arrow compute kernels.
+
+    Returns:
+        The block and a mapping of column name to its row view
+    """
+    names = column_names(df)
+    present = [col for col in columns if col in names]
+    block = np.empty((len(present), len(df)), dtype=dtype)
+
+    for row, col in enumerate(present):
+        if isinstance(df, pa.Table):
+            block[row] = arrow.column_as_float(df.column(col), col)
+        else:
+            block[row] = _column_as_float(df[col])
+
+    return block, {col: block[row] for row, col in enumerate(present)}
+
+
+def _column_as_float(series: pd.Series) -> np.ndarray:
+    """Convert one raw column to float64, NaN for missing values."""
+    if series.name == 'source_type':
+        return (series == 'Authorized').to_numpy(dtype=np.float64, na_value=0.0)
+    if series.name == 'datasheet':
+        return series.notna().to_numpy(dtype=np.float64)
+    return pd.to_numeric(series, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _fill(values: np.ndarray, fill_value: float = 0.0) -> np.ndarray:
+    """Equivalent of ``Series.fillna`` for float arrays."""
+    return np.where(np.isnan(values), fill_value, values)
+
+
+def compute_feature(feature: str, cols: Dict[str, np.ndarray],
+                    feature_config: Dict[str, Any]) -> Any:
+    """Compute one unscaled feature, or None if it cannot be derived.
+
+    Follows FeatureEngineer: an engineered feature wins over an input column
+    of the same name, and unknown features pass through from the input.
+    """
+    inputs = feature_inputs(feature, feature_config)
+    if feature == 'availability_score':
+        # Lead time is optional for the availability blend
+        inputs = inputs[:2]
+
+    if inputs and all(col in cols for col in inputs):
+        if feature.startswith('log_'):
+            return np.log1p(np.clip(_fill(cols[inputs[0]]), 0, None))
+        if feature.startswith('inv_'):
+            return 1 / (1 + np.clip(_fill(cols[inputs[0]]), 0, None))
+        if feature in ('is_authorized', 'has_datasheet'):
+            return cols[inputs[0]]
+        if feature == 'in_stock':
+            return (cols['inventory'] > 0).astype(cols['inventory'].dtype)
+        if feature == 'immediate_availability':
+            return (cols['leadtime_weeks'] == 0).astype(cols['leadtime_weeks'].dtype)
+        if feature == 'demand_score':
+            return _fill(cols['demand_all_time'])
+        if feature == 'availability_score':
+            immediate = compute_feature('immediate_availability', cols, feature_config)
+            if immediate is None:
+                immediate = 0.0
+            in_stock_score = (cols['inventory'] > 0) * 0.5
+            immediate_score = immediate * 0.3
+            inventory_ratio = np.clip(cols['inventory'] / np.clip(cols['moq'], 1, None), None, 10) * 0.2
+            return np.clip(in_stock_score + immediate_score + inventory_ratio, 0, 2)
+
+    return cols.get(feature)
+
+
+def robust_stats(values: np.ndarray) -> Tuple[float, float]:
+    """Median and IQR of a feature, the way sklearn's RobustScaler fits them."""
+    values = _fill(values)
+    center = np.nanmedian(values)
+    q25, q75 = np.nanpercentile(values, (25.0, 75.0))
+    scale = q75 - q25
+    if scale < 10 * np.finfo(np.float64).eps:
+        scale = 1.0
+    return float(center), float(scale)
+
+
+def robust_scale(values: np.ndarray, center: float = None, scale: float = None) -> np.ndarray:
+    """Robust-scale a feature, fitting the statistics unless they are given."""
+    if center is None:
+        center, scale = robust_stats(values)
+    return (_fill(values) - center) / scale
+
+
+def _scale(name: str, values: np.ndarray, state: ScalingState,
+           fitted: Dict[str, Tuple[float, float]]) -> np.ndarray:
+    """Scale with frozen state when available, else fit on this batch."""
+    if state is not None and name in state.centers:
+        return robust_scale(values, state.centers[name], state.scales[name])
+    if name not in fitted:
+        fitted[name] = robust_stats(values)
+    return robust_scale(values, *fitted[name])
+
+
+def unavailable_mask(cols: Dict[str, np.ndarray]) -> np.ndarray:
+    """Parts with no inventory and a lead time over 12 weeks."""
+    if 'inventory' in cols and 'leadtime_weeks' in cols:
+        return (cols['inventory'] == 0) & (cols['leadtime_weeks'] > 12)
+    return None
+
+
+def normalize_scores(scores: np.ndarray, score_min: float = None,
+                     score_max: float = None) -> np.ndarray:
+    """Min-max normalize scores to 0-100, rounded to 2 decimals.
+
+    When a frozen range is given, scores outside it are clipped to 0-100.
+    """
+    frozen = score_min is not None
+    min_score = score_min if frozen else np.nanmin(scores)
+    max_score = score_max if frozen else np.nanmax(scores)
+
+    if max_score == min_score:
+        return np.full(len(scores), 50.0)
+
+    normalized = ((scores - min_score) / (max_score - min_score)) * 100
+    return np.clip(normalized, 0, 100 if frozen else None).round(2)
+
+
+def percentile_rank(scores: np.ndarray) -> np.ndarray:
+    """Average-method percentile rank, same as ``rank(pct=True) * 100``."""
+    n_rows = len(scores)
+    order = np.argsort(scores, kind='mergesort')
+    sorted_scores = scores[order]
+
+    boundaries = np.flatnonzero(np.r_[True, sorted_scores[1:] != sorted_scores[:-1], True])
+    starts, ends = boundaries[:-1], boundaries[1:]
+    average_ranks = (starts + 1 + ends) / 2.0
+
+    ranks = np.empty(n_rows, dtype=np.float64)
+    ranks[order] = np.repeat(average_ranks, ends - starts)
+    return ranks / n_rows * 100
+
+
+def _rule_columns(df, cols: Dict[str, np.ndarray], boosts: CompiledBoosts,
+                  state: ScalingState, fitted: Dict[str, Tuple[float, float]]) -> Dict[str, np.ndarray]:
+    """Columns as the boost rules see them.
+
+    FeatureEngineer scales every column with a scaled prefix, including the
+    raw demand_all_time input, so the boost rules see the scaled value.
+    String comparisons read the raw column.
+    """
+    rule_cols = {}
+    names = column_names(df)
+    for col in boosts.columns:
+        if col in boosts.string_columns:
+            if isinstance(df, pa.Table) and col in names:
+                rule_cols[col] = arrow.column_as_object(df.column(col))
+            elif col in names:
+                rule_cols[col] = df[col].to_numpy(dtype=object)
+        elif col in cols:
+            rule_cols[col] = _scale(col, cols[col], state, fitted) if col.startswith(SCALED_PREFIXES) else cols[col]
+    return rule_cols
+
+
+def boosted_scores(df: pd.DataFrame, weights: Dict[str, float], feature_config: Dict[str, Any],
+                   state: ScalingState = None, boosts: CompiledBoosts = None,
+                   dtype=np.float64, explanation: Dict = None, jit: bool = False) -> Tuple[np.ndarray, np.ndarray, Dict]:
+    """Base and boosted scores, plus any scaling statistics fitted on the batch.
+
+    ``dtype`` sets the precision of the feature block and base score. When
+    an ``explanation`` dict is given it is filled, in the same pass, with
+    the per-feature contributions, per-rule boost multipliers and the
+    unavailable flags (see ``ScoreExplanation``). With ``jit`` set and
+    numba installed, full-precision scores without explanations come from
+    the fused row loop in ``core/fused.py`` instead.
+    """
+    n_rows = len(df)
+    boosts = boosts or default_boosts()
+    if jit and explanation is None and dtype == np.float64:
+        from .fused import NUMBA_AVAILABLE, fused_scores
+
+        if NUMBA_AVAILABLE:
+            return fused_scores(df, weights, feature_config, state, boosts)
+        logger.debug("numba is not installed; scoring with the NumPy kernel")
+    _, cols = extract_block(df, required_columns(weights, feature_config, boosts), dtype)
+    fitted = {}
+
+    base_score = np.zeros(n_rows, dtype=dtype)
+    for feature, weight in weights.items():
+        values = compute_feature(feature, cols, feature_config)
+        if values is None:
+            logger.warning(f"Feature {feature} not found in dataframe")
+            continue
+        if feature.startswith(SCALED_PREFIXES):
+            values = _scale(feature, values, state, fitted)
+        contribution = _fill(values) * weight
+        base_score += contribution
+        if explanation is not None:
+            explanation.setdefault('features', []).append(feature)
+            explanation.setdefault('contributions', []).append(contribution.astype(EXPLAIN_DTYPE))
+
+    unavailable = unavailable_mask(cols)
+    if unavailable is not None:
+        base_score[unavailable] = 0
+
+    factors = [] if explanation is not None else None
+    rule_cols = _rule_columns(df, cols, boosts, state, fitted)
+    boosted_score = base_score * boosts.multiplier(rule_cols, n_rows, factors)
+
+    if explanation is not None:
+        explanation['rules'] = [rule.name for rule in boosts.rules]
+        explanation['boost_multipliers'] = [factor.astype(EXPLAIN_DTYPE) for factor in factors]
+        explanation['unavailable'] = unavailable if unavailable is not None else np.zeros(n_rows, dtype=bool)
+
+    return base_score, boosted_score, fitted
+
+
+def strategy_scores(df: pd.DataFrame, strategies: Dict[str, Dict[str, float]],
+                    feature_config: Dict[str, Any], normalize: bool = True,
+                    state: ScalingState = None, boosts: CompiledBoosts = None) -> Dict[str, np.ndarray]:
+    """Score several weight configurations with one feature pass.
+
+    Features are engineered once into an (n, f) matrix and all base scores
+    come from a single multiply with the (f, s) weight matrix, so results
+    match single-strategy scoring to floating point rounding rather than
+    bit for bit.
+
+    Args:
+        df: Input dataframe with raw part columns
+        strategies: Mapping of strategy name to feature weights
+        feature_config: Feature engineering configuration
+        normalize: Min-max normalize each strategy's scores to 0-100
+        state: Frozen feature scaling; score normalization is always per
+            strategy on this batch
+        boosts: Compiled business boosts, defaults to the configured rules
+
+    Returns:
+        Mapping of strategy name to its priority scores
+    """
+    n_rows = len(df)
+    boosts = boosts or default_boosts()
+    features = list(dict.fromkeys(feature for weights in strategies.values() for feature in weights))
+    _, cols = extract_block(df, required_columns(dict.fromkeys(features, 1.0), feature_config, boosts))
+    fitted = {}
+
+    feature_matrix = np.zeros((n_rows, len(features)), dtype=np.float64)
+    for j, feature in enumerate(features):
+        values = compute_feature(feature, cols, feature_config)
+        if values is None:
+            logger.warning(f"Feature {feature} not found in dataframe")
+            continue
+        if feature.startswith(SCALED_PREFIXES):
+            values = _scale(feature, values, state, fitted)
+        feature_matrix[:, j] = _fill(values)
+
+    weight_matrix = np.array([[weights.get(feature, 0.0) for weights in strategies.values()]
+                              for feature in features], dtype=np.float64).reshape(len(features), -1)
+    scores = feature_matrix @ weight_matrix
+
+    unavailable = unavailable_mask(cols)
+    if unavailable is not None:
+        scores[unavailable] = 0
+
+    scores *= boosts.multiplier(_rule_columns(df, cols, boosts, state, fitted), n_rows)[:, None]
+
+    if normalize:
+        scores = _normalize_columns(scores)
+
+    return {name: scores[:, j] for j, name in enumerate(strategies)}
+
+
+def _normalize_columns(scores: np.ndarray) -> np.ndarray:
+    """Min-max normalize each column to 0-100, rounded to 2 decimals."""
+    min_scores = np.nanmin(scores, axis=0)
+    score_range = np.nanmax(scores, axis=0) - min_scores
+    constant = score_range == 0
+
+    normalized = (scores - min_scores) / np.where(constant, 1.0, score_range) * 100
+    normalized[:, constant] = 50.0
+    return np.clip(normalized, 0, None).round(2)
+
+
+def scaling_inputs(df: pd.DataFrame, weights: Dict[str, float], feature_config: Dict[str, Any],
+                   boosts: CompiledBoosts = None) -> Dict[str, np.ndarray]:
+    """Unscaled, NaN-filled values of every column the kernel robust-scales."""
+    boosts = boosts or default_boosts()
+    _, cols = extract_block(df, required_columns(weights, feature_config, boosts))
+    inputs = {}
+
+    for feature in weights:
+        if feature.startswith(SCALED_PREFIXES):
+            values = compute_feature(feature, cols, feature_config)
+            if values is not None:
+                inputs[feature] = _fill(values)
+
+    for col in boosts.columns:
+        if col in cols and col.startswith(SCALED_PREFIXES) and col not in boosts.string_columns:
+            inputs[col] = _fill(cols[col])
+
+    return inputs
+
+
+def fit_state(df: pd.DataFrame, weights: Dict[str, float], feature_config: Dict[str, Any],
+              boosts: CompiledBoosts = None) -> ScalingState:
+    """Fit scaling statistics, the boosted score range and the score histogram on a reference population."""
+    _, boosted_score, fitted = boosted_scores(df, weights, feature_config, boosts=boosts)
+    score_min, score_max = float(np.nanmin(boosted_score)), float(np.nanmax(boosted_score))
+
+    return ScalingState(
+        centers={name: stats[0] for name, stats in fitted.items()},
+        scales={name: stats[1] for name, stats in fitted.items()},
+        score_min=score_min,
+        score_max=score_max,
+        n_rows=len(df),
+        score_histogram=score_histogram(normalize_scores(boosted_score, score_min, score_max)).tolist()
+    )
+
+
+def score_histogram(scores: np.ndarray) -> np.ndarray:
+    """Exact counts of normalized scores on the 0.01 grid from 0 to 100."""
+    bins = np.rint(np.asarray(scores) * 100)
+    if len(bins) and (np.isnan(bins).any() or bins.min() < 0 or bins.max() >= len(SCORE_GRID)):
+        raise ValueError("Histogram percentiles need normalized scores in 0-100")
+    return np.bincount(bins.astype(np.int64), minlength=len(SCORE_GRID))
+
+
+def histogram_percentiles(scores: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Average-method percentiles from grid counts, with no sort.
+
+    Equal to ``rank(pct=True) * 100`` when counts are the histogram of the
+    scores being ranked, since rounded scores in one bin are identical.
+    """
+    bins = np.rint(np.asarray(scores) * 100).astype(np.int64)
+    below = np.r_[0, np.cumsum(counts)][bins]
+    return (below + (counts[bins] + 1) / 2.0) / counts.sum() * 100
+
+
+def compute_percentiles(scores: np.ndarray, mode: str = 'rank', state: ScalingState = None,
+                        positions: np.ndarray = None) -> np.ndarray:
+    """``score_percentile`` for all rows, or only for ``positions``.
+
+    Args:
+        scores: Priority scores of the whole batch
+        mode: ``'rank'`` sorts the batch, ``'histogram'`` counts the batch on
+            the 0.01 score grid, ``'reference'`` looks scores up in the
+            fitted state's score histogram by binary search
+        state: Fitted state, required for ``'reference'``
+        positions: Rows to return percentiles for; all rows when None
+
+    Returns:
+        Percentiles in 0-100
+    """
+    if mode not in PERCENTILE_MODES:
+        raise ValueError(f"Unknown percentile mode: {mode}")
+
+    if mode == 'reference':
+        if state is None or state.score_histogram is None:
+            raise ValueError("Reference percentiles need a fitted state. Call fit() first.")
+        selected = scores if positions is None else scores[positions]
+        return reference_percentiles(selected, SCORE_GRID, np.asarray(state.score_histogram, dtype=np.float64))
+
+    if mode == 'histogram':
+        counts = score_histogram(scores)
+        return histogram_percentiles(scores if positions is None else scores[positions], counts)
+
+    if positions is None:
+        return percentile_rank(scores)
+    return subset_percentiles(scores, positions)
+
+
+def top_k_indices(scores: np.ndarray, k: int, groups: np.ndarray = None) -> np.ndarray:
+    """Positions of the k highest scores, overall or within each group.
+
+    Uses partial selection instead of a full sort. Ties at the cut-off are
+    broken by input order.
+
+    Args:
+        scores: Scores to select from
+        k: Number of rows to keep (per group when groups is given)
+        groups: Optional integer group code for each row
+
+    Returns:
+        Selected positions in ascending order within each group
+    """
+    if groups is None:
+        return _top_k(scores, np.arange(len(scores)), k)
+
+    order = np.argsort(groups, kind='stable')
+    bounds = np.flatnonzero(np.diff(groups[order])) + 1
+    return np.concatenate([_top_k(scores[positions], positions, k)
+                           for positions in np.split(order, bounds)])
+
+
+def _top_k(scores: np.ndarray, positions: np.ndarray, k: int) -> np.ndarray:
+    """Top-k selection for one group."""
+    if len(scores) <= k:
+        return positions
+
+    threshold = np.partition(scores, len(scores) - k)[len(scores) - k]
+    above = np.flatnonzero(scores > threshold)
+    tied = np.flatnonzero(scores == threshold)[:k - len(above)]
+    return positions[np.sort(np.r_[above, tied])]
+
+
+def subset_percentiles(scores: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """Exact ``rank(pct=True) * 100`` of selected rows within all scores.
+
+    Only the selected values are sorted; the full population is counted
+    against them in O(n log m).
+    """
+    values = np.unique(scores[positions])
+    counts_below = np.bincount(np.searchsorted(values, scores, side='right'), minlength=len(values) + 1)
+    counts_through = np.bincount(np.searchsorted(values, scores, side='left'), minlength=len(values) + 1)
+
+    slot = np.searchsorted(values, scores[positions])
+    below = np.cumsum(counts_below)[slot]
+    through = np.cumsum(counts_through)[slot]
+    return (below + (through - below + 1) / 2.0) / len(scores) * 100
+
+
+def reference_percentiles(scores: np.ndarray, reference: np.ndarray,
+                          weights: np.ndarray = None) -> np.ndarray:
+    """Average-method percentile of scores within a sorted reference distribution.
+
+    Args:
+        scores: Scores to rank
+        reference: Sorted reference scores
+        weights: Optional weight of each reference score (e.g. from a sketch)
+
+    Returns:
+        Percentiles in 0-100, equal to ``rank(pct=True) * 100`` when the
+        scores are the reference population itself
+    """
+    if weights is None:
+        cumulative = np.arange(len(reference) + 1, dtype=np.float64)
+    else:
+        cumulative = np.r_[0.0, np.cumsum(weights)]
+
+    below = cumulative[np.searchsorted(reference, scores, side='left')]
+    through = cumulative[np.searchsorted(reference, scores, side='right')]
+    return (below + (through - below + 1) / 2.0) / cumulative[-1] * 100
+
+
+def score_arrays(df: pd.DataFrame, weights: Dict[str, float], feature_config: Dict[str, Any],
+                 normalize: bool = True, state: ScalingState = None,
+                 percentile: str = 'rank', boosts: CompiledBoosts = None,
+                 reference: ScalingState = None, dtype=np.float64,
+                 explanation: Dict = None, jit: bool = False) -> Dict[str, np.ndarray]:
+    """Score a dataframe in one vectorized pass.
+
+    Args:
+        df: Input dataframe with raw part columns
+        weights: Feature weights
+        feature_config: Feature engineering configuration
+        normalize: Min-max normalize the boosted score to 0-100
+        state: Frozen scaling state; fitted on this batch when None
+        percentile: Percentile mode (see ``compute_percentiles``), or None
+            to skip ``score_percentile`` when only a subset will be ranked
+        boosts: Compiled business boosts, defaults to the configured rules
+        reference: Fitted state holding the reference score histogram,
+            defaults to ``state``
+        dtype: Precision of the feature block; ``np.float32`` in compact mode
+        explanation: Optional dict to collect score explanations into
+        jit: Use the numba-compiled fused loop when numba is installed
+
+    Returns:
+        Mapping of result column name to array, in input row order
+    """
+    base_score, boosted_score, _ = boosted_scores(df, weights, feature_config, state, boosts, dtype,
+                                                  explanation, jit)
+
+    if not normalize:
+        priority_score = boosted_score
+    elif state is not None and state.score_min is not None:
+        priority_score = normalize_scores(boosted_score, state.score_min, state.score_max)
+    else:
+        priority_score = normalize_scores(boosted_score)
+
+    scores = {
+        'base_score': base_score,
+        'boosted_score': boosted_score,
+        'priority_score': priority_score,
+    }
+    if percentile is not None:
+        scores['score_percentile'] = compute_percentiles(priority_score, percentile, reference or state)
+    return scores
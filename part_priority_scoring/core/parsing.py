@@ -0,0 +1,145 @@
+"""Vectorized parsing of raw lead-time strings and demand JSON.
+
+The scoring queries derive ``leadtime_weeks`` and ``demand_index`` in
+BigQuery SQL. These functions do the same for raw CSV/Parquet exports,
+using Arrow's compute kernels instead of row-wise Python.
+"""
+
+import re
+import json
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Leading count of a week or day lead time, e.g. "12 Weeks", "3 wks", "10 Days"
+WEEKS_PATTERN = r'(?i)(?P<value>\d+)\s*(?:week|wk)'
+DAYS_PATTERN = r'(?i)(?P<value>\d+)\s*day'
+IN_STOCK_PATTERN = r'(?i)\bin[\s-]*stock\b'
+NEGATION_PATTERN = r'(?i)\b(?:not|out)\b'
+
+# A JSON number, optionally quoted as in JSON_EXTRACT_SCALAR + SAFE_CAST
+_NUMBER = r'"?(?P<value>-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)"?\s*[,}]'
+
+
+def parse_leadtime(values) -> np.ndarray:
+    """Lead time in weeks from raw ``leadtime`` strings.
+
+    Matches ``sql/scoring_batch.sql`` for "<n> Week(s)" and also reads
+    "<n> wk(s)", "<n> Day(s)" (rounded up to whole weeks) and "In Stock"
+    (0 weeks). Case is ignored, and anything else is NaN. Lead-time
+    strings repeat heavily, so each distinct string is parsed once.
+
+    Args:
+        values: Series, Arrow array or sequence of strings. Numeric input
+            is already in weeks and is returned as float.
+
+    Returns:
+        Float array of weeks
+    """
+    if isinstance(values, pd.Series) and pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(dtype=np.float64, na_value=np.nan)
+
+    encoded = pc.dictionary_encode(_string_array(values))
+    distinct = encoded.dictionary
+
+    weeks = _extract_number(distinct, WEEKS_PATTERN)
+    days = np.ceil(_extract_number(distinct, DAYS_PATTERN) / 7)
+    in_stock = _matches(distinct, IN_STOCK_PATTERN) & ~_matches(distinct, NEGATION_PATTERN)
+
+    weeks = np.where(np.isnan(weeks), days, weeks)
+    weeks = np.where(np.isnan(weeks) & in_stock, 0.0, weeks)
+
+    # Nulls take the trailing NaN slot
+    weeks = np.append(weeks, np.nan)
+    indices = pc.fill_null(encoded.indices, len(distinct)).to_numpy()
+    return weeks[indices]
+
+
+def parse_demand_totals(values, field: str = 'demand_index') -> np.ndarray:
+    """A field of the first ``demand_totals`` entry from raw JSON strings.
+
+    Equivalent to ``SAFE_CAST(JSON_EXTRACT_SCALAR(demand_totals,
+    '$.demand_totals[0].<field>') AS FLOAT64)``. The common layout, with
+    ``demand_totals`` as the first key and ``field`` first in its first
+    entry, is read with one anchored regex over the whole column. Rows in
+    any other layout that mention ``field`` fall back to ``json.loads``.
+
+    Args:
+        values: Series, Arrow array or sequence of JSON strings
+        field: Key to read from the first entry
+
+    Returns:
+        Float array, NaN where the JSON, entry or field is missing or not numeric
+    """
+    array = _string_array(values)
+    key = re.escape(f'"{field}"')
+    fast = rf'^\s*\{{\s*"demand_totals"\s*:\s*\[\s*\{{\s*{key}\s*:\s*{_NUMBER}'
+    result = _extract_number(array, fast)
+
+    # Slow path for the rows the anchored pattern could not read
+    candidates = pc.fill_null(pc.match_substring(array, f'"{field}"'), False).to_numpy(zero_copy_only=False)
+    for row in np.flatnonzero(np.isnan(result) & candidates):
+        result[row] = _demand_from_json(array[row].as_py(), field)
+    return result
+
+
+def parse_raw_columns(df):
+    """Add ``leadtime_weeks`` and ``demand_index`` from raw ``leadtime`` and ``demand_totals``.
+
+    Columns that already exist are left as they are. ``demand_index``
+    defaults to 0 like in ``DataLoader.load_sample_data``.
+
+    Args:
+        df: Raw parts, e.g. a CSV or Parquet export of the source tables,
+            as a dataframe or ``pyarrow.Table``
+
+    Returns:
+        Dataframe (or Arrow table) with the parsed columns added
+    """
+    columns = df.column_names if isinstance(df, pa.Table) else df.columns
+    parsed = {}
+    if 'leadtime' in columns and 'leadtime_weeks' not in columns:
+        parsed['leadtime_weeks'] = parse_leadtime(df['leadtime'])
+    if 'demand_totals' in columns and 'demand_index' not in columns:
+        parsed['demand_index'] = np.nan_to_num(parse_demand_totals(df['demand_totals']), nan=0.0)
+
+    if isinstance(df, pa.Table):
+        for name, values in parsed.items():
+            # Unparsed lead times are null, as in a converted dataframe
+            df = df.append_column(name, pa.array(values, from_pandas=True))
+        return df
+    return df.assign(**parsed) if parsed else df
+
+
+def _string_array(values) -> pa.Array:
+    if isinstance(values, pa.ChunkedArray):
+        values = values.combine_chunks()
+    if not isinstance(values, pa.Array):
+        values = pa.array(values, from_pandas=True)
+    if pa.types.is_dictionary(values.type):
+        values = values.dictionary_decode()
+    if pa.types.is_null(values.type):
+        values = values.cast(pa.string())
+    return values
+
+
+def _extract_number(array: pa.Array, pattern: str) -> np.ndarray:
+    """The ``value`` group of ``pattern`` as floats, NaN where it does not match."""
+    matched = pc.extract_regex(array, pattern)
+    numbers = pc.cast(pc.struct_field(matched, 'value'), pa.float64())
+    return numbers.to_numpy(zero_copy_only=False, writable=True)
+
+
+def _matches(array: pa.Array, pattern: str) -> np.ndarray:
+    return pc.fill_null(pc.match_substring_regex(array, pattern), False).to_numpy(zero_copy_only=False)
+
+
+def _demand_from_json(text: str, field: str) -> float:
+    try:
+        value = json.loads(text)['demand_totals'][0][field]
+        if isinstance(value, bool):
+            return np.nan
+        return float(value)
+    except (ValueError, TypeError, KeyError, IndexError):
+        return np.nan
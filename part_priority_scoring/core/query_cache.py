@@ -0,0 +1,135 @@
+"""On-disk cache of query results, keyed by the normalized SQL text."""
+
+import os
+import re
+import json
+import time
+import uuid
+import hashlib
+import logging
+import pyarrow as pa
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# String literals and quoted identifiers, or runs of whitespace and comments
+_SQL_TOKENS = re.compile(r"""('(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|`[^`]*`)|(?:\s|--[^\n]*|\#[^\n]*|/\*.*?\*/)+""",
+                         re.DOTALL)
+
+
+def normalize_sql(query: str) -> str:
+    """SQL with comments dropped and whitespace collapsed outside of quotes."""
+    def replace(match):
+        literal = match.group(1)
+        return literal if literal is not None else ' '
+    return _SQL_TOKENS.sub(replace, query).strip()
+
+
+def query_key(query: str, params: Dict[str, Any] = None) -> str:
+    """Digest of the normalized query and its parameters."""
+    spec = {'query': normalize_sql(query), 'params': params or {}}
+    return hashlib.sha1(json.dumps(spec, sort_keys=True, default=str).encode()).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Lookups served by a ``QueryCache`` since it was opened."""
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups found in the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class QueryCache:
+    """Local store of query results as Arrow IPC files.
+
+    Results are keyed by ``query_key``, so reformatting a query or editing
+    its comments still hits, while any change to its text or parameters
+    misses. ``ORDER BY RAND()`` samples therefore stay fixed until the
+    entry expires, which is what repeated development runs want.
+
+    Entries expire ``ttl`` seconds after they were written (the file's
+    modification time). A hit sets the file's access time, and when the
+    cache grows past ``max_bytes`` the least recently used entries are
+    deleted. Reads memory-map the file, so a hit costs no copy until the
+    columns are converted.
+    """
+
+    def __init__(self, path: Union[str, Path], ttl: float = 24 * 3600, max_bytes: int = 4 * 2 ** 30):
+        """Initialize cache.
+
+        Args:
+            path: Cache directory, created on first store
+            ttl: Seconds after which an entry is stale, None to never expire
+            max_bytes: Size above which least recently used entries are evicted
+        """
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+
+    def get(self, query: str, params: Dict[str, Any] = None) -> Optional[pa.Table]:
+        """Cached result of ``query``, or None if missing or expired."""
+        path = self._entry(query_key(query, params))
+        try:
+            written = path.stat().st_mtime
+        except FileNotFoundError:
+            self.stats.misses += 1
+            return None
+
+        if self.ttl is not None and time.time() - written > self.ttl:
+            path.unlink(missing_ok=True)
+            self.stats.misses += 1
+            logger.info(f"Query cache entry {path.stem[:12]} expired")
+            return None
+
+        table = pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+        os.utime(path, (time.time(), written))
+        self.stats.hits += 1
+        logger.info(f"Query cache hit {path.stem[:12]}: {table.num_rows} rows")
+        return table
+
+    def put(self, query: str, table: pa.Table, params: Dict[str, Any] = None):
+        """Store the result of ``query``, then evict."""
+        path = self._entry(query_key(query, params))
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temporary name so readers never see a partial file
+        partial = path.with_name(f'{path.stem}.{uuid.uuid4().hex}.tmp')
+        with pa.OSFile(str(partial), 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(partial, path)
+        self._evict()
+
+    def size(self) -> int:
+        """Bytes used by all entries."""
+        return sum(path.stat().st_size for path in self._entries())
+
+    def clear(self):
+        """Delete every entry."""
+        for path in self._entries():
+            path.unlink()
+
+    def _evict(self):
+        """Delete least recently used entries until the cache fits in ``max_bytes``."""
+        entries = sorted(self._entries(), key=lambda p: max(p.stat().st_atime_ns, p.stat().st_mtime_ns))
+        total = sum(path.stat().st_size for path in entries)
+        for path in entries:
+            if total <= self.max_bytes:
+                break
+            total -= path.stat().st_size
+            path.unlink()
+            logger.info(f"Evicted query cache entry {path.stem[:12]}")
+
+    def _entry(self, key: str) -> Path:
+        return self.path / f'{key}.arrow'
+
+    def _entries(self) -> List[Path]:
+        return list(self.path.glob('*.arrow'))
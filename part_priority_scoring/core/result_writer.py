@@ -0,0 +1,348 @@
+"""Chunked Parquet writer for scored results, with BigQuery and local sinks."""
+
+import io
+import uuid
+import logging
+import threading
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from concurrent.futures import ThreadPoolExecutor, Future
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Union
+from google.cloud import bigquery
+from google.cloud.exceptions import NotFound
+
+logger = logging.getLogger(__name__)
+
+PIPELINE_VERSION = '1.0.0'
+
+# Columns of `datadojo.part_priority_scoring.part_scores`, see sql/create_output_table.sql
+PART_SCORES_SCHEMA = pa.schema([
+    pa.field('pn', pa.string(), nullable=False),
+    ('pn_clean', pa.string()),
+    ('desc', pa.string()),
+    ('category', pa.string()),
+    ('manuf', pa.string()),
+    ('inventory', pa.int64()),
+    ('first_price', pa.float64()),
+    ('leadtime_weeks', pa.int64()),
+    ('moq', pa.float64()),
+    ('source_type', pa.string()),
+    ('demand_all_time', pa.int64()),
+    ('demand_index', pa.float64()),
+    ('availability_score', pa.float64()),
+    ('is_authorized', pa.int64()),
+    ('has_datasheet', pa.int64()),
+    ('base_score', pa.float64()),
+    ('priority_score', pa.float64()),
+    ('score_percentile', pa.float64()),
+    ('processed_at', pa.timestamp('us', tz='UTC')),
+    ('batch_id', pa.string()),
+    ('pipeline_version', pa.string()),
+])
+
+# Output tables whose columns are projected onto a fixed schema
+OUTPUT_SCHEMAS: Dict[str, pa.Schema] = {'part_scores': PART_SCORES_SCHEMA}
+
+
+def results_table(df: pd.DataFrame, metadata: Dict[str, object], schema: pa.Schema = None) -> pa.Table:
+    """Arrow table of ``df`` plus constant metadata columns.
+
+    With a ``schema``, only its columns are kept, in its order and cast to
+    its types. Columns missing from ``df`` are null. Without one, all of
+    ``df``'s columns are kept. ``df`` itself is never modified or copied
+    as a whole; only the converted columns are allocated.
+
+    Args:
+        df: Scored rows
+        metadata: Constant values by column, e.g. ``processed_at``
+        schema: Destination schema
+
+    Returns:
+        Table with ``len(df)`` rows
+    """
+    n_rows = len(df)
+    if schema is None:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        for name, value in metadata.items():
+            table = table.append_column(name, _constant(value, n_rows))
+        return table
+
+    columns = []
+    for field in schema:
+        if field.name in metadata:
+            columns.append(_constant(metadata[field.name], n_rows, field.type))
+        elif field.name in df.columns:
+            columns.append(pa.Array.from_pandas(df[field.name], type=field.type))
+        else:
+            columns.append(pa.nulls(n_rows, field.type))
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def _constant(value, n_rows: int, type: pa.DataType = None) -> pa.Array:
+    """``value`` repeated ``n_rows`` times."""
+    if isinstance(value, datetime) and value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return pa.repeat(pa.scalar(value, type=type), n_rows)
+
+
+class ResultSink:
+    """Destination of serialized Parquet chunks.
+
+    ``upload`` is called concurrently from several threads. ``commit``
+    runs once after every chunk was uploaded, ``abort`` if any failed.
+    Sinks with a ``merge_key`` upsert the uploaded rows on that column;
+    the others replace the destination.
+    """
+
+    merge_key: str = None
+
+    def begin(self, schema: pa.Schema):
+        """Prepare for a write of tables with ``schema``."""
+
+    def upload(self, part: int, data: pa.Buffer):
+        """Store one Parquet file."""
+        raise NotImplementedError
+
+    def commit(self):
+        """Make the uploaded chunks visible."""
+
+    def abort(self):
+        """Discard the uploaded chunks."""
+
+
+class LocalSink(ResultSink):
+    """Writes chunks as ``part-<n>.parquet`` files into a directory.
+
+    Chunks go to a hidden staging directory that replaces ``path`` on
+    commit, so ``pq.read_table(path)`` sees either the previous or the
+    complete new result. With a ``merge_key``, the previous rows whose
+    key was not uploaded are carried over into the staging directory
+    first; they are read into memory, so this suits tests and modest
+    local outputs.
+    """
+
+    def __init__(self, path: Union[str, Path], merge_key: str = None):
+        """Initialize sink.
+
+        Args:
+            path: Output directory
+            merge_key: Column to merge on (e.g. ``'pn'``) instead of
+                replacing the previous output
+        """
+        self.path = Path(path)
+        self.merge_key = merge_key
+        self._staging = None
+        self._schema = None
+
+    def begin(self, schema: pa.Schema):
+        self._staging = self.path.with_name(f'.{self.path.name}.{uuid.uuid4().hex}')
+        self._staging.mkdir(parents=True)
+        self._schema = schema
+
+    def upload(self, part: int, data: pa.Buffer):
+        with open(self._staging / f'part-{part:05d}.parquet', 'wb') as f:
+            f.write(data)
+
+    def commit(self):
+        if self.merge_key and self.path.exists():
+            self._carry_over()
+        if self.path.exists():
+            for old in self.path.glob('part-*.parquet'):
+                old.unlink()
+            self.path.rmdir()
+        self._staging.rename(self.path)
+
+    def abort(self):
+        for partial in self._staging.glob('*'):
+            partial.unlink()
+        self._staging.rmdir()
+
+    def _carry_over(self):
+        """Copy previous rows whose ``merge_key`` was not uploaded into the staging directory."""
+        staged = self._staging.glob('part-*.parquet')
+        keys = pq.read_table(self._staging, columns=[self.merge_key]).column(self.merge_key)
+        previous = pq.read_table(self.path, schema=self._schema)
+        kept = previous.filter(pc.invert(pc.is_in(previous.column(self.merge_key), value_set=keys)))
+        pq.write_table(kept, self._staging / f'part-{len(list(staged)):05d}.parquet')
+
+
+class BigQuerySink(ResultSink):
+    """Loads chunks into a staging table, then copies or merges it into the destination.
+
+    Every chunk is one Parquet load job appending to the staging table, so
+    chunks upload concurrently. The staging table takes the destination's
+    partitioning and clustering and expires after a day in case a write
+    is abandoned. One copy job with ``write_disposition`` then replaces or
+    appends to the destination, so readers never see a partial result.
+    With a ``merge_key``, a ``MERGE`` statement instead updates the
+    destination rows whose key is staged and inserts the rest.
+    """
+
+    def __init__(self, client, table_id: str, write_disposition: str = 'WRITE_TRUNCATE',
+                 merge_key: str = None):
+        """Initialize sink.
+
+        Args:
+            client: ``bigquery.Client``
+            table_id: Destination table, ``dataset.table`` or ``project.dataset.table``
+            write_disposition: ``'WRITE_TRUNCATE'`` or ``'WRITE_APPEND'``
+            merge_key: Column to merge on (e.g. ``'pn'``); the staged rows
+                are copied as with ``write_disposition`` when the
+                destination does not exist yet
+        """
+        self.client = client
+        self.table_id = table_id
+        self.write_disposition = write_disposition
+        self.merge_key = merge_key
+        self.staging_id = None
+        self._columns: List[str] = []
+        self._destination_exists = False
+
+    def begin(self, schema: pa.Schema):
+        self.staging_id = f"{self.table_id}_staging_{uuid.uuid4().hex[:12]}"
+        self._columns = schema.names
+        staging = bigquery.Table(self.staging_id, schema=_bigquery_schema(schema))
+        try:
+            destination = self.client.get_table(self.table_id)
+            staging.time_partitioning = destination.time_partitioning
+            staging.clustering_fields = destination.clustering_fields
+            self._destination_exists = True
+        except NotFound:
+            self._destination_exists = False
+        staging.expires = datetime.now(timezone.utc) + timedelta(days=1)
+        self.client.create_table(staging)
+
+    def upload(self, part: int, data: pa.Buffer):
+        job_config = bigquery.LoadJobConfig(
+            source_format=bigquery.SourceFormat.PARQUET,
+            write_disposition='WRITE_APPEND'
+        )
+        job = self.client.load_table_from_file(io.BytesIO(data), self.staging_id, job_config=job_config)
+        job.result()
+
+    def commit(self):
+        try:
+            if self.merge_key and self._destination_exists:
+                self.client.query(self.merge_query()).result()
+            else:
+                job_config = bigquery.CopyJobConfig(
+                    write_disposition=self.write_disposition,
+                    create_disposition='CREATE_IF_NEEDED'
+                )
+                self.client.copy_table(self.staging_id, self.table_id, job_config=job_config).result()
+        finally:
+            self.client.delete_table(self.staging_id, not_found_ok=True)
+
+    def merge_query(self) -> str:
+        """``MERGE`` of the staging table into the destination on ``merge_key``."""
+        updates = ',\n    '.join(f"`{col}` = S.`{col}`" for col in self._columns if col != self.merge_key)
+        columns = ', '.join(f"`{col}`" for col in self._columns)
+        values = ', '.join(f"S.`{col}`" for col in self._columns)
+        return f"""
+        MERGE `{self.table_id}` T
+        USING `{self.staging_id}` S
+        ON T.`{self.merge_key}` = S.`{self.merge_key}`
+        WHEN MATCHED THEN UPDATE SET
+            {updates}
+        WHEN NOT MATCHED THEN
+            INSERT ({columns}) VALUES ({values})
+        """
+
+    def abort(self):
+        self.client.delete_table(self.staging_id, not_found_ok=True)
+
+
+def _bigquery_schema(schema: pa.Schema) -> List:
+    types = {pa.string(): 'STRING', pa.large_string(): 'STRING', pa.int64(): 'INT64',
+             pa.float64(): 'FLOAT64', pa.bool_(): 'BOOL', pa.date32(): 'DATE'}
+    fields = []
+    for field in schema:
+        if pa.types.is_timestamp(field.type):
+            field_type = 'TIMESTAMP' if field.type.tz else 'DATETIME'
+        elif pa.types.is_integer(field.type):
+            field_type = 'INT64'
+        elif pa.types.is_floating(field.type):
+            field_type = 'FLOAT64'
+        else:
+            field_type = types.get(field.type, 'STRING')
+        fields.append(bigquery.SchemaField(field.name, field_type,
+                                           mode='NULLABLE' if field.nullable else 'REQUIRED'))
+    return fields
+
+
+class ResultWriter:
+    """Write a scored frame to a sink in bounded Parquet chunks.
+
+    The frame is converted to Arrow ``chunk_rows`` rows at a time. Each
+    chunk is serialized to Parquet (row groups of at most
+    ``row_group_rows`` rows) and uploaded on one of ``max_workers``
+    threads; Parquet encoding and compression release the GIL, so chunks
+    are encoded in parallel too. At most ``max_workers`` chunks are in
+    flight, which bounds memory beyond the frame itself.
+    """
+
+    def __init__(self, sink: ResultSink, chunk_rows: int = 1_000_000, row_group_rows: int = 128 * 1024,
+                 max_workers: int = 4, compression: str = 'snappy'):
+        """Initialize writer.
+
+        Args:
+            sink: Destination of the Parquet chunks
+            chunk_rows: Rows per uploaded Parquet file
+            row_group_rows: Rows per Parquet row group
+            max_workers: Chunks serialized and uploaded concurrently
+            compression: Parquet compression codec
+        """
+        if chunk_rows < 1 or max_workers < 1:
+            raise ValueError("chunk_rows and max_workers must be positive")
+        self.sink = sink
+        self.chunk_rows = chunk_rows
+        self.row_group_rows = row_group_rows
+        self.max_workers = max_workers
+        self.compression = compression
+
+    def write(self, df: pd.DataFrame, metadata: Dict[str, object] = None, schema: pa.Schema = None) -> int:
+        """Write ``df`` with constant ``metadata`` columns, projected onto ``schema``.
+
+        Returns:
+            Number of rows written
+        """
+        metadata = metadata or {}
+        slots = threading.BoundedSemaphore(self.max_workers)
+        futures: List[Future] = []
+
+        def upload(part: int, table: pa.Table):
+            try:
+                self.sink.upload(part, self._serialize(table))
+            finally:
+                slots.release()
+
+        output_schema = schema if schema is not None else results_table(df.iloc[:0], metadata).schema
+        self.sink.begin(output_schema)
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='result-upload') as pool:
+                # An empty frame still writes one chunk, carrying the schema
+                for part, start in enumerate(range(0, max(len(df), 1), self.chunk_rows)):
+                    slots.acquire()
+                    if any(f.done() and f.exception() for f in futures):
+                        slots.release()
+                        break
+                    table = results_table(df.iloc[start:start + self.chunk_rows], metadata, schema)
+                    futures.append(pool.submit(upload, part, table))
+            for future in futures:
+                future.result()
+        except BaseException:
+            self.sink.abort()
+            raise
+
+        self.sink.commit()
+        logger.info(f"Wrote {len(df)} rows in {len(futures)} chunks")
+        return len(df)
+
+    def _serialize(self, table: pa.Table) -> pa.Buffer:
+        buffer = pa.BufferOutputStream()
+        pq.write_table(table, buffer, row_group_size=self.row_group_rows, compression=self.compression)
+        return buffer.getvalue()
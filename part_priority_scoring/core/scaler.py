@@ -0,0 +1,101 @@
+"""Robust scaling from mergeable quantile sketches."""
+
+import copy
+import math
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Mapping, Tuple
+
+from .sketch import QuantileSketch
+
+# A KLL sketch of size k has a rank error of roughly this factor over k
+KLL_ERROR_FACTOR = 1.7
+
+
+class SketchScaler:
+    """Median and IQR scaling statistics, fitted chunk by chunk.
+
+    A replacement for sklearn's ``RobustScaler`` that keeps one KLL
+    quantile sketch per feature instead of every row. Scalers updated on
+    separate chunks or in separate worker processes can be merged.
+    Missing values count as 0, as in ``FeatureEngineer``.
+
+    Without an error bound the sketches never compact, so the statistics
+    equal ``RobustScaler``'s. With ``error`` set, the median and quartiles
+    are within that rank error. For example, with ``error=0.001`` the
+    median lies between the 49.9th and 50.1st percentiles.
+    """
+
+    def __init__(self, error: float = None, k: int = None, seed: int = 0):
+        """Initialize scaler.
+
+        Args:
+            error: Rank error bound for medians and quartiles, which sets
+                the sketch size to ``ceil(1.7 / error)``
+            k: Sketch size, as an alternative to ``error``
+            seed: Seed for the sketches' compaction coin flips
+
+        With neither ``error`` nor ``k`` every value is kept and the
+        statistics are exact.
+        """
+        if error is not None and k is not None:
+            raise ValueError("Pass either error or k to SketchScaler, not both")
+        if error is not None:
+            if not 0 < error < 1:
+                raise ValueError(f"Scaling error bound must be between 0 and 1, got {error}")
+            k = max(8, math.ceil(KLL_ERROR_FACTOR / error))
+
+        self.k = k
+        self.seed = seed
+        self.sketches: Dict[str, QuantileSketch] = {}
+
+    @property
+    def error(self) -> float:
+        """Rank error bound of the statistics; 0 when exact."""
+        return KLL_ERROR_FACTOR / self.k if self.k is not None else 0.0
+
+    def update(self, columns: Mapping[str, Any]) -> 'SketchScaler':
+        """Add a chunk of values.
+
+        Args:
+            columns: Dataframe, or mapping of feature name to values
+
+        Returns:
+            Self
+        """
+        for name in columns:
+            values = columns[name]
+            if isinstance(values, pd.Series):
+                values = values.to_numpy(dtype=np.float64, na_value=np.nan)
+            values = np.asarray(values, dtype=np.float64)
+
+            if name not in self.sketches:
+                self.sketches[name] = QuantileSketch(self.k, self.seed)
+            self.sketches[name].update(np.where(np.isnan(values), 0.0, values))
+        return self
+
+    def merge(self, other: 'SketchScaler') -> 'SketchScaler':
+        """Merge the sketches of a scaler fitted on other rows into this one."""
+        if other.k != self.k:
+            raise ValueError(f"Cannot merge scalers with sketch sizes {self.k} and {other.k}")
+
+        for name, sketch in other.sketches.items():
+            if name in self.sketches:
+                self.sketches[name].merge(sketch)
+            else:
+                self.sketches[name] = copy.deepcopy(sketch)
+        return self
+
+    def stats(self) -> Dict[str, Tuple[float, float]]:
+        """Center (median) and scale (IQR) of each feature.
+
+        A near-zero IQR gives a scale of 1, as in ``RobustScaler``.
+        """
+        stats = {}
+        for name, sketch in self.sketches.items():
+            q25, q75 = sketch.quantiles([0.25, 0.75])
+            scale = q75 - q25
+            if scale < 10 * np.finfo(np.float64).eps:
+                scale = 1.0
+            stats[name] = (sketch.median(), float(scale))
+        return stats
@@ -0,0 +1,83 @@
+"""Local snapshot of the score rows last written, for change-only writes."""
+
+import os
+import uuid
+import logging
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pathlib import Path
+from typing import List, Tuple, Union
+
+from .hashing import row_keys
+
+logger = logging.getLogger(__name__)
+
+
+class ScoreSnapshot:
+    """Hash of the row last written to the output table, per ``pn``.
+
+    ``diff`` hashes the written columns of a new score set and flags the
+    parts that are new or whose row differs from the snapshot. After a
+    successful write, ``update`` records those rows, or ``replace``
+    records the whole set after a full rewrite. The snapshot is one
+    Parquet file of ``pn`` and ``row_hash``, replaced atomically.
+
+    Parts missing from a new score set are neither flagged nor dropped,
+    so a change-only write never deletes rows.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """Initialize snapshot.
+
+        Args:
+            path: Snapshot file, created on the first write
+        """
+        self.path = Path(path)
+
+    def hashes(self) -> pd.Series:
+        """Row hashes indexed by ``pn``, empty before the first write."""
+        if not self.path.exists():
+            return pd.Series([], index=pd.Index([], name='pn'), dtype=np.uint64, name='row_hash')
+        table = pq.read_table(self.path)
+        return pd.Series(table.column('row_hash').to_numpy(), name='row_hash',
+                         index=pd.Index(table.column('pn').to_pandas(), name='pn'))
+
+    def diff(self, df: pd.DataFrame, columns: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows of ``df`` that are new or changed since the snapshot.
+
+        Args:
+            df: Score set with a ``pn`` column
+            columns: Written columns to compare
+
+        Returns:
+            Boolean mask of changed rows and the row hashes of all rows
+        """
+        keys = row_keys(df, [col for col in columns if col != 'pn'])
+        previous = self.hashes()
+        positions = previous.index.get_indexer(df['pn'])
+        known = positions >= 0
+        changed = ~known
+        changed[known] = previous.to_numpy()[positions[known]] != keys[known]
+        logger.info(f"{changed.sum()} of {len(df)} parts new or changed since the last write")
+        return changed, keys
+
+    def update(self, pns, keys: np.ndarray):
+        """Record written rows, keeping the other parts' hashes."""
+        previous = self.hashes()
+        written = pd.Series(keys, index=pd.Index(pns, name='pn'), name='row_hash')
+        kept = previous[~previous.index.isin(written.index)]
+        self._write(pd.concat([kept, written]))
+
+    def replace(self, pns, keys: np.ndarray):
+        """Record a full rewrite of the output table."""
+        self._write(pd.Series(keys, index=pd.Index(pns, name='pn'), name='row_hash'))
+
+    def _write(self, hashes: pd.Series):
+        table = pa.table({'pn': pa.array(hashes.index.to_numpy(dtype=object)),
+                          'row_hash': pa.array(hashes.to_numpy(dtype=np.uint64))})
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        partial = self.path.with_name(f'.{self.path.name}.{uuid.uuid4().hex}')
+        pq.write_table(table, partial)
+        os.replace(partial, self.path)
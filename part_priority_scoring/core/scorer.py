@@ -4,27 +4,194 @@ import pandas as pd
 import numpy as np
 from typing import Dict, Optional
 import logging
-from sklearn.preprocessing import RobustScaler, MinMaxScaler
+
+from .state import ScalingState
+from .boosts import CompiledBoosts
+from .kernel import PERCENTILE_MODES, compute_percentiles, score_histogram
+from .compact import FLOAT_DTYPE, compact_frame
+from .explain import EXPLAIN_DTYPE, ScoreExplanation
+from .features import feature_graph, resolve_features
 
 logger = logging.getLogger(__name__)
 
 class PartScorer:
     """Main part scoring class for prioritizing electronic components."""
     
-    def __init__(self, config: Dict = None):
-        """Initialize scorer with configuration."""
+    def __init__(self, config: Dict = None, state: ScalingState = None):
+        """Initialize scorer with configuration and optional frozen state."""
         from ..config.settings import get_default_config
         
         self.config = config or get_default_config()
         self.weights = self.config.get('weights', {})
         self.feature_config = self.config.get('features', {})
+        self.engine = self.config.get('engine', 'pandas')
+        self.percentile = self.config.get('percentile', 'rank')
+        self.compact = self.config.get('compact', False)
+        self.jit = self.config.get('jit', False)
+        self.inplace = self.config.get('inplace', False)
+        
+        if self.engine not in ('pandas', 'numpy', 'arrow'):
+            raise ValueError(f"Unknown scoring engine: {self.engine}")
+        if self.percentile not in PERCENTILE_MODES:
+            raise ValueError(f"Unknown percentile mode: {self.percentile}")
+        if self.inplace and self.compact:
+            raise ValueError("inplace and compact scoring cannot be combined")
+        
+        # Compile business boosts once; an explicit empty mapping disables them
+        boosts_config = self.config.get('boosts')
+        if boosts_config is None:
+            boosts_config = get_default_config()['boosts']
+        self.boosts = CompiledBoosts.from_config(boosts_config)
+        # Features and columns the weights and boost rules read
+        self.features = list(dict.fromkeys(list(self.weights) + self.boosts.columns))
+        # Raw input columns FeatureEngineer scales for the boost rules, e.g. demand_all_time
+        graph = feature_graph(self.feature_config)
+        plan = resolve_features(self.features, self.feature_config)
+        self.scaled_inputs = [col for col in plan.scaled if col not in graph]
+        # Raw columns the features and boost rules read; compact mode converts only these
+        self.input_columns = plan.columns
         
-        # Initialize scalers
-        self.robust_scaler = RobustScaler()
-        self.final_scaler = MinMaxScaler(feature_range=(0, 100))  # Changed to 0-100
+        self.state = state
     
-    def calculate_scores(self, df: pd.DataFrame, normalize=True) -> pd.DataFrame:
-        """Calculate priority scores for parts dataframe."""
+    def fit(self, df: pd.DataFrame) -> 'PartScorer':
+        """Fit frozen scaling and normalization state on a reference population."""
+        if len(df) == 0:
+            raise ValueError("Cannot fit scorer on an empty dataframe")
+        
+        if self.engine in ('numpy', 'arrow'):
+            from ..core.kernel import fit_state
+            from ..core.arrow import to_arrow
+            
+            # Dataframes are read by the kernel directly rather than converted to Arrow
+            data = to_arrow(df) if self.engine == 'arrow' and not isinstance(df, pd.DataFrame) else df
+            self.state = fit_state(data, self.weights, self.feature_config, self.boosts)
+        else:
+            from ..core.feature_engineer import FeatureEngineer
+            
+            engineer = FeatureEngineer(self.feature_config, compact=self.compact,
+                                       features=self.features).fit(df)
+            features_df = engineer.transform(df)
+            features_df['base_score'] = self._calculate_base_score(features_df)
+            boosted_score = self._apply_boosts(features_df)
+            
+            self.state = engineer.state
+            self.state.score_min = float(boosted_score.min())
+            self.state.score_max = float(boosted_score.max())
+            # Reference distribution for percentile='reference'
+            priority_score = self._normalize_scores(boosted_score, self.state)
+            self.state.score_histogram = score_histogram(priority_score.to_numpy(dtype=float)).tolist()
+        
+        logger.info(f"Fitted scoring state on {len(df)} parts "
+                    f"(score range {self.state.score_min:.4f} - {self.state.score_max:.4f})")
+        return self
+    
+    def score(self, df: pd.DataFrame, normalize=True, top_k: int = None,
+              top_k_by: str = None, rank_all=False, explain=False, explain_top: int = None):
+        """Score parts against the frozen state from ``fit``.
+        
+        Scores do not depend on the other parts in the batch, so small
+        incremental batches are comparable with the reference run. Top-k
+        and explain options are the same as for ``calculate_scores``.
+        """
+        if self.state is None:
+            raise ValueError("Scorer not fitted. Call fit() first.")
+        
+        return self._score(df, normalize, self.state, top_k, top_k_by, rank_all, explain, explain_top)
+    
+    def calculate_scores(self, df: pd.DataFrame, normalize=True, top_k: int = None,
+                         top_k_by: str = None, rank_all=False, explain=False, explain_top: int = None):
+        """Calculate priority scores for parts dataframe.
+        
+        Args:
+            df: Input dataframe
+            normalize: Min-max normalize scores to 0-100
+            top_k: Return only the k highest scoring parts, selected without
+                sorting the full frame
+            top_k_by: Column to group by (e.g. ``'category'``) so that k parts
+                are returned per group
+            rank_all: Rank every row before selecting; by default only the
+                returned rows get a percentile, computed exactly against the
+                full population
+            explain: Also return a ``ScoreExplanation`` with each row's
+                feature contributions, boost multipliers and unavailable flag,
+                collected during the same scoring pass
+            explain_top: Only keep explanations for the first N returned
+                rows, i.e. the N highest scores
+            
+        Returns:
+            Scored dataframe sorted by priority_score, descending, or a
+            ``(scored dataframe, ScoreExplanation)`` tuple when ``explain`` is set
+        """
+        return self._score(df, normalize, None, top_k, top_k_by, rank_all, explain, explain_top)
+    
+    def calculate_strategy_scores(self, df: pd.DataFrame, strategies: Dict[str, Dict[str, float]] = None,
+                                  normalize=True) -> pd.DataFrame:
+        """Score several weight strategies with a single feature pass.
+        
+        Features are engineered once and all base scores come from one
+        matrix multiply, instead of rerunning the pipeline per strategy.
+        Feature scaling uses the fitted state when the scorer has one.
+        
+        Args:
+            df: Input dataframe
+            strategies: Mapping of strategy name to weights; defaults to the
+                base weights as ``'balanced'`` plus the configured
+                ``weight_variants``
+            normalize: Min-max normalize each strategy's scores to 0-100
+            
+        Returns:
+            Wide dataframe with the input index, ``pn`` when present, and a
+            ``<strategy>_score`` column per strategy
+        """
+        from ..core.kernel import strategy_scores
+        
+        if strategies is None:
+            strategies = {'balanced': self.weights, **self.config.get('weight_variants', {})}
+        if not strategies:
+            raise ValueError("No scoring strategies given")
+        
+        if len(df) == 0:
+            scores = {name: np.empty(0) for name in strategies}
+        else:
+            logger.info(f"Scoring {len(df)} parts with {len(strategies)} strategies")
+            scores = strategy_scores(df, strategies, self.feature_config, normalize, self.state, self.boosts)
+        
+        result_df = pd.DataFrame({f'{name}_score': values for name, values in scores.items()}, index=df.index)
+        if 'pn' in df.columns:
+            result_df.insert(0, 'pn', df['pn'])
+        
+        return result_df
+    
+    def _score(self, df: pd.DataFrame, normalize=True, state: ScalingState = None,
+               top_k: int = None, top_k_by: str = None, rank_all=False,
+               explain=False, explain_top: int = None):
+        """Score parts, with explanations of the returned rows when requested."""
+        if self.engine == 'arrow' and not isinstance(df, pd.DataFrame):
+            return self._score_arrow(df, normalize, state, top_k, top_k_by, rank_all, explain, explain_top)
+        if not explain:
+            return self._score_rows(df, normalize, state, top_k, top_k_by, rank_all)
+        if explain_top is not None and explain_top < 1:
+            raise ValueError(f"explain_top must be a positive integer, got {explain_top}")
+        
+        # Score on positional labels so each returned row maps back to its explanation
+        collected = {}
+        result_df = self._score_rows(df.reset_index(drop=True), normalize, state,
+                                     top_k, top_k_by, rank_all, collected)
+        positions = result_df.index.to_numpy()[:explain_top]
+        result_df.index = df.index[result_df.index.to_numpy()]
+        
+        explanation = ScoreExplanation.from_collected(collected, df.index).take(positions)
+        return result_df, explanation
+    
+    def _score_rows(self, df: pd.DataFrame, normalize=True, state: ScalingState = None,
+                    top_k: int = None, top_k_by: str = None, rank_all=False,
+                    explanation: Dict = None) -> pd.DataFrame:
+        """Score parts, fitting scaling on the batch unless state is given."""
+        if top_k is not None and top_k < 1:
+            raise ValueError(f"top_k must be a positive integer, got {top_k}")
+        if top_k_by is not None and top_k_by not in df.columns:
+            raise ValueError(f"Column {top_k_by} not found for top_k_by")
+        
         if len(df) == 0:
             empty_df = df.copy()
             empty_df['priority_score'] = pd.Series(dtype=float)
@@ -34,37 +201,203 @@ class PartScorer:
             
         logger.info(f"Calculating scores for {len(df)} parts")
         
-        result_df = df.copy()
-        result_df = self._engineer_features(result_df)
-        result_df['base_score'] = self._calculate_base_score(result_df)
-        result_df['boosted_score'] = self._apply_boosts(result_df)
+        if self.engine in ('numpy', 'arrow'):
+            return self._calculate_scores_numpy(df, normalize, state, top_k, top_k_by, rank_all, explanation)
+        
+        # Scaled raw inputs are restored after the boosts, so results keep raw values
+        raw_inputs = {col: df[col] for col in self.scaled_inputs if col in df.columns}
+        
+        # FeatureEngineer.transform returns a new frame, or df itself in inplace mode
+        result_df = self._engineer_features(df, state)
+        result_df['base_score'] = self._calculate_base_score(result_df, explanation)
+        result_df['boosted_score'] = self._apply_boosts(result_df, explanation)
+        for col, values in raw_inputs.items():
+            result_df[col] = values
         
         if normalize:
-            result_df['priority_score'] = self._normalize_scores(result_df['boosted_score'])
+            result_df['priority_score'] = self._normalize_scores(result_df['boosted_score'], state)
         else:
             result_df['priority_score'] = result_df['boosted_score']
         
-        result_df['score_percentile'] = result_df['priority_score'].rank(pct=True) * 100
+        if top_k is not None:
+            return self._select_top_k(result_df, top_k, top_k_by, rank_all, normalize)
+        
+        mode = self._percentile_mode(normalize)
+        if mode == 'rank':
+            result_df['score_percentile'] = result_df['priority_score'].rank(pct=True) * 100
+        else:
+            result_df['score_percentile'] = compute_percentiles(
+                result_df['priority_score'].to_numpy(dtype=float), mode, self.state
+            )
         
         logger.info(f"Scoring complete. Mean score: {result_df['priority_score'].mean():.2f}")
         
+        if self.inplace:
+            # Sorting would copy every column, so the caller's frame keeps its row order
+            return result_df
         return result_df.sort_values('priority_score', ascending=False)
     
-    def _engineer_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _calculate_scores_numpy(self, df: pd.DataFrame, normalize=True, state: ScalingState = None,
+                                top_k: int = None, top_k_by: str = None, rank_all=False,
+                                explanation: Dict = None) -> pd.DataFrame:
+        """Score with the fused NumPy kernel, attaching only the result columns."""
+        from ..core.kernel import score_arrays
+        
+        if self.compact:
+            df = compact_frame(df, self.input_columns)
+        
+        percentile = self._percentile_mode(normalize) if top_k is None or rank_all else None
+        scores = score_arrays(df, self.weights, self.feature_config, normalize=normalize, state=state,
+                              percentile=percentile, boosts=self.boosts, reference=self.state,
+                              dtype=FLOAT_DTYPE if self.compact else np.float64, explanation=explanation,
+                              jit=self.jit)
+        
+        if top_k is None and self.inplace:
+            # Attach the score arrays without copying; the frame keeps its row order
+            for col, values in scores.items():
+                df[col] = pd.Series(values, index=df.index, copy=False)
+            logger.info(f"Scoring complete. Mean score: {scores['priority_score'].mean():.2f}")
+            return df
+        
+        if top_k is None:
+            rows, selected = None, scores
+        else:
+            rows = self._top_k_positions(df, scores['priority_score'], top_k, top_k_by)
+            selected = {col: values[rows] for col, values in scores.items()}
+            if not rank_all:
+                selected['score_percentile'] = compute_percentiles(
+                    scores['priority_score'], self._percentile_mode(normalize), self.state, rows
+                )
+        
+        # Sort positions rather than the frame, so input columns are copied by one take
+        order = pd.Series(selected['priority_score']).sort_values(ascending=False).index.to_numpy()
+        result_df = df.take(order if rows is None else rows[order])
+        for col, values in selected.items():
+            result_df[col] = values[order]
+        
+        logger.info(f"Scoring complete. Mean score: {scores['priority_score'].mean():.2f}")
+        
+        return result_df
+    
+    def _score_arrow(self, data, normalize=True, state: ScalingState = None,
+                     top_k: int = None, top_k_by: str = None, rank_all=False,
+                     explain=False, explain_top: int = None):
+        """Score an Arrow table or Polars frame with the NumPy kernel.
+        
+        This is a conversion layer, not an Arrow compute engine: input
+        columns are decoded into NumPy float arrays, scored by the same
+        kernel as the numpy engine, and the score arrays are appended as
+        Arrow columns. Pandas dataframes never reach it; they take the
+        numpy engine path instead of a round trip through Arrow.
+        
+        Returns the same kind of object it was given, with the result
+        columns appended and rows sorted by priority_score, descending.
+        """
+        from ..core.arrow import to_arrow, from_arrow, group_codes, with_columns
+        from ..core.kernel import score_arrays, top_k_indices
+        
+        table = to_arrow(data)
+        if top_k is not None and top_k < 1:
+            raise ValueError(f"top_k must be a positive integer, got {top_k}")
+        if top_k_by is not None and top_k_by not in table.column_names:
+            raise ValueError(f"Column {top_k_by} not found for top_k_by")
+        if explain_top is not None and explain_top < 1:
+            raise ValueError(f"explain_top must be a positive integer, got {explain_top}")
+        
+        collected = {} if explain else None
+        if len(table) == 0:
+            scores = {col: np.empty(0) for col in ('base_score', 'boosted_score',
+                                                   'priority_score', 'score_percentile')}
+            rows = np.empty(0, dtype=np.int64)
+        else:
+            logger.info(f"Calculating scores for {len(table)} parts")
+            percentile = self._percentile_mode(normalize) if top_k is None or rank_all else None
+            scores = score_arrays(table, self.weights, self.feature_config, normalize=normalize, state=state,
+                                  percentile=percentile, boosts=self.boosts, reference=self.state,
+                                  dtype=FLOAT_DTYPE if self.compact else np.float64, explanation=collected,
+                                  jit=self.jit)
+            rows = np.arange(len(table))
+            if top_k is not None:
+                groups = group_codes(table.column(top_k_by)) if top_k_by is not None else None
+                rows = top_k_indices(scores['priority_score'], top_k, groups)
+                if not rank_all:
+                    scores['score_percentile'] = compute_percentiles(
+                        scores['priority_score'], self._percentile_mode(normalize), self.state, rows
+                    )
+                    scores = {col: values if col == 'score_percentile' else values[rows]
+                              for col, values in scores.items()}
+                else:
+                    scores = {col: values[rows] for col, values in scores.items()}
+            
+            order = np.argsort(-scores['priority_score'], kind='stable')
+            rows, scores = rows[order], {col: values[order] for col, values in scores.items()}
+            logger.info(f"Scoring complete. Mean score: {scores['priority_score'].mean():.2f}")
+        
+        result = with_columns(table.take(rows), scores)
+        result = from_arrow(result, data)
+        
+        if not explain:
+            return result
+        positions = rows[:explain_top]
+        explanation = ScoreExplanation.from_collected(collected, pd.RangeIndex(len(table))).take(positions)
+        return result, explanation
+    
+    def _select_top_k(self, result_df: pd.DataFrame, top_k: int, top_k_by: str = None,
+                      rank_all=False, normalize=True) -> pd.DataFrame:
+        """Keep the top-k scored rows, ranking only those unless rank_all is set."""
+        scores = result_df['priority_score'].to_numpy(dtype=float)
+        positions = self._top_k_positions(result_df, scores, top_k, top_k_by)
+        
+        mode = self._percentile_mode(normalize)
+        if rank_all:
+            percentiles = compute_percentiles(scores, mode, self.state)[positions]
+        else:
+            percentiles = compute_percentiles(scores, mode, self.state, positions)
+        
+        top_df = result_df.iloc[positions].assign(score_percentile=percentiles)
+        logger.info(f"Selected top {len(top_df)} of {len(result_df)} parts")
+        
+        return top_df.sort_values('priority_score', ascending=False)
+    
+    def _percentile_mode(self, normalize=True) -> str:
+        """Configured percentile mode, or exact ranks for unnormalized scores.
+        
+        The histogram and reference modes count scores on the 0-100 grid,
+        which raw boosted scores do not lie on.
+        """
+        return self.percentile if normalize else 'rank'
+    
+    def _top_k_positions(self, df: pd.DataFrame, scores: np.ndarray, top_k: int,
+                         top_k_by: str = None) -> np.ndarray:
+        """Positions of the top-k rows, overall or per top_k_by group."""
+        from ..core.kernel import top_k_indices
+        
+        groups = None
+        if top_k_by is not None:
+            groups = pd.factorize(df[top_k_by], use_na_sentinel=False)[0]
+        
+        return top_k_indices(scores, top_k, groups)
+    
+    def _engineer_features(self, df: pd.DataFrame, state: ScalingState = None) -> pd.DataFrame:
         """Create and transform features for scoring."""
         from ..core.feature_engineer import FeatureEngineer
         
-        engineer = FeatureEngineer(self.feature_config)
+        engineer = FeatureEngineer(self.feature_config, state, compact=self.compact, features=self.features,
+                                   inplace=self.inplace)
         return engineer.transform(df)
     
-    def _calculate_base_score(self, df: pd.DataFrame) -> pd.Series:
-        """Calculate weighted base score."""
+    def _calculate_base_score(self, df: pd.DataFrame, explanation: Dict = None) -> pd.Series:
+        """Calculate weighted base score, collecting contributions into ``explanation`` if given."""
         base_score = pd.Series(0.0, index=df.index)
         
         for feature, weight in self.weights.items():
             if feature in df.columns:
                 feature_values = df[feature].fillna(0)
-                base_score += feature_values * weight
+                contribution = feature_values * weight
+                base_score += contribution
+                if explanation is not None:
+                    explanation.setdefault('features', []).append(feature)
+                    explanation.setdefault('contributions', []).append(contribution.to_numpy(EXPLAIN_DTYPE))
                 logger.debug(f"Added {feature} with weight {weight}")
             else:
                 logger.warning(f"Feature {feature} not found in dataframe")
@@ -73,52 +406,31 @@ class PartScorer:
         if all(col in df.columns for col in ['inventory', 'leadtime_weeks']):
             unavailable = (df['inventory'] == 0) & (df['leadtime_weeks'] > 12)
             base_score[unavailable] = 0
+            if explanation is not None:
+                explanation['unavailable'] = unavailable.to_numpy(dtype=bool)
         
         return base_score
     
-    def _apply_boosts(self, df: pd.DataFrame) -> pd.Series:
+    def _apply_boosts(self, df: pd.DataFrame, explanation: Dict = None) -> pd.Series:
         """Apply business rule boosts to base scores."""
-        boosted_score = df['base_score'].copy()
-        
-        boost_conditions = [
-            {
-                'name': 'ample_stock',
-                'condition': lambda df: (df.get('inventory', 0) >= 10 * df.get('moq', 1)),
-                'multiplier': 1.1
-            },
-            {
-                'name': 'immediate_ship',
-                'condition': lambda df: (df.get('leadtime_weeks', 999) == 0),
-                'multiplier': 1.15
-            },
-            {
-                'name': 'authorized_source',
-                'condition': lambda df: (df.get('source_type', '') == 'Authorized'),
-                'multiplier': 1.05
-            },
-            {
-                'name': 'high_demand',
-                'condition': lambda df: (df.get('demand_all_time', 0) > 100),
-                'multiplier': 1.08
-            }
-        ]
-        
-        for boost in boost_conditions:
-            try:
-                mask = boost['condition'](df)
-                if hasattr(mask, 'sum') and mask.sum() > 0:
-                    boosted_score[mask] *= boost['multiplier']
-                    logger.info(f"Applied {boost['name']} boost to {mask.sum()} parts")
-            except Exception as e:
-                logger.warning(f"Could not apply boost {boost['name']}: {e}")
-        
-        return boosted_score
-    
-    def _normalize_scores(self, scores: pd.Series) -> pd.Series:
+        factors = [] if explanation is not None else None
+        multiplier = self.boosts.multiplier(df, len(df), factors)
+        logger.debug(f"Boosted {int((multiplier != 1.0).sum())} parts")
+        
+        if explanation is not None:
+            explanation['rules'] = [rule.name for rule in self.boosts.rules]
+            explanation['boost_multipliers'] = [factor.astype(EXPLAIN_DTYPE) for factor in factors]
+        
+        return df['base_score'] * multiplier
+    
+    def _normalize_scores(self, scores: pd.Series, state: ScalingState = None) -> pd.Series:
         """Normalize scores to 0-100 range ensuring no negative values."""
         if len(scores) == 0:
             return pd.Series(dtype=float)
         
+        if state is not None and state.score_min is not None:
+            return self._normalize_frozen(scores, state)
+        
         if scores.max() == scores.min():
             return pd.Series(50.0, index=scores.index)
         
@@ -135,3 +447,11 @@ class PartScorer:
         normalized = normalized.clip(lower=0).round(2)
         
         return normalized
+    
+    def _normalize_frozen(self, scores: pd.Series, state: ScalingState) -> pd.Series:
+        """Normalize against the reference score range, clipping outliers to 0-100."""
+        if state.score_max == state.score_min:
+            return pd.Series(50.0, index=scores.index)
+        
+        normalized = ((scores - state.score_min) / (state.score_max - state.score_min)) * 100
+        return normalized.clip(0, 100).round(2)
@@ -0,0 +1,123 @@
+"""Mergeable quantile sketch for out-of-core scoring statistics."""
+
+import numpy as np
+from typing import List, Optional, Tuple
+
+
+class QuantileSketch:
+    """KLL quantile sketch over float values.
+
+    Values are kept exactly until the first compaction, so quantiles of
+    small inputs match ``np.percentile``. After that the rank error is
+    roughly ``1.7 / k``. Sketches built on separate chunks or processes can
+    be merged.
+    """
+
+    def __init__(self, k: Optional[int] = 2048, seed: int = 0):
+        """Initialize sketch.
+
+        Args:
+            k: Size of the top compactor; larger is more accurate. None
+                never compacts, keeping every value for exact quantiles
+            seed: Seed for the compaction coin flips
+        """
+        if k is not None and k < 8:
+            raise ValueError("Sketch size k must be at least 8")
+
+        self.k = k
+        self.count = 0
+        self.levels: List[np.ndarray] = [np.empty(0, dtype=np.float64)]
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def is_exact(self) -> bool:
+        """True while no values have been compacted away."""
+        return len(self.levels) == 1
+
+    def update(self, values: np.ndarray) -> 'QuantileSketch':
+        """Add a batch of values; NaNs are ignored."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self.count += len(values)
+        self._compress()
+        return self
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """Merge another sketch into this one."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0, dtype=np.float64))
+
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+
+        self.count += other.count
+        self._compress()
+        return self
+
+    def _capacity(self, level: int) -> int:
+        """Capacity of a level, shrinking geometrically below the top."""
+        depth = len(self.levels) - 1 - level
+        return max(2, int(np.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def _compress(self):
+        """Compact levels that exceed their capacity."""
+        if self.k is None:
+            return
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0, dtype=np.float64))
+
+                items = np.sort(items)
+                # An odd item stays behind so the total weight is preserved
+                keep = items[:1] if len(items) % 2 else items[:0]
+                paired = items[len(keep):]
+                promoted = paired[self._rng.integers(2)::2]
+
+                self.levels[level] = keep
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                # Capacities shift when a level is added, so start over
+                level = 0
+                continue
+            level += 1
+
+    def weighted_items(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Sorted retained items and their weights."""
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** level)
+                                  for level, items in enumerate(self.levels)])
+        order = np.argsort(values, kind='mergesort')
+        return values[order], weights[order]
+
+    def quantiles(self, q) -> np.ndarray:
+        """Estimate quantiles for fractions ``q`` in [0, 1].
+
+        Uses the same linear interpolation as ``np.percentile``; exact while
+        the sketch has not compacted.
+        """
+        q = np.asarray(q, dtype=np.float64)
+        if self.count == 0:
+            return np.full(q.shape, np.nan)
+        if self.is_exact:
+            return np.percentile(self.levels[0], q * 100)
+
+        values, weights = self.weighted_items()
+        # Position of each item in the full sorted input, as np.percentile indexes it
+        positions = np.cumsum(weights) - (weights + 1) / 2.0
+        return np.interp(q * (weights.sum() - 1), positions, values)
+
+    def quantile(self, q: float) -> float:
+        """Estimate a single quantile."""
+        return float(self.quantiles(q))
+
+    def median(self) -> float:
+        """Estimate the median; equal to ``np.median`` while exact."""
+        if self.count and self.is_exact:
+            return float(np.median(self.levels[0]))
+        return self.quantile(0.5)
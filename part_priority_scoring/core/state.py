@@ -0,0 +1,37 @@
+"""Frozen scaling and normalization state for fit-once scoring."""
+
+import json
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional, Any
+
+
+@dataclass
+class ScalingState:
+    """Robust scaler statistics and score range fitted on a reference population."""
+    centers: Dict[str, float] = field(default_factory=dict)
+    scales: Dict[str, float] = field(default_factory=dict)
+    score_min: Optional[float] = None
+    score_max: Optional[float] = None
+    n_rows: int = 0
+    # Counts of reference priority scores on the 0.01 grid, for reference percentiles
+    score_histogram: Optional[List[int]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert state to a JSON-serializable dictionary."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ScalingState':
+        """Create state from a dictionary produced by ``to_dict``."""
+        return cls(**data)
+
+    def save(self, path: str):
+        """Write state to a JSON file."""
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> 'ScalingState':
+        """Read state from a JSON file."""
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
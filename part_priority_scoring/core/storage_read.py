@@ -0,0 +1,145 @@
+"""Stream BigQuery tables as Arrow record batches over the Storage Read API."""
+
+import queue
+import logging
+import threading
+import pandas as pd
+import pyarrow as pa
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of one read stream in the batch queue
+_DONE = object()
+
+
+def table_path(table) -> str:
+    """Storage API path of a ``TableReference``, e.g. a query job's destination."""
+    return f"projects/{table.project}/datasets/{table.dataset_id}/tables/{table.table_id}"
+
+
+def read_table_batches(read_client, table, max_streams: int = 4, columns: List[str] = None,
+                       prefetch: int = 8) -> Iterator[pa.RecordBatch]:
+    """Yield a table's rows as Arrow record batches from parallel read streams.
+
+    One read session is opened per call. Each of its streams is read on its
+    own thread into a queue of at most ``prefetch`` batches, so downloading
+    continues while the caller processes earlier batches and memory stays
+    bounded. Batches arrive in the order the streams deliver them, not in
+    table order. Closing the iterator early stops the reader threads.
+
+    Args:
+        read_client: ``BigQueryReadClient`` or a stand-in with the same
+            ``create_read_session`` and ``read_rows`` methods
+        table: ``TableReference`` of the table to read
+        max_streams: Upper bound on the number of parallel read streams
+        columns: Columns to read, all when None
+        prefetch: Batches buffered ahead of the caller
+
+    Returns:
+        Iterator over record batches
+    """
+    if max_streams < 1:
+        raise ValueError(f"max_streams must be a positive integer, got {max_streams}")
+
+    read_options = {'selected_fields': list(columns)} if columns else {}
+    session = read_client.create_read_session(
+        parent=f"projects/{table.project}",
+        read_session={'table': table_path(table), 'data_format': 'ARROW', 'read_options': read_options},
+        max_stream_count=max_streams
+    )
+    streams = list(session.streams)
+    if not streams:
+        # An empty table is served without any streams
+        return
+
+    schema = pa.ipc.read_schema(pa.py_buffer(session.arrow_schema.serialized_schema))
+    logger.info(f"Reading {session.table} over {len(streams)} streams")
+
+    batches = queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                batches.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def read(stream):
+        try:
+            for response in read_client.read_rows(stream.name):
+                serialized = pa.py_buffer(response.arrow_record_batch.serialized_record_batch)
+                if not put(pa.ipc.read_record_batch(serialized, schema)):
+                    return
+        except Exception as error:
+            put(error)
+            return
+        put(_DONE)
+
+    pool = ThreadPoolExecutor(max_workers=len(streams), thread_name_prefix='bq-read')
+    try:
+        for stream in streams:
+            pool.submit(read, stream)
+
+        remaining = len(streams)
+        while remaining:
+            item = batches.get()
+            if item is _DONE:
+                remaining -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield item
+    finally:
+        stop.set()
+        pool.shutdown(wait=True)
+
+
+class QueryResultStream:
+    """Re-iterable stream of a query result table as dataframe chunks.
+
+    Every iteration opens a new read session over the same table, so it can
+    be handed to ``ChunkedScorer.fit`` and ``score_iter`` (or
+    ``score_parts_iter``) like a list of chunks. BigQuery keeps anonymous
+    query result tables for about a day.
+    """
+
+    def __init__(self, read_client, table, max_streams: int = 4, columns: List[str] = None,
+                 prefetch: int = 8):
+        """Initialize stream.
+
+        Args:
+            read_client: ``BigQueryReadClient`` or a stand-in
+            table: ``TableReference`` of the result table
+            max_streams: Upper bound on the number of parallel read streams
+            columns: Columns to read, all when None
+            prefetch: Batches buffered ahead of the consumer
+        """
+        self.read_client = read_client
+        self.table = table
+        self.max_streams = max_streams
+        self.columns = columns
+        self.prefetch = prefetch
+
+    def batches(self) -> Iterator[pa.RecordBatch]:
+        """Yield the table as Arrow record batches from a new read session."""
+        return read_table_batches(self.read_client, self.table, self.max_streams,
+                                  self.columns, self.prefetch)
+
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        for batch in self.batches():
+            yield batch.to_pandas()
+
+
+def default_read_client(credentials: Optional[Any] = None):
+    """A ``BigQueryReadClient``, if google-cloud-bigquery-storage is installed."""
+    try:
+        from google.cloud.bigquery_storage import BigQueryReadClient
+    except ImportError as error:
+        raise ImportError("Streaming reads need google-cloud-bigquery-storage; install "
+                          "part-priority-scoring[storage]") from error
+    return BigQueryReadClient(credentials=credentials)
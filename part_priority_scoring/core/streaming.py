@@ -0,0 +1,182 @@
+"""Out-of-core chunked scoring with global normalization."""
+
+import pandas as pd
+import numpy as np
+import logging
+from typing import Dict, Iterable, Iterator, Callable, Union
+
+from .state import ScalingState
+from .sketch import QuantileSketch
+from .scaler import SketchScaler
+from .boosts import CompiledBoosts
+from . import kernel
+
+logger = logging.getLogger(__name__)
+
+ChunkSource = Union[Callable[[], Iterable[pd.DataFrame]], Iterable[pd.DataFrame]]
+
+
+class ChunkedScorer:
+    """Score a table that does not fit in memory, one chunk at a time.
+
+    Peak memory is bounded by the chunk size plus the quantile sketches.
+    The chunk source is read three times:
+
+    1. Accumulate quantile sketches of every robust-scaled feature, giving
+       global medians and IQRs.
+    2. With that scaling, compute boosted scores to get the global score
+       range and a sketch of the score distribution.
+    3. Emit scored chunks with globally consistent ``priority_score`` and
+       ``score_percentile``.
+
+    Results equal ``PartScorer(engine='numpy').calculate_scores`` on the
+    concatenated table as long as the sketches have not compacted (fewer
+    than ``sketch_k`` rows); beyond that medians, IQRs and percentiles are
+    approximate within the sketch's rank error.
+    """
+
+    def __init__(self, config: Dict = None, sketch_k: int = 2048):
+        """Initialize chunked scorer.
+
+        Args:
+            config: Scoring configuration, defaults to ``get_default_config()``
+            sketch_k: Quantile sketch size, trading memory for accuracy
+        """
+        from ..config.settings import get_default_config
+
+        self.config = config or get_default_config()
+        self.weights = self.config.get('weights', {})
+        self.feature_config = self.config.get('features', {})
+        boosts_config = self.config.get('boosts')
+        if boosts_config is None:
+            boosts_config = get_default_config()['boosts']
+        self.boosts = CompiledBoosts.from_config(boosts_config)
+        self.sketch_k = sketch_k
+
+        self.state = None
+        self.score_sketch = None
+        self._reference = None
+
+    def fit(self, chunks: ChunkSource) -> 'ChunkedScorer':
+        """Accumulate global scaling, score range and score distribution.
+
+        Args:
+            chunks: Callable returning a fresh iterable of dataframes, or a
+                re-iterable collection such as a list
+
+        Returns:
+            Self, with ``state`` and ``score_sketch`` populated
+        """
+        scaler = SketchScaler(k=self.sketch_k)
+        n_rows = 0
+
+        for chunk in _iterate(chunks):
+            n_rows += len(chunk)
+            scaler.update(kernel.scaling_inputs(chunk, self.weights, self.feature_config, self.boosts))
+
+        if n_rows == 0:
+            raise ValueError("Cannot fit scorer on an empty chunk source")
+
+        state = ScalingState(n_rows=n_rows)
+        for name, (center, scale) in scaler.stats().items():
+            state.centers[name] = center
+            state.scales[name] = scale
+
+        logger.info(f"Pass 1 complete: scaling fitted for {len(scaler.sketches)} features on {n_rows} rows")
+
+        score_sketch = QuantileSketch(self.sketch_k)
+        score_min, score_max = np.inf, -np.inf
+
+        for chunk in _iterate(chunks):
+            if len(chunk) == 0:
+                continue
+            _, boosted_score, _ = kernel.boosted_scores(
+                chunk, self.weights, self.feature_config, state, self.boosts
+            )
+            score_min = min(score_min, np.nanmin(boosted_score))
+            score_max = max(score_max, np.nanmax(boosted_score))
+            score_sketch.update(boosted_score)
+
+        state.score_min = float(score_min)
+        state.score_max = float(score_max)
+        logger.info(f"Pass 2 complete: score range {score_min:.4f} - {score_max:.4f}")
+
+        self.state = state
+        self.score_sketch = score_sketch
+        self._reference = None
+        return self
+
+    def score_iter(self, chunks: ChunkSource) -> Iterator[pd.DataFrame]:
+        """Yield scored chunks using the global state from ``fit``.
+
+        Each chunk keeps its input columns and row order and gains
+        ``base_score``, ``boosted_score``, ``priority_score`` and
+        ``score_percentile``.
+        """
+        if self.state is None:
+            raise ValueError("Scorer not fitted. Call fit() first.")
+
+        reference, reference_weights = self._reference_distribution()
+
+        for chunk in _iterate(chunks):
+            if len(chunk) == 0:
+                continue
+
+            base_score, boosted_score, _ = kernel.boosted_scores(
+                chunk, self.weights, self.feature_config, self.state, self.boosts
+            )
+            priority_score = kernel.normalize_scores(
+                boosted_score, self.state.score_min, self.state.score_max
+            )
+
+            yield chunk.assign(
+                base_score=base_score,
+                boosted_score=boosted_score,
+                priority_score=priority_score,
+                score_percentile=kernel.reference_percentiles(priority_score, reference, reference_weights)
+            )
+
+    def _reference_distribution(self):
+        """Sketched score distribution mapped onto the 0-100 priority scale."""
+        if self._reference is None:
+            boosted, weights = self.score_sketch.weighted_items()
+            priority = kernel.normalize_scores(boosted, self.state.score_min, self.state.score_max)
+            # Normalization is monotonic, so the items stay sorted
+            self._reference = (priority, weights)
+        return self._reference
+
+
+def _iterate(chunks: ChunkSource) -> Iterable[pd.DataFrame]:
+    """Start a fresh pass over the chunk source."""
+    if callable(chunks):
+        return chunks()
+    if iter(chunks) is chunks:
+        raise ValueError("Chunk source is a one-shot iterator; pass a callable "
+                         "that returns a new iterator for each pass")
+    return chunks
+
+
+def score_parts_iter(chunks: ChunkSource, weights_config: Dict = None,
+                     feature_config: Dict = None, sketch_k: int = 2048) -> Iterator[pd.DataFrame]:
+    """Score a chunked table with globally consistent scores and percentiles.
+
+    Args:
+        chunks: Callable returning a fresh iterable of dataframes, or a
+            re-iterable collection such as a list
+        weights_config: Optional custom weights dictionary
+        feature_config: Optional feature engineering configuration
+        sketch_k: Quantile sketch size
+
+    Returns:
+        Iterator over scored chunks
+    """
+    from ..config.settings import get_default_config
+
+    config = get_default_config()
+    if weights_config:
+        config['weights'].update(weights_config)
+    if feature_config:
+        config['features'].update(feature_config)
+
+    scorer = ChunkedScorer(config, sketch_k=sketch_k).fit(chunks)
+    return scorer.score_iter(chunks)
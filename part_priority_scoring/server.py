@@ -0,0 +1,381 @@
+"""Local asyncio scoring server with request micro-batching.
+
+Run as a sidecar against a state saved with ``ScalingState.save``::
+
+    python -m part_priority_scoring.server --state scoring_state.json --port 8080
+    python -m part_priority_scoring.server --state scoring_state.json --unix /tmp/scoring.sock
+
+Endpoints:
+
+- ``POST /score``: body ``{"records": [{...}, ...]}`` or a single record;
+  returns ``{"scores": [...]}`` in request order
+- ``GET /metrics``: request latency and batch size percentiles
+- ``GET /health``
+"""
+
+import copy
+import json
+import time
+import asyncio
+import logging
+import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .core.scorer import PartScorer
+from .core.state import ScalingState
+
+logger = logging.getLogger(__name__)
+
+RESULT_COLUMNS = ['base_score', 'boosted_score', 'priority_score', 'score_percentile']
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 431: 'Request Header Fields Too Large',
+           500: 'Internal Server Error'}
+
+
+class ServerMetrics:
+    """Rolling request latency and batch size statistics."""
+
+    def __init__(self, window: int = 10000):
+        """Initialize metrics.
+
+        Args:
+            window: Number of most recent requests and batches kept
+        """
+        self.latencies = deque(maxlen=window)
+        self.batch_sizes = deque(maxlen=window)
+        self.requests = 0
+        self.parts = 0
+        self.batches = 0
+
+    def record_request(self, latency: float, n_parts: int):
+        self.latencies.append(latency)
+        self.requests += 1
+        self.parts += n_parts
+
+    def record_batch(self, n_parts: int):
+        self.batch_sizes.append(n_parts)
+        self.batches += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """Counters plus p50/p99 of latency (ms) and batch size (parts)."""
+        return {
+            'requests': self.requests,
+            'parts': self.parts,
+            'batches': self.batches,
+            'latency_ms': _percentiles(np.asarray(self.latencies) * 1000),
+            'batch_size': _percentiles(np.asarray(self.batch_sizes)),
+        }
+
+
+class MicroBatcher:
+    """Coalesce concurrent scoring requests into batches.
+
+    A batch is scored once it holds ``max_batch_size`` parts or
+    ``max_wait`` seconds after its first request arrived, whichever comes
+    first. Scoring runs on a worker thread so the event loop keeps accepting
+    requests.
+    """
+
+    def __init__(self, scorer: PartScorer, max_batch_size: int = 256, max_wait: float = 0.002,
+                 metrics: ServerMetrics = None):
+        """Initialize batcher.
+
+        Args:
+            scorer: Scorer with frozen state
+            max_batch_size: Most parts scored in one batch
+            max_wait: Longest time a request waits for others to join its batch
+            metrics: Metrics to record batch sizes in
+        """
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be a positive integer, got {max_batch_size}")
+        if max_wait < 0:
+            raise ValueError(f"max_wait must not be negative, got {max_wait}")
+
+        self.scorer = scorer
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.metrics = metrics or ServerMetrics()
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def start(self):
+        """Start the batching loop on the running event loop."""
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop the batching loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._executor.shutdown(wait=False)
+
+    async def score(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Score records as part of the next batch."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((records, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        pending = None
+        while True:
+            batch = [pending] if pending else [await self._queue.get()]
+            pending = None
+            size = len(batch[0][0])
+            deadline = loop.time() + self.max_wait
+
+            while size < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if size + len(item[0]) > self.max_batch_size:
+                    # Keep whole requests together; this one opens the next batch
+                    pending = item
+                    break
+                batch.append(item)
+                size += len(item[0])
+
+            records = [record for request, _ in batch for record in request]
+            try:
+                scores = await loop.run_in_executor(self._executor, self._score_batch, records)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.metrics.record_batch(len(records))
+            start = 0
+            for request, future in batch:
+                if not future.done():
+                    future.set_result(scores[start:start + len(request)])
+                start += len(request)
+
+    def _score_batch(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Score a batch with the frozen state, in record order."""
+        if not records:
+            return []
+        df = pd.DataFrame.from_records(records)
+        scored = self.scorer.score(df).sort_index()
+
+        columns = (['pn'] if 'pn' in scored.columns else []) + \
+            [col for col in RESULT_COLUMNS if col in scored.columns]
+        return scored[columns].astype(object).where(scored[columns].notna(), None).to_dict('records')
+
+
+class ScoringServer:
+    """HTTP/1.1 scoring server on a TCP port or a Unix socket."""
+
+    def __init__(self, scorer: PartScorer, max_batch_size: int = 256, max_wait: float = 0.002,
+                 max_body_size: int = 16 * 1024 * 1024):
+        """Initialize server.
+
+        Args:
+            scorer: Scorer fitted with ``fit`` or created with a loaded state
+                that has a reference histogram. Percentiles are taken against
+                it, since ranking within a micro-batch is meaningless.
+            max_batch_size: Most parts scored in one batch
+            max_wait: Longest time in seconds a request waits for a batch
+            max_body_size: Largest accepted request body in bytes
+        """
+        if scorer.state is None:
+            raise ValueError("Scorer not fitted. Call fit() first.")
+        if scorer.state.score_histogram is None:
+            raise ValueError("State has no score_histogram. Refit the scorer to serve reference percentiles.")
+        # A shallow copy shares the fitted state without changing the caller's scorer
+        scorer = copy.copy(scorer)
+        scorer.percentile = 'reference'
+
+        self.metrics = ServerMetrics()
+        self.batcher = MicroBatcher(scorer, max_batch_size, max_wait, self.metrics)
+        self.max_body_size = max_body_size
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8080,
+                    unix_socket: str = None) -> asyncio.AbstractServer:
+        """Start listening; on ``unix_socket`` when given, else on ``host:port``."""
+        self.batcher.start()
+        if unix_socket:
+            self._server = await asyncio.start_unix_server(self._handle, path=unix_socket)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port)
+        logger.info(f"Scoring server listening on {unix_socket or f'{host}:{self.port}'}")
+        return self._server
+
+    @property
+    def port(self) -> Optional[int]:
+        """Bound TCP port, useful when started on port 0."""
+        if self._server is None or not self._server.sockets:
+            return None
+        address = self._server.sockets[0].getsockname()
+        return address[1] if isinstance(address, tuple) else None
+
+    async def stop(self):
+        """Stop accepting connections and the batching loop."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.batcher.stop()
+
+    async def serve_forever(self, host: str = '127.0.0.1', port: int = 8080, unix_socket: str = None):
+        server = await self.start(host, port, unix_socket)
+        try:
+            await server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests on one connection until the client closes it."""
+        try:
+            while True:
+                request = await _read_request(reader, self.max_body_size)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                status, payload = await self._dispatch(method, path, body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                _write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except _BadRequest as e:
+            _write_response(writer, e.status, {'error': str(e)}, keep_alive=False)
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method: str, path: str, body: bytes):
+        if path == '/score':
+            if method != 'POST':
+                return 405, {'error': 'Use POST'}
+            return await self._score(body)
+        if path == '/metrics' and method == 'GET':
+            return 200, self.metrics.summary()
+        if path == '/health' and method == 'GET':
+            return 200, {'status': 'ok'}
+        return 404, {'error': f'No route for {method} {path}'}
+
+    async def _score(self, body: bytes):
+        start = time.perf_counter()
+        try:
+            payload = json.loads(body or b'null')
+        except ValueError:
+            return 400, {'error': 'Body is not valid JSON'}
+
+        records = payload.get('records', [payload]) if isinstance(payload, dict) else payload
+        if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+            return 400, {'error': 'Expected a record or {"records": [...]}'}
+
+        try:
+            scores = await self.batcher.score(records)
+        except Exception as e:
+            logger.error(f"Scoring failed: {e}")
+            return 500, {'error': str(e)}
+
+        self.metrics.record_request(time.perf_counter() - start, len(records))
+        return 200, {'scores': scores}
+
+
+class _BadRequest(Exception):
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+async def _read_request(reader: asyncio.StreamReader, max_body_size: int):
+    """Parse one HTTP/1.1 request; None when the connection closed cleanly."""
+    request_line = await _read_line(reader, 'Request line too long', 400)
+    if not request_line:
+        return None
+    try:
+        method, path, _ = request_line.decode('latin-1').split(' ', 2)
+    except ValueError:
+        raise _BadRequest('Malformed request line')
+
+    headers = {}
+    while True:
+        line = await _read_line(reader, 'Header line too long', 431)
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get('content-length', 0) or 0)
+    except ValueError:
+        raise _BadRequest('Malformed Content-Length header')
+    if length < 0:
+        raise _BadRequest('Malformed Content-Length header')
+    if length > max_body_size:
+        raise _BadRequest('Request body too large', 413)
+    body = await reader.readexactly(length) if length else b''
+    return method, path.split('?', 1)[0], headers, body
+
+
+async def _read_line(reader: asyncio.StreamReader, message: str, status: int) -> bytes:
+    """Read one line, rejecting lines longer than the reader's buffer limit."""
+    try:
+        return await reader.readline()
+    except (asyncio.LimitOverrunError, ValueError):
+        raise _BadRequest(message, status)
+
+
+def _write_response(writer: asyncio.StreamWriter, status: int, payload: Any, keep_alive: bool):
+    body = json.dumps(payload).encode()
+    head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    writer.write(head.encode('latin-1') + body)
+
+
+def _percentiles(values: np.ndarray) -> Dict[str, Optional[float]]:
+    if len(values) == 0:
+        return {'p50': None, 'p99': None, 'max': None}
+    p50, p99 = np.percentile(values, [50, 99])
+    return {'p50': float(p50), 'p99': float(p99), 'max': float(values.max())}
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    from .config.settings import get_default_config
+
+    parser = argparse.ArgumentParser(description="Serve part priority scores over HTTP")
+    parser.add_argument('--state', required=True, help="Scaling state JSON from ScalingState.save")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--unix', help="Listen on this Unix socket path instead of TCP")
+    parser.add_argument('--engine', default='numpy', choices=['pandas', 'numpy'])
+    parser.add_argument('--max-batch-size', type=int, default=256)
+    parser.add_argument('--max-wait-ms', type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    config = get_default_config()
+    config['engine'] = args.engine
+    scorer = PartScorer(config, state=ScalingState.load(args.state))
+
+    server = ScoringServer(scorer, args.max_batch_size, args.max_wait_ms / 1000)
+    asyncio.run(server.serve_forever(args.host, args.port, args.unix))
+
+
+if __name__ == '__main__':
+    main()
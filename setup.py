@@ -32,9 +32,9 @@ setup(
     install_requires=[
         "pandas>=2.0.0",
         "numpy>=1.24.0",
-        "scikit-learn>=1.3.0",
         "google-cloud-bigquery>=3.11.0",
         "pyyaml>=6.0",
+        "pyarrow>=12.0.0",
     ],
     extras_require={
         "dev": [
@@ -44,6 +44,12 @@ setup(
             "isort>=5.12.0",
             "flake8>=6.0.0",
         ],
+        "jit": [
+            "numba>=0.57.0",
+        ],
+        "storage": [
+            "google-cloud-bigquery-storage>=2.0.0",
+        ],
     },
     include_package_data=True,
     package_data={
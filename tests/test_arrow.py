@@ -0,0 +1,198 @@
+"""Parity tests for the Arrow scoring engine."""
+
+import pytest
+import pandas as pd
+import numpy as np
+import pyarrow as pa
+from part_priority_scoring import PartScorer, DataLoader
+from part_priority_scoring.config.settings import get_default_config
+
+SCORE_COLUMNS = ['base_score', 'boosted_score', 'priority_score', 'score_percentile']
+
+
+def _parts(n, seed=11):
+    rng = np.random.default_rng(seed)
+    inventory = rng.integers(0, 2000, n).astype(float)
+    inventory[rng.random(n) < 0.05] = np.nan
+    return pd.DataFrame({
+        'pn': [f'PART{i:05d}' for i in range(n)],
+        'category': rng.choice(['ic', 'passive', 'connector', None], n),
+        'inventory': inventory,
+        'leadtime_weeks': rng.integers(0, 20, n),
+        'moq': rng.integers(1, 200, n),
+        'demand_all_time': rng.integers(0, 1500, n),
+        'source_type': rng.choice(['Authorized', 'Other', None], n),
+        'datasheet': rng.choice(['url', None], n)
+    })
+
+
+def _config(engine='arrow', percentile='rank'):
+    config = get_default_config()
+    config['engine'] = engine
+    config['percentile'] = percentile
+    return config
+
+
+def _by_pn(scored):
+    """Score columns of a pandas or Arrow result, in pn order."""
+    if isinstance(scored, pa.Table):
+        scored = scored.to_pandas()
+    return scored.set_index('pn').sort_index()
+
+
+def _assert_same_scores(actual, expected):
+    actual, expected = _by_pn(actual), _by_pn(expected)
+    assert list(actual.index) == list(expected.index)
+    for col in SCORE_COLUMNS:
+        np.testing.assert_array_equal(actual[col].to_numpy(), expected[col].to_numpy())
+
+
+class TestArrowEngine:
+
+    @pytest.mark.parametrize('engine', ['pandas', 'numpy'])
+    def test_matches_other_engines(self, engine):
+        """Test that Arrow tables score bit-identically to the pandas and numpy engines."""
+        df = _parts(1000)
+        expected = PartScorer(_config(engine)).calculate_scores(df)
+
+        actual = PartScorer(_config()).calculate_scores(pa.Table.from_pandas(df))
+
+        assert isinstance(actual, pa.Table)
+        _assert_same_scores(actual, expected)
+
+    def test_sorted_with_input_columns(self):
+        """Test that the result keeps the input columns and is sorted by priority."""
+        table = pa.Table.from_pandas(_parts(200))
+
+        actual = PartScorer(_config()).calculate_scores(table)
+
+        assert actual.column_names == table.column_names + SCORE_COLUMNS
+        priority = actual.column('priority_score').to_numpy()
+        assert np.all(np.diff(priority) <= 0)
+
+    def test_without_normalization(self):
+        """Test that unnormalized scores match the pandas engine."""
+        df = _parts(300)
+        expected = PartScorer(_config('pandas')).calculate_scores(df, normalize=False)
+
+        actual = PartScorer(_config()).calculate_scores(pa.Table.from_pandas(df), normalize=False)
+
+        _assert_same_scores(actual, expected)
+
+    @pytest.mark.parametrize('percentile', ['rank', 'reference'])
+    def test_fit_and_score_match_pandas(self, percentile):
+        """Test that state fitted on a table equals the numpy fit and scores like pandas."""
+        reference, batch = _parts(800), _parts(60, seed=3)
+        numpy_scorer = PartScorer(_config('numpy', percentile)).fit(reference)
+        pandas_scorer = PartScorer(_config('pandas', percentile)).fit(reference)
+
+        arrow_scorer = PartScorer(_config('arrow', percentile)).fit(pa.Table.from_pandas(reference))
+
+        assert arrow_scorer.state == numpy_scorer.state
+        _assert_same_scores(arrow_scorer.score(pa.Table.from_pandas(batch)), pandas_scorer.score(batch))
+
+    def test_typed_arrow_columns(self):
+        """Test nulls, dictionary strings, chunking and numeric strings in native Arrow columns."""
+        df = _parts(400)
+        table = pa.Table.from_pandas(df)
+        table = table.set_column(table.column_names.index('source_type'), 'source_type',
+                                 table.column('source_type').dictionary_encode())
+        table = table.set_column(table.column_names.index('moq'), 'moq',
+                                 pa.array(df['moq'].astype(str).where(df.index % 7 != 0, 'n/a')))
+        table = pa.concat_tables([table.slice(0, 150), table.slice(150)])
+        expected_df = df.assign(moq=pd.to_numeric(df['moq'].where(df.index % 7 != 0), errors='coerce'))
+        expected = PartScorer(_config('pandas')).calculate_scores(expected_df)
+
+        actual = PartScorer(_config()).calculate_scores(table)
+
+        _assert_same_scores(actual, expected)
+
+    @pytest.mark.parametrize('top_k_by', [None, 'category'])
+    def test_top_k_matches_numpy(self, top_k_by):
+        """Test that top-k selection and percentiles match the numpy engine."""
+        df = _parts(500)
+        expected = PartScorer(_config('numpy')).calculate_scores(df, top_k=5, top_k_by=top_k_by)
+
+        actual = PartScorer(_config()).calculate_scores(pa.Table.from_pandas(df), top_k=5, top_k_by=top_k_by)
+
+        _assert_same_scores(actual, expected)
+
+    def test_explain_matches_numpy(self):
+        """Test that explanations line up with the returned rows."""
+        df = _parts(200)
+        _, expected = PartScorer(_config('numpy')).calculate_scores(df, explain=True)
+
+        actual, explanation = PartScorer(_config()).calculate_scores(pa.Table.from_pandas(df),
+                                                                     explain=True, explain_top=10)
+
+        positions = explanation.index.to_numpy()
+        assert list(actual.column('pn').to_pylist()[:10]) == list(df['pn'].iloc[positions])
+        np.testing.assert_array_equal(explanation.contributions,
+                                      expected.to_frame().loc[positions, expected.features].to_numpy())
+
+    def test_pandas_input_keeps_index(self):
+        """Test that a pandas dataframe is scored without an Arrow round trip, keeping its index and dtypes."""
+        df = _parts(100).set_index(np.arange(100) * 3)
+        expected = PartScorer(_config('numpy')).calculate_scores(df)
+
+        actual = PartScorer(_config()).calculate_scores(df)
+
+        assert isinstance(actual, pd.DataFrame)
+        pd.testing.assert_frame_equal(actual, expected)
+
+    def test_record_batch_input(self):
+        """Test that a record batch is scored like the table it belongs to."""
+        table = pa.Table.from_pandas(_parts(100))
+        expected = PartScorer(_config()).calculate_scores(table)
+
+        actual = PartScorer(_config()).calculate_scores(table.combine_chunks().to_batches()[0])
+
+        _assert_same_scores(actual, expected)
+
+    def test_empty_table(self):
+        """Test that an empty table gets empty score columns."""
+        table = pa.Table.from_pandas(_parts(10)).slice(0, 0)
+
+        actual = PartScorer(_config()).calculate_scores(table)
+
+        assert len(actual) == 0
+        assert set(SCORE_COLUMNS) <= set(actual.column_names)
+
+    def test_unsupported_input(self):
+        """Test that unknown input types are rejected."""
+        with pytest.raises(ValueError, match="arrow engine"):
+            PartScorer(_config()).calculate_scores([{'pn': 'A'}])
+
+
+class TestPolarsInput:
+
+    def test_lazy_frame_matches_pandas(self):
+        """Test that a Polars LazyFrame scores like the pandas engine and returns a Polars frame."""
+        pl = pytest.importorskip('polars')
+        df = _parts(300)
+        expected = PartScorer(_config('pandas')).calculate_scores(df)
+
+        actual = PartScorer(_config()).calculate_scores(pl.from_pandas(df).lazy())
+
+        assert isinstance(actual, pl.DataFrame)
+        _assert_same_scores(actual.to_arrow(), expected)
+
+
+class TestArrowLoading:
+
+    def test_load_sample_data_as_arrow(self):
+        """Test that the loader hands back BigQuery's Arrow result untouched."""
+        table = pa.Table.from_pandas(_parts(5))
+
+        class FakeJob:
+            def to_arrow(self):
+                return table
+
+        class FakeClient:
+            def query(self, query):
+                return FakeJob()
+
+        loader = DataLoader()
+        loader.client = FakeClient()
+
+        assert loader.load_sample_data(limit=5, as_arrow=True) is table
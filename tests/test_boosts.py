@@ -0,0 +1,82 @@
+"""Tests for declarative business boost rules."""
+
+import pytest
+import pandas as pd
+import numpy as np
+from part_priority_scoring import PartScorer
+from part_priority_scoring.config.settings import get_default_config
+from part_priority_scoring.core.boosts import BoostRule, CompiledBoosts
+
+
+class TestBoostRules:
+    
+    @pytest.fixture
+    def parts(self):
+        """Parts covering each boost condition."""
+        return pd.DataFrame({
+            'pn': ['PART001', 'PART002', 'PART003', 'PART004'],
+            'inventory': [100, 0, 50, 5],
+            'moq': [1, 10, None, 1],
+            'leadtime_weeks': [0, 8, 2, None],
+            'source_type': ['Authorized', 'Other', None, 'Authorized'],
+            'demand_all_time': [500, 20, 200, 0]
+        })
+    
+    def test_parse_conditions(self):
+        """Test the condition string forms."""
+        relative = BoostRule.from_config('ample', {'condition': 'inventory >= 10 * moq', 'multiplier': 1.1})
+        string = BoostRule.from_config('auth', {'condition': "source_type == 'Authorized'"})
+        constant = BoostRule.from_config('fast', {'condition': 'leadtime_weeks<=1.5'})
+        
+        assert (relative.column, relative.operator, relative.value, relative.value_column) == \
+            ('inventory', '>=', 10.0, 'moq')
+        assert string.value == 'Authorized' and string.is_string
+        assert (constant.operator, constant.value) == ('<=', 1.5)
+    
+    def test_structured_rule(self, parts):
+        """Test a rule given as explicit fields."""
+        rule = BoostRule.from_config('stocked', {
+            'column': 'inventory', 'operator': '>', 'value': 2, 'value_column': 'moq', 'multiplier': 1.2
+        })
+        
+        np.testing.assert_array_equal(rule.evaluate(parts, len(parts)), [True, False, False, True])
+    
+    def test_invalid_rules(self):
+        """Test that bad rules fail at compile time."""
+        with pytest.raises(ValueError, match="Cannot parse condition"):
+            BoostRule.from_config('bad', {'condition': 'inventory is large'})
+        with pytest.raises(ValueError, match="Unknown operator"):
+            BoostRule.from_config('bad', {'column': 'inventory', 'operator': '=>', 'value': 1})
+    
+    def test_default_rules_multiplier(self, parts):
+        """Test the combined multiplier of the configured rules and column defaults."""
+        boosts = CompiledBoosts.from_config(get_default_config()['boosts'])
+        multiplier = boosts.multiplier(parts, len(parts))
+        
+        expected = [1.1 * 1.15 * 1.05 * 1.08, 1.0, 1.08, 1.05]
+        np.testing.assert_allclose(multiplier, expected)
+        
+        # Without a moq column the ample stock rule falls back to moq 1
+        no_moq = parts.drop(columns='moq')
+        assert boosts.masks(no_moq, len(no_moq))['ample_stock'].tolist() == [True, False, True, False]
+    
+    def test_missing_column_without_default(self, parts):
+        """Test that a rule on a missing column matches nothing."""
+        rule = BoostRule.from_config('rated', {'condition': 'rating > 3', 'multiplier': 2.0})
+        
+        assert not rule.evaluate(parts, len(parts)).any()
+    
+    @pytest.mark.parametrize('engine', ['pandas', 'numpy'])
+    def test_boosts_from_config(self, parts, engine):
+        """Test that scorers use configured rules and can disable them."""
+        config = get_default_config()
+        config['engine'] = engine
+        config['boosts'] = {}
+        unboosted = PartScorer(config).calculate_scores(parts)
+        
+        config['boosts'] = {'stocked': {'condition': 'inventory > 60', 'multiplier': 2.0}}
+        boosted = PartScorer(config).calculate_scores(parts).set_index('pn')
+        
+        np.testing.assert_array_equal(unboosted['boosted_score'].values, unboosted['base_score'].values)
+        assert boosted.loc['PART001', 'boosted_score'] == 2.0 * boosted.loc['PART001', 'base_score']
+        assert boosted.loc['PART003', 'boosted_score'] == boosted.loc['PART003', 'base_score']
@@ -0,0 +1,107 @@
+"""Tests for compact dtype scoring."""
+
+import pytest
+import pandas as pd
+import numpy as np
+from part_priority_scoring import PartScorer, FeatureEngineer
+from part_priority_scoring.config.settings import get_default_config
+from part_priority_scoring.core.compact import compact_frame, priority_tolerance, PRIORITY_TOLERANCE
+
+
+@pytest.fixture
+def parts():
+    """Parts shaped like DataLoader.load_sample_data output."""
+    rng = np.random.default_rng(21)
+    n = 3000
+    return pd.DataFrame({
+        'pn': [f'PART{i:05d}' for i in range(n)],
+        'desc': [f'Component {i}' for i in range(n)],
+        'category': rng.choice(['ic', 'passive', 'connector'], n),
+        'manuf': rng.choice(['acme', 'globex', 'initech'], n),
+        'inventory': rng.integers(0, 100000, n),
+        'leadtime_weeks': rng.choice([0, 2, 6, 13, 127, np.nan], n),
+        'moq': rng.integers(1, 500, n).astype(float),
+        'demand_all_time': rng.integers(0, 5000, n),
+        'source_type': rng.choice(['Authorized', 'Broker'], n),
+        'datasheet': rng.choice(['https://example.com/ds.pdf', None], n)
+    })
+
+
+def _scorer(engine, compact):
+    config = get_default_config()
+    config['engine'] = engine
+    config['compact'] = compact
+    return PartScorer(config)
+
+
+class TestCompactMode:
+
+    def test_compact_frame_dtypes(self, parts):
+        """Test that numeric columns shrink and low-cardinality strings become categorical."""
+        compacted = compact_frame(parts)
+
+        assert compacted['inventory'].dtype == np.int32
+        assert compacted['demand_all_time'].dtype == np.int16
+        assert compacted['moq'].dtype == np.float32
+        assert isinstance(compacted['category'].dtype, pd.CategoricalDtype)
+        assert isinstance(compacted['source_type'].dtype, pd.CategoricalDtype)
+        assert not isinstance(compacted['pn'].dtype, pd.CategoricalDtype)
+        assert compacted['inventory'].equals(parts['inventory'].astype(np.int32))
+
+    def test_compact_frame_converts_only_given_columns(self, parts):
+        """Test that columns outside the scoring inputs are neither converted nor changed."""
+        compacted = compact_frame(parts, ['inventory', 'source_type', 'missing'])
+
+        assert compacted['inventory'].dtype == np.int32
+        assert isinstance(compacted['source_type'].dtype, pd.CategoricalDtype)
+        assert compacted['category'].dtype == parts['category'].dtype
+        assert compacted['moq'].dtype == np.float64
+        assert parts['inventory'].dtype == np.int64
+        assert list(compacted.columns) == list(parts.columns)
+
+    def test_engineered_features_are_compact(self, parts):
+        """Test that features are float32 and flags uint8 without int8 overflow."""
+        features = FeatureEngineer(compact=True).transform(parts)
+        full = FeatureEngineer().transform(parts)
+
+        assert features['log_inventory'].dtype == np.float32
+        assert features['is_authorized'].dtype == np.uint8
+        assert features['in_stock'].dtype == np.uint8
+        np.testing.assert_allclose(features['inv_leadtime_weeks'], full['inv_leadtime_weeks'], rtol=1e-5)
+
+    @pytest.mark.parametrize('engine', ['pandas', 'numpy'])
+    def test_memory_halved(self, parts, engine):
+        """Test that scoring inputs, features and scores take at most about half the memory."""
+        scorer = _scorer(engine, True)
+        full = _scorer(engine, False).calculate_scores(parts)
+        compact = scorer.calculate_scores(parts)
+        columns = [col for col in compact.columns if col in scorer.input_columns or col not in parts.columns]
+
+        compact_size = compact[columns].memory_usage(deep=True, index=False).sum()
+        assert compact_size < 0.6 * full[columns].memory_usage(deep=True, index=False).sum()
+
+    @pytest.mark.parametrize('engine', ['pandas', 'numpy'])
+    def test_scores_within_tolerance(self, parts, engine):
+        """Test that compact priority scores stay within the tolerance derived from the score range."""
+        full = _scorer(engine, False).calculate_scores(parts).sort_index()
+        compact = _scorer(engine, True).calculate_scores(parts).sort_index()
+
+        tolerance = priority_tolerance(full['boosted_score'].min(), full['boosted_score'].max())
+        difference = np.abs(compact['priority_score'].to_numpy(float) - full['priority_score'].to_numpy())
+        assert difference.max() <= tolerance <= PRIORITY_TOLERANCE
+
+    def test_tolerance_grows_with_score_magnitude(self):
+        """Test that scores far from zero relative to their range get a looser tolerance."""
+        assert priority_tolerance(-0.5, 0.5) < priority_tolerance(-1.0, 0.0) == PRIORITY_TOLERANCE < 0.011
+        assert priority_tolerance(99.0, 100.0) > 0.03
+
+    def test_fit_and_score_compact(self, parts):
+        """Test that frozen-state scoring works on compact frames."""
+        scorer = _scorer('pandas', True).fit(parts)
+        full = _scorer('pandas', False).fit(parts)
+
+        compact_scores = scorer.score(parts.iloc[:100]).sort_index()
+        full_scores = full.score(parts.iloc[:100]).sort_index()
+
+        difference = np.abs(compact_scores['priority_score'] - full_scores['priority_score'])
+        assert difference.max() <= PRIORITY_TOLERANCE
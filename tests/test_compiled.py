@@ -0,0 +1,93 @@
+"""Tests for low-latency single-part scoring."""
+
+import time
+import pytest
+import pandas as pd
+import numpy as np
+from part_priority_scoring import PartScorer, CompiledScorer
+from part_priority_scoring.config.settings import get_default_config
+
+
+@pytest.fixture
+def reference_data():
+    """Reference population with missing values in every input."""
+    rng = np.random.default_rng(17)
+    n = 800
+    df = pd.DataFrame({
+        'pn': [f'PART{i:04d}' for i in range(n)],
+        'inventory': rng.integers(0, 2000, n).astype(float),
+        'leadtime_weeks': rng.integers(0, 20, n).astype(float),
+        'moq': rng.integers(1, 200, n).astype(float),
+        'demand_all_time': rng.integers(0, 1500, n).astype(float),
+        'source_type': rng.choice(['Authorized', 'Other', None], n),
+        'datasheet': rng.choice(['url', None], n)
+    })
+    for col in ['inventory', 'leadtime_weeks', 'moq', 'demand_all_time']:
+        df.loc[rng.choice(n, 20, replace=False), col] = np.nan
+    return df
+
+
+@pytest.fixture
+def fitted(reference_data):
+    config = get_default_config()
+    config['engine'] = 'numpy'
+    config['percentile'] = 'reference'
+    return PartScorer(config).fit(reference_data)
+
+
+def _records(df):
+    return [{k: (None if isinstance(v, float) and np.isnan(v) else v) for k, v in row.items()}
+            for row in df.to_dict('records')]
+
+
+class TestCompiledScorer:
+
+    def test_matches_frozen_scoring(self, reference_data, fitted):
+        """Test that single-record scores match PartScorer.score on the same state."""
+        expected = fitted.score(reference_data).sort_index()
+        compiled = CompiledScorer.from_scorer(fitted)
+
+        actual = pd.DataFrame(compiled.score_many(_records(reference_data)))
+
+        for col in ['base_score', 'boosted_score']:
+            np.testing.assert_allclose(actual[col].values, expected[col].values, rtol=1e-12, atol=1e-12)
+        for col in ['priority_score', 'score_percentile']:
+            np.testing.assert_array_equal(actual[col].values, expected[col].values)
+
+    def test_tuple_records(self, reference_data, fitted):
+        """Test that tuples in fields order score the same as dicts."""
+        compiled = CompiledScorer.from_scorer(fitted)
+        records = _records(reference_data.iloc[:20])
+        tuples = [tuple(record.get(name) for name in compiled.fields) for record in records]
+
+        assert compiled.score_many(tuples) == compiled.score_many(records)
+
+    def test_missing_boost_column_uses_default(self, fitted):
+        """Test that boost defaults apply to columns outside the fields."""
+        fields = ['inventory', 'leadtime_weeks', 'demand_all_time', 'source_type', 'datasheet']
+        compiled = CompiledScorer(fitted.state, fitted.config, fields=fields)
+
+        stocked = compiled.score_one({'inventory': 50, 'leadtime_weeks': 3, 'demand_all_time': 10})
+        scarce = compiled.score_one({'inventory': 5, 'leadtime_weeks': 3, 'demand_all_time': 10})
+
+        # ample_stock treats a missing moq column as MOQ 1
+        assert stocked['boosted_score'] == pytest.approx(stocked['base_score'] * 1.1)
+        assert scarce['boosted_score'] == scarce['base_score']
+
+    def test_requires_fitted_state(self):
+        """Test that compiling without a score range raises an error."""
+        with pytest.raises(ValueError, match="Call fit"):
+            CompiledScorer(None)
+
+    def test_latency(self, fitted):
+        """Test that a single part scores in well under a millisecond."""
+        compiled = CompiledScorer.from_scorer(fitted)
+        record = {'inventory': 120, 'leadtime_weeks': 0, 'moq': 10, 'demand_all_time': 300,
+                  'source_type': 'Authorized', 'datasheet': 'url'}
+
+        start = time.perf_counter()
+        for _ in range(1000):
+            compiled.score_one(record)
+        per_part = (time.perf_counter() - start) / 1000
+
+        assert per_part < 500e-6
@@ -18,7 +18,7 @@ class TestDataLoader:
         with patch('part_priority_scoring.core.data_loader.bigquery.Client') as mock_client:
             loader = DataLoader(project_id='test-project')
             assert loader.project_id == 'test-project'
-            mock_client.assert_called_once_with(project='test-project')
+            mock_client.assert_called_once_with(project='test-project', credentials=None)
     
     def test_load_sample_data_no_client(self):
         """Test load_sample_data without client raises error."""
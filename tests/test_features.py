@@ -0,0 +1,75 @@
+"""Tests for the feature dependency graph."""
+
+import pytest
+import pandas as pd
+import numpy as np
+from part_priority_scoring import FeatureEngineer
+from part_priority_scoring.config.settings import get_default_config
+from part_priority_scoring.core.boosts import CompiledBoosts
+from part_priority_scoring.core.features import feature_graph, resolve_features
+
+
+def _parts(n, seed=0):
+    """Raw inputs of every feature in the graph."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'inventory': rng.integers(0, 2000, n),
+        'leadtime_weeks': rng.integers(0, 20, n),
+        'moq': rng.integers(1, 200, n),
+        'demand_all_time': rng.integers(0, 1500, n),
+        'source_type': rng.choice(['Authorized', 'Other', None], n),
+        'datasheet': rng.choice(['url', None], n)
+    })
+
+
+class TestResolveFeatures:
+
+    @pytest.fixture
+    def config(self):
+        return get_default_config()
+
+    def test_default_weights_and_boosts(self, config):
+        """Test that only weighted features, their dependencies and boost columns are planned."""
+        boosts = CompiledBoosts.from_config(config['boosts'])
+
+        plan = resolve_features(list(config['weights']) + boosts.columns, config['features'])
+
+        assert 'log_inventory' not in plan.features
+        assert 'log_moq' not in plan.features
+        assert plan.features.index('in_stock') < plan.features.index('availability_score')
+        assert set(plan.scaled) == {'demand_score', 'availability_score', 'inv_leadtime_weeks',
+                                    'inv_moq', 'demand_all_time'}
+        assert 'datasheet' not in plan.columns
+
+    def test_unknown_names_are_raw_columns(self, config):
+        """Test that names outside the graph are read as input columns."""
+        plan = resolve_features(['demand_index', 'in_stock'], config['features'])
+
+        assert plan.features == ['in_stock']
+        assert plan.columns == ['demand_index', 'inventory']
+        assert plan.scaled == ['demand_index']
+
+    def test_graph_follows_feature_config(self):
+        """Test that configured transforms define the log and inverse features."""
+        graph = feature_graph({'log_transforms': ['demand_all_time'], 'inverse_transforms': []})
+
+        assert graph['log_demand_all_time'].inputs == ('demand_all_time',)
+        assert 'inv_moq' not in graph
+
+
+class TestLazyFeatureEngineer:
+
+    def test_requested_features_match_full_transform(self):
+        """Test that lazily built features equal the same columns of a full transform."""
+        parts = _parts(300)
+        features = ['availability_score', 'inv_moq', 'demand_all_time']
+        full = FeatureEngineer().fit(parts)
+
+        lazy = FeatureEngineer(features=features).fit(parts)
+        transformed = lazy.transform(parts)
+
+        assert 'log_inventory' not in transformed.columns
+        assert set(lazy.state.centers) == {'availability_score', 'inv_moq', 'demand_all_time'}
+        expected = full.transform(parts)
+        for feature in features:
+            np.testing.assert_array_equal(transformed[feature].to_numpy(), expected[feature].to_numpy())
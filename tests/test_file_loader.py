@@ -0,0 +1,142 @@
+"""Tests for loading parts from local files."""
+
+import json
+
+import pytest
+import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import pyarrow.feather as feather
+from part_priority_scoring import FileDataLoader, PartScorer, score_parts_iter
+from part_priority_scoring.config.settings import get_default_config
+from part_priority_scoring.core.file_loader import to_expression
+
+
+@pytest.fixture
+def parts():
+    """Exported parts with categories to partition on and some missing inventory and moq."""
+    rng = np.random.default_rng(0)
+    n = 2000
+    return pd.DataFrame({
+        'pn': [f'PART{i:05d}' for i in range(n)],
+        'desc': 'part',
+        'category': rng.choice(['ic', 'passive', 'connector', None], n),
+        'manuf': 'acme',
+        'inventory': np.where(rng.random(n) < 0.05, np.nan, rng.integers(0, 2000, n)),
+        'leadtime_weeks': rng.integers(0, 20, n),
+        'moq': np.where(rng.random(n) < 0.05, np.nan, rng.integers(1, 200, n)),
+        'demand_all_time': rng.integers(0, 1500, n),
+        'demand_index': 1.0,
+        'source_type': rng.choice(['Authorized', 'Other', None], n),
+        'datasheet': rng.choice(['url', None], n)
+    })
+
+
+def _sorted(df):
+    return df.sort_values('pn').reset_index(drop=True)
+
+
+class TestFileDataLoader:
+
+    def test_reads_only_scoring_columns(self, tmp_path, parts):
+        """Test that only inputs of the weights, boost rules and id columns are read."""
+        pq.write_table(pa.Table.from_pandas(parts, preserve_index=False), tmp_path / 'parts.parquet')
+
+        loader = FileDataLoader(tmp_path / 'parts.parquet')
+        df = loader.load()
+
+        assert loader.format == 'parquet'
+        assert set(df.columns) == {'pn', 'category', 'inventory', 'leadtime_weeks', 'moq',
+                                   'demand_all_time', 'source_type'}
+        pd.testing.assert_frame_equal(PartScorer().calculate_scores(df)[['pn', 'priority_score']],
+                                      PartScorer().calculate_scores(parts)[['pn', 'priority_score']])
+
+    def test_columns_follow_config(self, tmp_path, parts):
+        """Test that weights using other features read their inputs."""
+        feather.write_feather(parts, tmp_path / 'parts.feather')
+        config = get_default_config()
+        config.update(weights={'has_datasheet': 1.0}, boosts={})
+
+        loader = FileDataLoader(tmp_path / 'parts.feather', config=config)
+
+        assert loader.format == 'ipc'
+        assert loader.scoring_columns() == ['pn', 'category', 'datasheet']
+
+    @pytest.mark.parametrize('filters', [
+        ["category == 'ic'", 'inventory >= 1000'],
+        [('category', '=', 'ic'), ('inventory', '>=', 1000)],
+        (ds.field('category') == 'ic') & (ds.field('inventory') >= 1000),
+    ])
+    def test_filters(self, tmp_path, parts, filters):
+        """Test that condition strings, tuples and expressions filter rows while reading."""
+        parts.to_csv(tmp_path / 'parts.csv', index=False)
+        expected = parts[(parts['category'] == 'ic') & (parts['inventory'] >= 1000)]
+
+        df = FileDataLoader(tmp_path / 'parts.csv').load(filters=filters, columns=['pn', 'inventory'])
+
+        assert list(df.columns) == ['pn', 'inventory']
+        assert sorted(df['pn']) == sorted(expected['pn'])
+
+    def test_column_comparison_filter(self):
+        """Test that conditions comparing two columns become column expressions."""
+        expression = to_expression('inventory >= 10 * moq')
+
+        assert expression.equals(ds.field('inventory') >= ds.field('moq') * 10.0)
+
+    def test_partitioned_batches(self, tmp_path, parts):
+        """Test that a hive-partitioned dataset is pruned by partition filters and read in batches."""
+        table = pa.Table.from_pandas(parts.dropna(subset=['category']), preserve_index=False)
+        ds.write_dataset(table, tmp_path / 'parts', format='parquet', partitioning=['category'],
+                         partitioning_flavor='hive')
+
+        loader = FileDataLoader(tmp_path / 'parts')
+        batches = list(loader.iter_batches(filters="category != 'passive'", batch_rows=100))
+
+        expected = parts[parts['category'].isin(['ic', 'connector'])]
+        assert max(len(batch) for batch in batches) <= 100
+        actual = pd.concat(batches)
+        assert set(actual['category']) == {'ic', 'connector'}
+        assert sorted(actual['pn']) == sorted(expected['pn'])
+
+    def test_batches_feed_chunked_scoring(self, tmp_path, parts):
+        """Test that batches can be a ChunkedScorer chunk source."""
+        pq.write_table(pa.Table.from_pandas(parts, preserve_index=False), tmp_path / 'parts.parquet',
+                       row_group_size=300)
+        loader = FileDataLoader(tmp_path / 'parts.parquet')
+
+        scored = pd.concat(score_parts_iter(lambda: loader.iter_batches(batch_rows=500)))
+
+        config = get_default_config()
+        config['engine'] = 'numpy'
+        expected = PartScorer(config).calculate_scores(parts)
+        np.testing.assert_array_equal(_sorted(scored)['priority_score'], _sorted(expected)['priority_score'])
+
+    def test_raw_export_columns_are_parsed(self, tmp_path, parts):
+        """Test that raw leadtime and demand_totals are read and parsed when the parsed columns are missing."""
+        raw = parts.drop(columns=['leadtime_weeks', 'demand_index']).assign(
+            leadtime=[f'{w} Weeks' for w in parts['leadtime_weeks']],
+            demand_totals=json.dumps({'demand_totals': [{'demand_index': 1.0}]})
+        )
+        pq.write_table(pa.Table.from_pandas(raw, preserve_index=False), tmp_path / 'raw.parquet')
+
+        loader = FileDataLoader(tmp_path / 'raw.parquet')
+        df = loader.load()
+
+        assert 'leadtime' in loader.scoring_columns()
+        np.testing.assert_array_equal(df['leadtime_weeks'], parts['leadtime_weeks'])
+
+        table = loader.load(as_arrow=True)
+        np.testing.assert_array_equal(table.column('leadtime_weeks').to_numpy(zero_copy_only=False),
+                                      parts['leadtime_weeks'])
+        expected = PartScorer().calculate_scores(df)
+        actual = PartScorer({**PartScorer().config, 'engine': 'arrow'}).calculate_scores(table).to_pandas()
+        np.testing.assert_allclose(_sorted(actual)['priority_score'], _sorted(expected)['priority_score'])
+
+    def test_unknown_format(self, tmp_path):
+        """Test that a path without a known file suffix needs an explicit format."""
+        (tmp_path / 'parts.txt').write_text('pn\nA\n')
+
+        with pytest.raises(ValueError, match="Cannot infer file format"):
+            FileDataLoader(tmp_path / 'parts.txt')
@@ -0,0 +1,117 @@
+"""Tests for the fused row-loop scoring kernel."""
+
+import pytest
+import pandas as pd
+import numpy as np
+from part_priority_scoring import PartScorer
+from part_priority_scoring.config.settings import get_default_config
+from part_priority_scoring.core import kernel
+from part_priority_scoring.core.boosts import CompiledBoosts
+from part_priority_scoring.core.fused import fused_scores
+
+
+def _parts(n, seed=21):
+    rng = np.random.default_rng(seed)
+    inventory = rng.integers(0, 2000, n).astype(float)
+    inventory[rng.random(n) < 0.05] = np.nan
+    moq = rng.integers(0, 200, n).astype(float)
+    moq[rng.random(n) < 0.05] = np.nan
+    return pd.DataFrame({
+        'pn': [f'PART{i:05d}' for i in range(n)],
+        'inventory': inventory,
+        'leadtime_weeks': rng.integers(0, 20, n),
+        'moq': moq,
+        'demand_all_time': rng.integers(0, 1500, n),
+        'source_type': rng.choice(['Authorized', 'Other', None], n),
+        'datasheet': rng.choice(['url', None], n)
+    })
+
+
+def _assert_close(actual, expected):
+    """Scores agree up to the last bit of log1p, which libm and NumPy may round differently."""
+    for a, e in zip(actual[:2], expected[:2]):
+        np.testing.assert_allclose(a, e, rtol=1e-12, atol=1e-12)
+    assert actual[2].keys() == expected[2].keys()
+    for name, stats in expected[2].items():
+        np.testing.assert_allclose(actual[2][name], stats, rtol=1e-12)
+
+
+class TestFusedScores:
+
+    @pytest.fixture
+    def config(self):
+        return get_default_config()
+
+    def test_matches_kernel(self, config):
+        """Test that the fused loop matches the NumPy kernel, fitting scaling on the batch."""
+        df = _parts(300)
+        expected = kernel.boosted_scores(df, config['weights'], config['features'])
+
+        actual = fused_scores(df, config['weights'], config['features'])
+
+        _assert_close(actual, expected)
+
+    def test_matches_kernel_with_state(self, config):
+        """Test that frozen statistics are used instead of fitting."""
+        state = kernel.fit_state(_parts(500, seed=1), config['weights'], config['features'])
+        df = _parts(200)
+        expected = kernel.boosted_scores(df, config['weights'], config['features'], state)
+
+        actual = fused_scores(df, config['weights'], config['features'], state)
+
+        _assert_close(actual, expected)
+        assert actual[2] == {}
+
+    def test_all_feature_kinds(self, config):
+        """Test log, binary and pass-through features and column-scaled rules."""
+        weights = {'log_inventory': 0.2, 'log_moq': 0.1, 'in_stock': 0.1, 'immediate_availability': 0.1,
+                   'has_datasheet': 0.1, 'is_authorized': 0.1, 'availability_score': 0.3, 'demand_index': 0.1}
+        boosts = CompiledBoosts.from_config({
+            'ample': {'condition': 'inventory >= 10 * moq', 'multiplier': 1.1, 'defaults': {'moq': 1}},
+            'demand': {'condition': 'demand_all_time > 0.5', 'multiplier': 1.2},
+            'other': {'condition': "source_type != 'Authorized'", 'multiplier': 0.9},
+            'missing': {'condition': 'price < 10', 'multiplier': 2.0},
+        })
+        df = _parts(300).assign(demand_index=np.linspace(0, 1, 300))
+        expected = kernel.boosted_scores(df, weights, config['features'], boosts=boosts)
+
+        actual = fused_scores(df, weights, config['features'], boosts=boosts)
+
+        _assert_close(actual, expected)
+
+    def test_missing_columns(self, config):
+        """Test that rule defaults and missing features behave like the kernel."""
+        boosts = CompiledBoosts.from_config(config['boosts'])
+        df = _parts(100).drop(columns=['moq', 'leadtime_weeks'])
+        expected = kernel.boosted_scores(df, config['weights'], config['features'], boosts=boosts)
+
+        actual = fused_scores(df, config['weights'], config['features'], boosts=boosts)
+
+        _assert_close(actual, expected)
+
+
+class TestJitOption:
+
+    def test_scorer_jit_matches_numpy_engine(self):
+        """Test that jit=True scores like the numpy engine, with or without numba installed."""
+        df = _parts(400)
+        config = get_default_config()
+        config['engine'] = 'numpy'
+        expected = PartScorer(config).calculate_scores(df).sort_index()
+
+        config['jit'] = True
+        actual = PartScorer(config).calculate_scores(df).sort_index()
+
+        np.testing.assert_allclose(actual['boosted_score'], expected['boosted_score'], rtol=1e-12)
+        np.testing.assert_allclose(actual['priority_score'], expected['priority_score'], atol=0.01)
+
+    def test_numba_compiled_loop(self):
+        """Test the compiled loop itself when numba is installed."""
+        pytest.importorskip('numba')
+        config = get_default_config()
+        df = _parts(5000)
+        expected = kernel.boosted_scores(df, config['weights'], config['features'])
+
+        actual = kernel.boosted_scores(df, config['weights'], config['features'], jit=True)
+
+        _assert_close(actual, expected)
@@ -0,0 +1,163 @@
+"""Tests for incremental rescoring keyed by part number."""
+
+import pytest
+import pandas as pd
+import numpy as np
+from part_priority_scoring import PartScorer, IncrementalScorer
+from part_priority_scoring.config.settings import get_default_config
+from part_priority_scoring.core import kernel
+
+
+def _parts(n, seed=13, start=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'pn': [f'PART{i:05d}' for i in range(start, start + n)],
+        'inventory': rng.integers(0, 2000, n),
+        'leadtime_weeks': rng.integers(0, 20, n),
+        'moq': rng.integers(1, 200, n),
+        'demand_all_time': rng.integers(0, 1500, n),
+        'source_type': rng.choice(['Authorized', 'Other'], n),
+        'datasheet': rng.choice(['url', None], n)
+    })
+
+
+def _merge(table, delta):
+    """Full table with delta rows replacing or extending it."""
+    return pd.concat([table, delta]).drop_duplicates('pn', keep='last')
+
+
+def _expected(scorer, table):
+    """Full rescore of the table against the scorer's feature scaling."""
+    _, boosted, _ = kernel.boosted_scores(table, scorer.weights, scorer.feature_config,
+                                          scorer.state, scorer.boosts)
+    priority = kernel.normalize_scores(boosted, boosted.min(), boosted.max())
+    return pd.Series(priority, index=table['pn'].to_numpy())
+
+
+class TestIncrementalScoring:
+
+    @pytest.fixture
+    def table(self):
+        return _parts(600)
+
+    @pytest.fixture
+    def scorer(self, table, tmp_path):
+        return IncrementalScorer(tmp_path / 'scores').build(table)
+
+    def test_build_matches_fitted_scoring(self, table, scorer):
+        """Test that the built score set equals fit-then-score on the table."""
+        config = get_default_config()
+        config['engine'] = 'numpy'
+        expected = PartScorer(config).fit(table).score(table).set_index('pn')
+
+        actual = scorer.scores().set_index('pn')
+
+        for col in ['base_score', 'boosted_score', 'priority_score', 'score_percentile']:
+            np.testing.assert_array_equal(actual[col].values, expected.loc[actual.index, col].values)
+
+    def test_unchanged_rows_are_skipped(self, table, scorer):
+        """Test that resending identical rows rescores nothing."""
+        report = scorer.apply_delta(table.iloc[:50])
+
+        assert report.n_received == 50
+        assert report.n_rescored == 0
+        assert report.changed.empty
+
+    def test_delta_within_range(self, table, scorer):
+        """Test that a small update rescores and reports only the changed parts."""
+        delta = table.iloc[[3, 7]].assign(inventory=[5, 6])
+
+        report = scorer.apply_delta(delta)
+
+        assert report.n_rescored == 2
+        assert not report.renormalized
+        assert set(report.changed['pn']) <= {'PART00003', 'PART00007'}
+        merged = _merge(table, delta)
+        actual = scorer.scores().set_index('pn')['priority_score']
+        np.testing.assert_array_equal(actual.values, _expected(scorer, merged).loc[actual.index].values)
+
+    def test_new_extreme_renormalizes(self, table, scorer):
+        """Test that a new part past the range renormalizes every score."""
+        delta = _parts(1, start=900).assign(demand_all_time=10 ** 6, inventory=10 ** 6)
+
+        report = scorer.apply_delta(delta)
+
+        assert report.renormalized
+        assert report.n_rescored == 1
+        assert len(scorer) == len(table) + 1
+        assert 'PART00900' in set(report.changed['pn'])
+        assert np.isnan(report.changed.set_index('pn').loc['PART00900', 'previous_score'])
+        merged = _merge(table, delta)
+        actual = scorer.scores().set_index('pn')['priority_score']
+        np.testing.assert_array_equal(actual.values, _expected(scorer, merged).loc[actual.index].values)
+
+    def test_lowering_the_maximum_renormalizes(self, table, scorer):
+        """Test that updating the part holding the maximum shrinks the range."""
+        top = scorer.scores()['priority_score'].idxmax()
+        delta = table.iloc[[top]].assign(inventory=0, leadtime_weeks=20, demand_all_time=0)
+
+        report = scorer.apply_delta(delta)
+
+        assert report.renormalized
+        merged = _merge(table, delta)
+        actual = scorer.scores().set_index('pn')['priority_score']
+        assert actual.max() == 100.0
+        np.testing.assert_array_equal(actual.values, _expected(scorer, merged).loc[actual.index].values)
+
+    def test_histogram_tracks_current_scores(self, table, scorer):
+        """Test that incrementally updated percentiles equal ranking the current set."""
+        scorer.apply_delta(table.iloc[10:40].assign(moq=1))
+        scorer.apply_delta(_parts(20, seed=2, start=700))
+
+        scores = scorer.scores()
+
+        np.testing.assert_allclose(scores['score_percentile'].values,
+                                   scores['priority_score'].rank(pct=True).values * 100, rtol=1e-12)
+
+    def test_persisted_and_reloaded(self, table, scorer, tmp_path):
+        """Test that the score set survives a reload and keeps applying deltas."""
+        scorer.apply_delta(table.iloc[:5].assign(leadtime_weeks=0))
+
+        reloaded = IncrementalScorer(tmp_path / 'scores')
+
+        assert reloaded.state == scorer.state
+        pd.testing.assert_frame_equal(reloaded.scores(), scorer.scores())
+        assert reloaded.apply_delta(table.iloc[:5].assign(leadtime_weeks=0)).n_rescored == 0
+
+    def test_float_columns_hash_like_ints(self, table, scorer):
+        """Test that integer inputs read back as floats are not treated as changes."""
+        report = scorer.apply_delta(table.iloc[:50].astype({'inventory': float, 'moq': float}))
+
+        assert report.n_rescored == 0
+
+    def test_delta_writes_only_rescored_parts(self, table, scorer, tmp_path):
+        """Test that a delta appends a segment and leaves the compacted score set untouched."""
+        compacted = (tmp_path / 'scores' / 'scores.parquet').stat().st_mtime_ns
+
+        scorer.apply_delta(table.iloc[[3, 7]].assign(inventory=[5, 6]))
+
+        segments = sorted((tmp_path / 'scores' / 'deltas').glob('*.parquet'))
+        assert [segment.name for segment in segments] == ['delta-000001.parquet']
+        assert list(pd.read_parquet(segments[0]).index) == ['PART00003', 'PART00007']
+        assert (tmp_path / 'scores' / 'scores.parquet').stat().st_mtime_ns == compacted
+
+    def test_segments_compacted_and_reloaded(self, table, scorer, tmp_path):
+        """Test that outgrowing the score set compacts segments without changing scores."""
+        scorer.apply_delta(table.iloc[:5].assign(leadtime_weeks=0))
+        for start in range(1000, 1800, 200):
+            scorer.apply_delta(_parts(200, seed=start, start=start))
+
+        assert len(scorer) == len(table) + 800
+        assert len(list((tmp_path / 'scores' / 'deltas').glob('*.parquet'))) < 4
+        reloaded = IncrementalScorer(tmp_path / 'scores')
+        assert reloaded.state == scorer.state
+        pd.testing.assert_frame_equal(reloaded.scores(), scorer.scores())
+        merged = _merge(_merge(table, table.iloc[:5].assign(leadtime_weeks=0)),
+                        pd.concat([_parts(200, seed=start, start=start) for start in range(1000, 1800, 200)]))
+        actual = scorer.scores().set_index('pn')['priority_score']
+        np.testing.assert_array_equal(actual.values, _expected(scorer, merged).loc[actual.index].values)
+
+    def test_delta_without_build(self, tmp_path):
+        """Test that applying a delta before build raises an error."""
+        with pytest.raises(ValueError, match="Call build"):
+            IncrementalScorer(tmp_path / 'empty').apply_delta(_parts(3))
@@ -0,0 +1,131 @@
+"""Tests for in-place, append-only feature engineering and scoring."""
+
+import tracemalloc
+
+import pytest
+import pandas as pd
+import numpy as np
+from part_priority_scoring import PartScorer, FeatureEngineer
+from part_priority_scoring.config.settings import get_default_config
+
+
+def _peak_bytes(function):
+    """Peak bytes traced while running ``function``."""
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _parts(n, seed=0, missing=0.0):
+    """Parts with every column ``DataLoader.load_sample_data`` returns, with ``missing`` NaN inputs."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'pn': [f'PART{i:07d}' for i in range(n)],
+        'pn_clean': [f'part{i:07d}' for i in range(n)],
+        'desc': [f'Component {i} ceramic capacitor 0402' for i in range(n)],
+        'category': rng.choice(['ic', 'passive', 'connector'], n),
+        'manuf': rng.choice(['acme', 'globex', 'initech'], n),
+        'inventory': rng.integers(0, 2000, n).astype(float),
+        'leadtime_weeks': rng.choice([0, 2, 6, 13, 27, np.nan], n),
+        'moq': rng.integers(1, 200, n).astype(float),
+        'source_type': rng.choice(['Authorized', 'Other', None], n),
+        'datasheet': [f'https://example.com/ds/{i}.pdf' if i % 3 else None for i in range(n)],
+        'demand_all_time': rng.integers(0, 1500, n),
+        'demand_index': rng.random(n)
+    })
+    for col in ['inventory', 'moq']:
+        df.loc[rng.random(n) < missing, col] = np.nan
+    return df
+
+
+def _config(**overrides):
+    config = get_default_config()
+    config.update(overrides)
+    return config
+
+
+class TestInplaceFeatureEngineer:
+
+    @pytest.mark.parametrize('features', [None, ['availability_score', 'inv_moq', 'log_moq', 'demand_all_time']])
+    def test_matches_copying_transform(self, features):
+        """Test that in-place features equal the features of a copying transform."""
+        df = _parts(2000, missing=0.05)
+        expected = FeatureEngineer(features=features).transform(df)
+
+        target = df.copy()
+        actual = FeatureEngineer(features=features, inplace=True).transform(target)
+
+        assert actual is target
+        pd.testing.assert_frame_equal(actual, expected)
+
+    def test_fit_and_frozen_state(self):
+        """Test that fitting leaves the frame untouched and transforms match with frozen state."""
+        reference, batch = _parts(1000, missing=0.05), _parts(300, seed=2)
+        state = FeatureEngineer().fit(reference).state
+        untouched = reference.copy()
+
+        engineer = FeatureEngineer(inplace=True).fit(reference)
+
+        assert engineer.state == state
+        pd.testing.assert_frame_equal(reference, untouched)
+        pd.testing.assert_frame_equal(FeatureEngineer(state=state, inplace=True).transform(batch.copy()),
+                                      FeatureEngineer(state=state).transform(batch))
+
+    def test_rejects_compact(self):
+        """Test that inplace and compact modes cannot be combined."""
+        with pytest.raises(ValueError, match='inplace and compact'):
+            FeatureEngineer(compact=True, inplace=True)
+
+    def test_peak_memory(self):
+        """Test that transform peaks under 1.5x the input, where a copying transform does not."""
+        df = _parts(100_000)
+        features = list(PartScorer().features)
+        input_bytes = df.memory_usage(deep=True).sum()
+
+        copying = _peak_bytes(lambda: FeatureEngineer(features=features).transform(df))
+        inplace = _peak_bytes(lambda: FeatureEngineer(features=features, inplace=True).transform(df))
+
+        assert (input_bytes + inplace) / input_bytes < 1.5
+        assert inplace < copying
+
+
+class TestInplaceScoring:
+
+    @pytest.mark.parametrize('engine', ['pandas', 'numpy'])
+    def test_matches_copying_scorer(self, engine):
+        """Test that in-place scoring appends the same columns to the caller's frame, in input order."""
+        df = _parts(1500, missing=0.05)
+        expected = PartScorer(_config(engine=engine)).calculate_scores(df)
+
+        target = df.copy()
+        actual = PartScorer(_config(engine=engine, inplace=True)).calculate_scores(target)
+
+        assert actual is target
+        assert actual.index.equals(df.index)
+        pd.testing.assert_frame_equal(actual.loc[expected.index], expected)
+
+    def test_top_k_is_sorted(self):
+        """Test that top-k selection still returns the best rows, sorted."""
+        df = _parts(500)
+        expected = PartScorer(_config()).calculate_scores(df, top_k=10)
+
+        actual = PartScorer(_config(inplace=True)).calculate_scores(df.copy(), top_k=10)
+
+        pd.testing.assert_frame_equal(actual, expected)
+
+    def test_rejects_compact(self):
+        """Test that inplace and compact scoring cannot be combined."""
+        with pytest.raises(ValueError, match='inplace and compact'):
+            PartScorer(_config(inplace=True, compact=True))
+
+    def test_peak_memory_below_copying_scorer(self):
+        """Test that in-place pandas scoring peaks well below the copying scorer."""
+        df = _parts(100_000)
+
+        copying = _peak_bytes(lambda: PartScorer(_config()).calculate_scores(df))
+        inplace = _peak_bytes(lambda: PartScorer(_config(inplace=True)).calculate_scores(df))
+
+        assert inplace < 0.75 * copying
@@ -0,0 +1,84 @@
+"""Tests for the fused NumPy scoring kernel."""
+
+import pytest
+import pandas as pd
+import numpy as np
+from part_priority_scoring import PartScorer
+from part_priority_scoring.config.settings import get_default_config
+from part_priority_scoring.core.kernel import percentile_rank, robust_scale
+
+RESULT_COLUMNS = ['base_score', 'boosted_score', 'priority_score', 'score_percentile']
+
+
+def _numpy_scorer():
+    config = get_default_config()
+    config['engine'] = 'numpy'
+    return PartScorer(config)
+
+
+class TestScoringKernel:
+
+    @pytest.fixture
+    def random_data(self):
+        """Randomized parts with missing values."""
+        rng = np.random.default_rng(42)
+        n = 2000
+        df = pd.DataFrame({
+            'pn': [f'PART{i:05d}' for i in range(n)],
+            'inventory': rng.integers(0, 5000, n).astype(float),
+            'leadtime_weeks': rng.integers(0, 30, n).astype(float),
+            'moq': rng.integers(1, 500, n).astype(float),
+            'demand_all_time': rng.integers(0, 3000, n).astype(float),
+            'source_type': rng.choice(['Authorized', 'Other', None], n),
+            'datasheet': rng.choice(['url', None], n),
+        })
+        for col in ['inventory', 'leadtime_weeks', 'moq', 'demand_all_time']:
+            df.loc[rng.random(n) < 0.05, col] = np.nan
+        return df
+
+    def test_matches_pandas_engine(self, random_data):
+        """Test that the numpy engine reproduces the pandas scores exactly."""
+        expected = PartScorer().calculate_scores(random_data).sort_index()
+        actual = _numpy_scorer().calculate_scores(random_data).sort_index()
+
+        for col in RESULT_COLUMNS:
+            np.testing.assert_array_equal(actual[col].values, expected[col].values)
+
+    def test_matches_pandas_engine_missing_columns(self):
+        """Test parity when optional columns are absent."""
+        df = pd.DataFrame({
+            'pn': ['PART001', 'PART002', 'PART003'],
+            'inventory': [100, 0, 50],
+            'moq': [1, 10, 100]
+        })
+        expected = PartScorer().calculate_scores(df).sort_index()
+        actual = _numpy_scorer().calculate_scores(df).sort_index()
+
+        for col in RESULT_COLUMNS:
+            np.testing.assert_array_equal(actual[col].values, expected[col].values)
+
+    def test_only_result_columns_attached(self, random_data):
+        """Test that engineered features are not added to the output."""
+        scored_df = _numpy_scorer().calculate_scores(random_data)
+
+        assert list(scored_df.columns) == list(random_data.columns) + RESULT_COLUMNS
+        assert scored_df['priority_score'].is_monotonic_decreasing
+        assert 'availability_score' not in random_data.columns
+
+    def test_unknown_engine(self):
+        """Test that an unknown engine is rejected."""
+        with pytest.raises(ValueError, match="Unknown scoring engine"):
+            PartScorer({'weights': {}, 'engine': 'spark'})
+
+    def test_percentile_rank_matches_pandas(self):
+        """Test tie handling of the percentile rank."""
+        scores = np.array([10.0, 50.0, 50.0, 0.0, 100.0, 50.0])
+        expected = pd.Series(scores).rank(pct=True).values * 100
+
+        np.testing.assert_array_equal(percentile_rank(scores), expected)
+
+    def test_robust_scale_constant_feature(self):
+        """Test that a constant feature is centered but not divided by zero."""
+        scaled = robust_scale(np.array([3.0, 3.0, 3.0, 3.0, 10.0]))
+
+        np.testing.assert_array_equal(scaled, [0.0, 0.0, 0.0, 0.0, 7.0])
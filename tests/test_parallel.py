@@ -0,0 +1,172 @@
+"""Tests for process-pool parallel scoring."""
+
+import sys
+import subprocess
+from pathlib import Path
+
+import pytest
+import pandas as pd
+import numpy as np
+from part_priority_scoring import PartScorer, ParallelScorer
+from part_priority_scoring.config.settings import get_default_config
+from part_priority_scoring.core import kernel
+from part_priority_scoring.core.boosts import CompiledBoosts
+from part_priority_scoring.core.parallel import DEFAULT_SCALING_ERROR, _shard_scaler
+
+SCORE_COLUMNS = ['base_score', 'boosted_score', 'priority_score', 'score_percentile']
+
+
+def _parts(n, seed=5):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'pn': [f'PART{i:05d}' for i in range(n)],
+        'category': rng.choice(['ic', 'passive', 'connector', 'sensor', None], n),
+        'inventory': rng.integers(0, 2000, n),
+        'leadtime_weeks': rng.integers(0, 20, n),
+        'moq': rng.integers(1, 200, n),
+        'demand_all_time': rng.integers(0, 1500, n),
+        'source_type': rng.choice(['Authorized', 'Other'], n),
+        'datasheet': rng.choice(['url', None], n)
+    })
+
+
+def _config(percentile='rank'):
+    config = get_default_config()
+    config['engine'] = 'numpy'
+    config['percentile'] = percentile
+    return config
+
+
+class TestParallelScoring:
+
+    @pytest.mark.parametrize('n_jobs,shard_by', [(1, None), (2, None), (3, 'category')])
+    def test_bit_identical_to_serial(self, n_jobs, shard_by):
+        """Test that parallel scores equal the serial numpy engine bit for bit."""
+        df = _parts(1001)
+        expected = PartScorer(_config()).calculate_scores(df)
+
+        parallel = ParallelScorer(_config(), n_jobs=n_jobs, shard_by=shard_by, scaling_error=None)
+        actual = parallel.calculate_scores(df)
+
+        assert list(actual['pn']) == list(expected['pn'])
+        for col in SCORE_COLUMNS:
+            np.testing.assert_array_equal(actual[col].values, expected[col].values)
+
+    def test_matches_pandas_engine(self):
+        """Test that parallel scores equal the default pandas engine's score columns."""
+        df = _parts(500)
+        expected = PartScorer().calculate_scores(df).sort_index()
+
+        actual = ParallelScorer(n_jobs=2).calculate_scores(df).sort_index()
+
+        for col in SCORE_COLUMNS:
+            np.testing.assert_array_equal(actual[col].values, expected[col].values)
+
+    @pytest.mark.parametrize('percentile', ['rank', 'histogram', 'reference'])
+    def test_without_normalization(self, percentile):
+        """Test that unnormalized scores fall back to sorted percentiles in every mode."""
+        df = _parts(300)
+        expected = PartScorer(_config()).calculate_scores(df, normalize=False)
+
+        parallel = ParallelScorer(_config(percentile), n_jobs=2)
+        if percentile == 'reference':
+            parallel.fit(df)
+        actual = parallel.calculate_scores(df, normalize=False)
+
+        for col in SCORE_COLUMNS:
+            np.testing.assert_array_equal(actual[col].values, expected[col].values)
+
+    @pytest.mark.parametrize('percentile', ['rank', 'reference'])
+    def test_fit_and_score_match_serial(self, percentile):
+        """Test that merged shard statistics equal the serially fitted state."""
+        reference, batch = _parts(800), _parts(50, seed=9)
+        serial = PartScorer(_config(percentile)).fit(reference)
+
+        parallel = ParallelScorer(_config(percentile), n_jobs=2, shard_by='category',
+                                  scaling_error=None).fit(reference)
+
+        assert parallel.state == serial.state
+        expected = serial.score(batch)
+        actual = parallel.score(batch)
+        for col in SCORE_COLUMNS:
+            np.testing.assert_array_equal(actual[col].values, expected[col].values)
+
+    def test_workers_send_bounded_sketches(self):
+        """Test that by default workers send small sketches whose merged medians stay within the error bound."""
+        df, error = _parts(20000), DEFAULT_SCALING_ERROR
+        config = _config()
+        boosts = CompiledBoosts.from_config(config['boosts'])
+        inputs = kernel.scaling_inputs(df, config['weights'], config['features'], boosts)
+
+        shard = _shard_scaler(df.iloc[:10000], config['weights'], config['features'], boosts, error)
+        state = ParallelScorer(config, n_jobs=2).fit(df).state
+
+        for name, values in inputs.items():
+            assert sum(len(items) for items in shard.sketches[name].levels) < 5000
+            low, high = np.quantile(values, [0.5 - error, 0.5 + error])
+            assert low <= state.centers[name] <= high
+
+    def test_config_scaling_error_takes_precedence(self):
+        """Test that the feature config's scaling_error bounds the parallel fit too."""
+        config = _config()
+        config['features'] = {**config['features'], 'scaling_error': 0.01}
+
+        assert ParallelScorer(config, scaling_error=None).scaling_error == 0.01
+        assert ParallelScorer(_config(), scaling_error=None).scaling_error is None
+
+    def test_pool_is_reused_until_closed(self):
+        """Test that calls share one worker pool, which close shuts down."""
+        df = _parts(200)
+
+        with ParallelScorer(_config(), n_jobs=2) as scorer:
+            scorer.fit(df)
+            pool = scorer._pool
+            scorer.score(df)
+            scorer.calculate_scores(df)
+            assert scorer._pool is pool
+
+        assert scorer._pool is None
+
+    def test_more_jobs_than_rows(self):
+        """Test that tiny inputs use at most one shard per row."""
+        df = _parts(3)
+        expected = PartScorer(_config()).calculate_scores(df)
+
+        actual = ParallelScorer(_config(), n_jobs=8).calculate_scores(df)
+
+        np.testing.assert_array_equal(actual['priority_score'].values, expected['priority_score'].values)
+
+    def test_empty_dataframe(self):
+        """Test that an empty dataframe returns empty score columns."""
+        result = ParallelScorer(n_jobs=2).calculate_scores(_parts(0))
+
+        assert len(result) == 0
+        assert set(SCORE_COLUMNS) <= set(result.columns)
+
+    def test_invalid_arguments(self):
+        """Test that bad n_jobs and shard_by values are rejected."""
+        with pytest.raises(ValueError, match="n_jobs"):
+            ParallelScorer(n_jobs=0)
+        with pytest.raises(ValueError, match="not found for shard_by"):
+            ParallelScorer(n_jobs=2, shard_by='family').calculate_scores(_parts(10))
+        with pytest.raises(ValueError, match="Scorer not fitted"):
+            ParallelScorer(n_jobs=1).score(_parts(10))
+
+    def test_exits_after_jit_scoring(self):
+        """Test that a process running the numba loop and then worker processes exits cleanly."""
+        script = (
+            "import pandas as pd\n"
+            "from part_priority_scoring import ParallelScorer\n"
+            "from part_priority_scoring.config.settings import get_default_config\n"
+            "from part_priority_scoring.core import kernel\n"
+            "df = pd.DataFrame({'pn': [f'PART{i}' for i in range(200)], 'inventory': range(200),\n"
+            "                   'leadtime_weeks': 4, 'moq': 10, 'demand_all_time': range(200)})\n"
+            "config = get_default_config()\n"
+            "config['jit'] = True\n"
+            "kernel.boosted_scores(df, config['weights'], config['features'], jit=True)\n"
+            "ParallelScorer(config, n_jobs=2).calculate_scores(df)\n"
+        )
+        result = subprocess.run([sys.executable, '-c', script], cwd=Path(__file__).parent.parent,
+                                timeout=120, capture_output=True)
+
+        assert result.returncode == 0, result.stderr.decode()
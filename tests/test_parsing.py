@@ -0,0 +1,108 @@
+"""Tests for vectorized lead-time and demand JSON parsing."""
+
+import json
+
+import pytest
+import pandas as pd
+import numpy as np
+import pyarrow as pa
+from part_priority_scoring import PartScorer, parse_raw_columns
+from part_priority_scoring.core.parsing import parse_leadtime, parse_demand_totals
+
+
+def _parts(n, seed=3):
+    """Parsed scoring inputs of ``n`` parts, with lead times the raw strings can express."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'pn': [f'PART{i:04d}' for i in range(n)],
+        'inventory': np.where(rng.random(n) < 0.05, np.nan, rng.integers(0, 2000, n)),
+        'leadtime_weeks': rng.choice([0, 2, 6, 13, np.nan], n),
+        'moq': rng.integers(1, 200, n),
+        'demand_all_time': rng.integers(0, 1500, n),
+        'demand_index': rng.integers(0, 10, n).astype(float),
+        'source_type': rng.choice(['Authorized', 'Other', None], n),
+        'datasheet': rng.choice(['url', None], n)
+    })
+
+
+class TestParseLeadtime:
+
+    @pytest.mark.parametrize('raw, weeks', [
+        ('12 Weeks', 12), ('1 Week', 1), ('Factory Lead-Time 8 Weeks', 8), ('2 wks', 2),
+        ('10 Days', 2), ('1 day', 1), ('In Stock', 0), ('in-stock', 0), ('InStock', 0),
+        ('stock, 5 weeks', 5), ('Not in stock', np.nan), ('Call', np.nan), ('', np.nan), (None, np.nan)
+    ])
+    def test_formats(self, raw, weeks):
+        """Test that week, day and in-stock strings parse to weeks and anything else to NaN."""
+        actual = parse_leadtime(pd.Series(['3 Weeks', raw, None]))
+
+        np.testing.assert_array_equal(actual, [3, weeks, np.nan])
+
+    def test_input_types(self):
+        """Test that Arrow, dictionary-encoded and numeric inputs parse like a Series."""
+        raw = ['6 Weeks', None, 'In Stock', '6 Weeks']
+        expected = parse_leadtime(pd.Series(raw))
+
+        np.testing.assert_array_equal(parse_leadtime(pa.chunked_array([raw[:2], raw[2:]])), expected)
+        np.testing.assert_array_equal(parse_leadtime(pa.array(raw).dictionary_encode()), expected)
+        np.testing.assert_array_equal(parse_leadtime(pd.Series(raw, dtype='category')), expected)
+        np.testing.assert_array_equal(parse_leadtime(pd.Series([6, None, 0, 6])), expected)
+
+
+class TestParseDemandTotals:
+
+    @pytest.mark.parametrize('raw, value', [
+        ({'demand_totals': [{'demand_index': 3.5, 'period': '2024'}]}, 3.5),
+        ({'demand_totals': [{'demand_index': '4'}]}, 4.0),
+        ({'demand_totals': [{'demand_index': 1e-3}, {'demand_index': 5}]}, 1e-3),
+        ({'pn': 'X', 'demand_totals': [{'period': '2024', 'demand_index': 7}]}, 7.0),
+        ({'demand_totals': [{'period': '2024'}, {'demand_index': 5}]}, np.nan),
+        ({'demand_totals': [{'demand_index': None}]}, np.nan),
+        ({'demand_totals': [{'demand_index': True}]}, np.nan),
+        ({'demand_totals': [{'demand_index': 'n/a'}]}, np.nan),
+        ({'demand_totals': []}, np.nan)
+    ])
+    def test_matches_json_extract_scalar(self, raw, value):
+        """Test that the first entry's demand_index is read like SAFE_CAST(JSON_EXTRACT_SCALAR(...))."""
+        compact = json.dumps(raw, separators=(',', ':'))
+        spaced = json.dumps(raw, indent=2)
+
+        actual = parse_demand_totals(pd.Series([compact, spaced, None, 'not json']))
+
+        np.testing.assert_array_equal(actual, [value, value, np.nan, np.nan])
+
+    def test_other_field(self):
+        """Test that another field of the first entry can be read."""
+        raw = pd.Series(['{"demand_totals": [{"demand_index": 2, "demand_all_time": 150}]}'])
+
+        np.testing.assert_array_equal(parse_demand_totals(raw, field='demand_all_time'), [150.0])
+
+
+class TestParseRawColumns:
+
+    def test_export_scores_like_parsed_columns(self):
+        """Test that a raw export scores the same as the columns the SQL would have derived."""
+        parts = _parts(500)
+        raw = parts.drop(columns=['leadtime_weeks', 'demand_index']).assign(
+            leadtime=[None if np.isnan(w) else 'In Stock' if w == 0 else f'{w:.0f} Weeks'
+                      for w in parts['leadtime_weeks']],
+            demand_totals=[json.dumps({'demand_totals': [{'demand_index': d}]}) for d in parts['demand_index']]
+        )
+
+        parsed = parse_raw_columns(raw)
+
+        np.testing.assert_array_equal(parsed['leadtime_weeks'], parts['leadtime_weeks'])
+        np.testing.assert_array_equal(parsed['demand_index'], parts['demand_index'])
+        pd.testing.assert_frame_equal(PartScorer().calculate_scores(parsed)[['pn', 'priority_score']],
+                                      PartScorer().calculate_scores(parts)[['pn', 'priority_score']])
+
+    def test_keeps_existing_columns(self):
+        """Test that parsed columns already present are not overwritten and missing demand becomes 0."""
+        df = pd.DataFrame({'leadtime': ['4 Weeks', None], 'leadtime_weeks': [9.0, 1.0],
+                           'demand_totals': [None, '{"demand_totals": [{"demand_index": 2}]}']})
+
+        parsed = parse_raw_columns(df)
+
+        assert list(parsed['leadtime_weeks']) == [9.0, 1.0]
+        assert list(parsed['demand_index']) == [0.0, 2.0]
+        assert 'demand_index' not in df.columns
@@ -0,0 +1,127 @@
+"""Tests for the on-disk query result cache."""
+
+import os
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+import pandas as pd
+import numpy as np
+import pyarrow as pa
+from part_priority_scoring import DataLoader
+from part_priority_scoring.core.query_cache import QueryCache, normalize_sql, query_key
+
+
+def _parts(n, seed=0):
+    """Rows shaped like a sample query result."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'pn': [f'PART{i:05d}' for i in range(n)],
+        'inventory': rng.integers(0, 2000, n),
+        'moq': rng.integers(1, 200, n).astype(float),
+        'demand_all_time': rng.integers(0, 1500, n),
+        'source_type': rng.choice(['Authorized', 'Other', None], n)
+    })
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return QueryCache(tmp_path / 'queries')
+
+
+class TestQueryKey:
+
+    def test_formatting_and_comments_are_ignored(self):
+        """Test that whitespace and comments do not change the key but literals and params do."""
+        query = "SELECT pn  -- part number\nFROM t\n  WHERE  x = 'a  b' /* note */ LIMIT 10"
+
+        assert normalize_sql(query) == "SELECT pn FROM t WHERE x = 'a  b' LIMIT 10"
+        assert query_key(query) == query_key("SELECT pn FROM t WHERE x = 'a  b' LIMIT 10")
+        assert query_key(query) != query_key(query.replace("'a  b'", "'a b'"))
+        assert query_key(query) != query_key(query.replace('10', '20'))
+        assert query_key(query, {'project_id': 'a'}) != query_key(query, {'project_id': 'b'})
+
+    def test_comment_markers_in_literals_are_kept(self):
+        """Test that comment markers inside strings are part of the query."""
+        assert normalize_sql("SELECT '--x',  r'#y'") == "SELECT '--x', r'#y'"
+
+
+class TestQueryCache:
+
+    def test_round_trip(self, cache):
+        """Test that a stored result comes back equal and counts as a hit."""
+        table = pa.Table.from_pandas(_parts(100), preserve_index=False)
+
+        assert cache.get('SELECT 1') is None
+        cache.put('SELECT 1', table)
+
+        assert cache.get('SELECT  1 -- again').equals(table)
+        assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+    def test_expired_entry_is_removed(self, tmp_path):
+        """Test that entries older than the ttl miss and are deleted."""
+        cache = QueryCache(tmp_path, ttl=60)
+        cache.put('SELECT 1', pa.Table.from_pandas(_parts(10), preserve_index=False))
+        path, = tmp_path.glob('*.arrow')
+        os.utime(path, (time.time(), time.time() - 120))
+
+        assert cache.get('SELECT 1') is None
+        assert not path.exists()
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path):
+        """Test that the cache stays below max_bytes, keeping recently read entries."""
+        table = pa.Table.from_pandas(_parts(1000), preserve_index=False)
+        cache = QueryCache(tmp_path)
+        cache.put('SELECT 1', table)
+        cache.max_bytes = int(cache.size() * 2.5)
+        cache.put('SELECT 2', table)
+        for path in tmp_path.glob('*.arrow'):
+            os.utime(path, (time.time() - 100, time.time() - 100))
+        cache.get('SELECT 1')
+
+        cache.put('SELECT 3', table)
+
+        assert cache.get('SELECT 1') is not None
+        assert cache.get('SELECT 2') is None
+        assert cache.get('SELECT 3') is not None
+        assert cache.size() <= cache.max_bytes
+
+
+class TestDataLoaderCache:
+
+    @patch('part_priority_scoring.core.data_loader.bigquery.Client')
+    def test_second_load_skips_query(self, mock_client_class, tmp_path):
+        """Test that a repeated load is served from the cache, and refresh re-runs the query."""
+        parts = _parts(200)
+        mock_client = Mock()
+        mock_client.query.return_value.to_arrow.return_value = pa.Table.from_pandas(parts, preserve_index=False)
+        mock_client_class.return_value = mock_client
+        loader = DataLoader(project_id='test-project', cache=tmp_path)
+
+        first = loader.load_sample_data(limit=200)
+        second = loader.load_sample_data(limit=200)
+        table = loader.load_sample_data(limit=200, as_arrow=True)
+
+        assert mock_client.query.call_count == 1
+        pd.testing.assert_frame_equal(first, parts)
+        pd.testing.assert_frame_equal(second, parts)
+        assert isinstance(table, pa.Table)
+
+        loader.load_sample_data(limit=200, refresh=True)
+        loader.load_sample_data(limit=300)
+        assert mock_client.query.call_count == 3
+
+    @patch('part_priority_scoring.core.data_loader.bigquery.Client')
+    def test_cache_is_shared_across_loaders(self, mock_client_class, tmp_path):
+        """Test that a loader without a client reads an extract cached by another."""
+        parts = _parts(50)
+        mock_client_class.return_value.query.return_value.to_arrow.return_value = \
+            pa.Table.from_pandas(parts, preserve_index=False)
+        DataLoader(project_id='test-project', cache=tmp_path).load_sample_data(limit=50)
+
+        loader = DataLoader(cache=QueryCache(tmp_path))
+        loader.project_id = 'test-project'
+
+        pd.testing.assert_frame_equal(loader.load_sample_data(limit=50), parts)
+        with pytest.raises(ValueError, match="BigQuery client not initialized"):
+            DataLoader(cache=tmp_path).load_sample_data(limit=50)
@@ -0,0 +1,153 @@
+"""Tests for the chunked result writer."""
+
+import re
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+import pandas as pd
+import numpy as np
+import pyarrow.parquet as pq
+from google.cloud.exceptions import NotFound
+from part_priority_scoring import DataLoader, PartScorer
+from part_priority_scoring.config.settings import get_default_config
+from part_priority_scoring.core.result_writer import (ResultWriter, LocalSink, PART_SCORES_SCHEMA,
+                                                      results_table)
+
+SQL_DIR = Path(__file__).parent.parent / 'sql'
+
+
+def _parts(n, seed=0, missing=0.0):
+    """Parts with the scoring inputs part_scores keeps, ``missing`` of inventory NaN."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'pn': [f'PART{i:05d}' for i in range(n)],
+        'category': rng.choice(['ic', 'passive', 'connector', None], n),
+        'inventory': np.where(rng.random(n) < missing, np.nan, rng.integers(0, 2000, n)),
+        'leadtime_weeks': rng.integers(0, 20, n),
+        'moq': rng.integers(1, 200, n),
+        'demand_all_time': rng.integers(0, 1500, n),
+        'source_type': rng.choice(['Authorized', 'Other', None], n),
+        'datasheet': rng.choice(['url', None], n)
+    })
+
+
+@pytest.fixture
+def scored():
+    config = get_default_config()
+    config['engine'] = 'numpy'
+    return PartScorer(config).calculate_scores(_parts(2500, missing=0.05))
+
+
+class FailingSink(LocalSink):
+
+    def upload(self, part, data):
+        if part == 1:
+            raise IOError("upload failed")
+        super().upload(part, data)
+
+
+class TestResultWriter:
+
+    def test_schema_matches_create_table(self):
+        """Test that the projected columns are those of part_scores in create_output_table.sql."""
+        sql = (SQL_DIR / 'create_output_table.sql').read_text()
+        body = re.search(r'part_scores` \((.*?)\n\)', sql, re.DOTALL).group(1)
+        columns = [line.split()[0] for line in body.strip().splitlines()]
+
+        assert PART_SCORES_SCHEMA.names == columns
+
+    def test_chunks_round_trip(self, tmp_path, scored):
+        """Test that chunked output equals the projected frame plus constant metadata."""
+        before = scored.copy()
+        processed_at = pd.Timestamp('2024-05-01 12:00', tz='UTC')
+
+        rows = ResultWriter(LocalSink(tmp_path / 'out'), chunk_rows=1000, row_group_rows=256).write(
+            scored, {'processed_at': processed_at, 'batch_id': 'b1', 'pipeline_version': '1.0.0'},
+            PART_SCORES_SCHEMA)
+
+        assert rows == 2500
+        assert len(list((tmp_path / 'out').glob('part-*.parquet'))) == 3
+        assert pq.ParquetFile(tmp_path / 'out' / 'part-00000.parquet').metadata.num_row_groups == 4
+        actual = pq.read_table(tmp_path / 'out').to_pandas()
+        assert list(actual.columns) == PART_SCORES_SCHEMA.names
+        pd.testing.assert_series_equal(actual['priority_score'], scored['priority_score'].reset_index(drop=True))
+        np.testing.assert_array_equal(actual['inventory'].isna(), scored['inventory'].isna())
+        assert (actual['processed_at'] == processed_at).all()
+        assert (actual['batch_id'] == 'b1').all()
+        assert actual['desc'].isna().all()
+        assert 'boosted_score' not in actual.columns
+        pd.testing.assert_frame_equal(scored, before)
+
+    def test_without_schema_keeps_all_columns(self, scored):
+        """Test that without a schema every column is kept and metadata is appended."""
+        table = results_table(scored.head(10), {'pipeline_version': '1.0.0'})
+
+        assert table.column_names == list(scored.columns) + ['pipeline_version']
+
+    def test_failed_upload_keeps_previous_result(self, tmp_path, scored):
+        """Test that a failing chunk aborts the write and leaves the committed output in place."""
+        ResultWriter(LocalSink(tmp_path / 'out')).write(scored.head(100), schema=PART_SCORES_SCHEMA)
+
+        with pytest.raises(IOError, match="upload failed"):
+            ResultWriter(FailingSink(tmp_path / 'out'), chunk_rows=500).write(scored, schema=PART_SCORES_SCHEMA)
+
+        assert pq.read_table(tmp_path / 'out').num_rows == 100
+        assert [p.name for p in tmp_path.iterdir()] == ['out']
+
+    def test_empty_frame(self, tmp_path, scored):
+        """Test that an empty frame writes an empty table with the schema."""
+        ResultWriter(LocalSink(tmp_path / 'out')).write(scored.head(0), schema=PART_SCORES_SCHEMA)
+
+        table = pq.read_table(tmp_path / 'out')
+        assert table.num_rows == 0
+        assert table.schema.names == PART_SCORES_SCHEMA.names
+
+
+class TestSaveResults:
+
+    @patch('part_priority_scoring.core.data_loader.bigquery.Client')
+    def test_loads_chunks_into_staging_then_copies(self, mock_client_class, scored):
+        """Test that chunks are loaded into a staging table that is copied over part_scores."""
+        mock_client = Mock()
+        mock_client.get_table.side_effect = NotFound('part_scores')
+        mock_client_class.return_value = mock_client
+
+        DataLoader(project_id='test-project').save_results(scored, chunk_rows=1000, batch_id='b1')
+
+        staging = mock_client.create_table.call_args[0][0]
+        assert staging.table_id.startswith('part_scores_staging_')
+        assert [f.name for f in staging.schema] == PART_SCORES_SCHEMA.names
+        assert mock_client.load_table_from_file.call_count == 3
+        for call in mock_client.load_table_from_file.call_args_list:
+            assert call.args[1] == f'datadojo.part_priority_scoring.{staging.table_id}'
+            assert pq.read_table(call.args[0]).column('batch_id').unique().to_pylist() == ['b1']
+        source, destination = mock_client.copy_table.call_args.args
+        assert destination == 'datadojo.part_priority_scoring.part_scores'
+        assert mock_client.copy_table.call_args.kwargs['job_config'].write_disposition == 'WRITE_TRUNCATE'
+        mock_client.delete_table.assert_called_once_with(source, not_found_ok=True)
+
+    def test_local_sink_without_client(self, tmp_path, scored):
+        """Test that results can be saved to a local sink without BigQuery."""
+        DataLoader().save_results(scored, sink=LocalSink(tmp_path / 'part_scores'))
+
+        table = pq.read_table(tmp_path / 'part_scores')
+        assert table.num_rows == len(scored)
+        assert table.column('pipeline_version').unique().to_pylist() == ['1.0.0']
+        assert len(table.column('batch_id').unique()) == 1
+        assert table.column('batch_id').null_count == 0
+
+    @pytest.mark.parametrize('inplace', [False, True])
+    def test_default_engine_round_trip(self, tmp_path, inplace):
+        """Test that pandas engine output saves with its raw integer inputs."""
+        df = _parts(500)
+        config = get_default_config()
+        config['inplace'] = inplace
+        scored = PartScorer(config).calculate_scores(df.copy())
+
+        DataLoader().save_results(scored, sink=LocalSink(tmp_path / 'part_scores'))
+
+        actual = pq.read_table(tmp_path / 'part_scores').to_pandas().set_index('pn')
+        expected = df.set_index('pn').loc[actual.index]
+        np.testing.assert_array_equal(actual['demand_all_time'], expected['demand_all_time'])
+        np.testing.assert_array_equal(actual['inventory'], expected['inventory'])
@@ -0,0 +1,112 @@
+"""Tests for the sketch-based robust scaler."""
+
+import pickle
+
+import pytest
+import pandas as pd
+import numpy as np
+from part_priority_scoring import FeatureEngineer
+from part_priority_scoring.core.scaler import SketchScaler
+
+
+@pytest.fixture
+def columns():
+    rng = np.random.default_rng(4)
+    return pd.DataFrame({
+        'log_inventory': np.log1p(rng.integers(0, 5000, 60000)).astype(float),
+        'demand_all_time': np.where(rng.random(60000) < 0.05, np.nan, rng.lognormal(3, 1.5, 60000)),
+        'flat': np.zeros(60000)
+    })
+
+
+def _parts(n, seed=0):
+    """Scoring inputs of ``n`` random parts."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'inventory': rng.integers(0, 2000, n),
+        'leadtime_weeks': rng.integers(0, 20, n),
+        'moq': rng.integers(1, 200, n),
+        'demand_all_time': rng.integers(0, 1500, n),
+        'source_type': rng.choice(['Authorized', 'Other', None], n),
+        'datasheet': rng.choice(['url', None], n)
+    })
+
+
+def _rank(values, value):
+    return (np.asarray(values) < value).mean()
+
+
+def _chunks(df, n):
+    return [df.iloc[positions] for positions in np.array_split(np.arange(len(df)), n)]
+
+
+class TestSketchScaler:
+
+    def test_exact_matches_robust_scaler(self, columns):
+        """Test that without an error bound the statistics equal sklearn's RobustScaler."""
+        preprocessing = pytest.importorskip('sklearn.preprocessing')
+        expected = preprocessing.RobustScaler().fit(columns.fillna(0))
+
+        stats = SketchScaler().update(columns).stats()
+
+        assert [stats[col][0] for col in columns] == list(expected.center_)
+        assert [stats[col][1] for col in columns] == list(expected.scale_)
+        assert stats['flat'] == (0.0, 1.0)
+
+    def test_chunks_and_merge_match_one_update(self, columns):
+        """Test that chunk updates and scalers merged after pickling equal a single update."""
+        expected = SketchScaler().update(columns).stats()
+
+        chunked = SketchScaler()
+        for chunk in _chunks(columns, 7):
+            chunked.update(chunk)
+        # Worker processes send their scalers back pickled
+        shards = [pickle.loads(pickle.dumps(SketchScaler().update(shard)))
+                  for shard in _chunks(columns, 3)]
+        merged = shards[0].merge(shards[1]).merge(shards[2])
+
+        assert chunked.stats() == expected
+        assert merged.stats() == expected
+
+    @pytest.mark.parametrize('error', [0.01, 0.002])
+    def test_error_bound(self, columns, error):
+        """Test that compacted medians and quartiles stay within the rank error bound."""
+        scaler = SketchScaler(error=error)
+        for chunk in _chunks(columns, 12):
+            scaler.update(chunk)
+
+        values = columns['demand_all_time'].fillna(0).to_numpy()
+        center, scale = scaler.stats()['demand_all_time']
+        q25, q75 = scaler.sketches['demand_all_time'].quantiles([0.25, 0.75])
+
+        assert not scaler.sketches['demand_all_time'].is_exact
+        assert scaler.error <= error
+        assert abs(_rank(values, center) - 0.5) <= error
+        assert abs(_rank(values, q25) - 0.25) <= error
+        assert abs(_rank(values, q75) - 0.75) <= error
+        assert scale == pytest.approx(q75 - q25)
+
+    def test_merge_requires_same_size(self):
+        """Test that scalers with different sketch sizes are not merged."""
+        with pytest.raises(ValueError, match='sketch sizes'):
+            SketchScaler(k=64).merge(SketchScaler(k=128))
+
+    @pytest.mark.parametrize('kwargs', [{'error': 0.0}, {'error': 1.5}, {'error': 0.01, 'k': 64}])
+    def test_invalid_arguments(self, kwargs):
+        """Test that error bounds outside (0, 1) and conflicting arguments are rejected."""
+        with pytest.raises(ValueError):
+            SketchScaler(**kwargs)
+
+
+class TestFeatureEngineerScaling:
+
+    def test_scaling_error_config(self):
+        """Test that a scaling_error bound gives approximate state close to the exact fit."""
+        parts = _parts(50000)
+        exact = FeatureEngineer().fit(parts).state
+
+        approximate = FeatureEngineer({'scaling_error': 0.005}).fit(parts).state
+
+        assert approximate.centers.keys() == exact.centers.keys()
+        assert approximate.centers['demand_score'] == pytest.approx(exact.centers['demand_score'], rel=0.05)
+        assert approximate.scales['demand_score'] == pytest.approx(exact.scales['demand_score'], rel=0.05)
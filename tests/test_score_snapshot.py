@@ -0,0 +1,149 @@
+"""Tests for change-only merge writes."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+import pandas as pd
+import numpy as np
+import pyarrow.parquet as pq
+from google.cloud import bigquery
+from google.cloud.exceptions import NotFound
+from part_priority_scoring import DataLoader, PartScorer
+from part_priority_scoring.config.settings import get_default_config
+from part_priority_scoring.core.result_writer import LocalSink
+from part_priority_scoring.core.score_snapshot import ScoreSnapshot
+
+
+@pytest.fixture
+def scored():
+    """Scores of 1000 parts with unique part numbers, in input order."""
+    rng = np.random.default_rng(0)
+    n = 1000
+    parts = pd.DataFrame({
+        'pn': [f'PART{i:05d}' for i in range(n)],
+        'inventory': rng.integers(0, 2000, n),
+        'leadtime_weeks': rng.integers(0, 20, n),
+        'moq': rng.integers(1, 200, n),
+        'demand_all_time': rng.integers(0, 1500, n),
+        'source_type': rng.choice(['Authorized', 'Other', None], n),
+        'datasheet': rng.choice(['url', None], n)
+    })
+    config = get_default_config()
+    config['engine'] = 'numpy'
+    return PartScorer(config).calculate_scores(parts).sort_index()
+
+
+def _updated(scored):
+    """Score set with 30 changed parts, 10 new parts and 5 parts dropped."""
+    updated = scored.iloc[5:].copy()
+    updated.loc[updated.index[:30], 'priority_score'] += 1.0
+    new = scored.iloc[:10].assign(pn=[f'NEW{i}' for i in range(10)])
+    return pd.concat([updated, new], ignore_index=True)
+
+
+class TestScoreSnapshot:
+
+    def test_diff_flags_new_and_changed_rows(self, tmp_path, scored):
+        """Test that only new parts and parts with changed columns are flagged after a write."""
+        snapshot = ScoreSnapshot(tmp_path / 'snapshot.parquet')
+        columns = ['pn', 'inventory', 'priority_score']
+
+        changed, keys = snapshot.diff(scored, columns)
+        assert changed.all()
+        snapshot.replace(scored['pn'], keys)
+
+        updated = _updated(scored)
+        changed, keys = snapshot.diff(updated, columns)
+        assert changed.sum() == 40
+        assert set(updated['pn'][changed]) == set(updated['pn'][:30]) | {f'NEW{i}' for i in range(10)}
+
+        snapshot.update(updated['pn'][changed], keys[changed])
+        assert not snapshot.diff(updated, columns)[0].any()
+        assert len(snapshot.hashes()) == 1010
+
+    def test_unwritten_columns_are_ignored(self, tmp_path, scored):
+        """Test that columns that are not written do not count as changes."""
+        snapshot = ScoreSnapshot(tmp_path / 'snapshot.parquet')
+        snapshot.replace(scored['pn'], snapshot.diff(scored, ['pn', 'priority_score'])[1])
+
+        changed, _ = snapshot.diff(scored.assign(boosted_score=0.0), ['pn', 'priority_score'])
+
+        assert not changed.any()
+
+
+class TestMergeWrites:
+
+    def test_merge_writes_only_changes(self, tmp_path, scored):
+        """Test that a merge write uploads only changed rows with one batch_id and updates the snapshot."""
+        loader = DataLoader()
+        snapshot = tmp_path / 'snapshot.parquet'
+        sink = LocalSink(tmp_path / 'part_scores', merge_key='pn')
+        assert loader.save_results(scored, sink=sink, snapshot=snapshot, batch_id='day1') == 1000
+
+        updated = _updated(scored)
+        written = loader.save_results(updated, sink=sink, mode='merge', snapshot=snapshot, batch_id='day2')
+
+        assert written == 40
+        actual = pq.read_table(tmp_path / 'part_scores').to_pandas().set_index('pn')
+        assert len(actual) == 1010
+        assert (actual['batch_id'] == 'day2').sum() == 40
+        expected = pd.concat([scored.iloc[:5], updated]).set_index('pn')
+        pd.testing.assert_series_equal(actual['priority_score'].sort_index(),
+                                       expected['priority_score'].sort_index())
+        assert loader.save_results(updated, sink=sink, mode='merge', snapshot=snapshot) == 0
+        assert pq.read_table(tmp_path / 'part_scores').num_rows == 1010
+
+    def test_merge_rejects_replacing_sink(self, tmp_path, scored):
+        """Test that merge mode refuses a sink that would replace the output with the changed rows."""
+        with pytest.raises(ValueError, match="merges on pn"):
+            DataLoader().save_results(scored, sink=LocalSink(tmp_path / 'out'), mode='merge',
+                                      snapshot=tmp_path / 'snapshot.parquet')
+
+        assert not (tmp_path / 'out').exists()
+
+    def test_merge_needs_snapshot(self, scored):
+        """Test that merge mode without a snapshot and unknown modes raise."""
+        with pytest.raises(ValueError, match="snapshot"):
+            DataLoader().save_results(scored, sink=LocalSink('unused', merge_key='pn'), mode='merge')
+        with pytest.raises(ValueError, match="Unknown write mode"):
+            DataLoader().save_results(scored, sink=LocalSink('unused'), mode='append')
+
+    def test_duplicate_pns_are_rejected(self, tmp_path, scored):
+        """Test that a score set with repeated pns is rejected before anything is written."""
+        snapshot = ScoreSnapshot(tmp_path / 'snapshot.parquet')
+        duplicated = pd.concat([scored, scored.iloc[:3]])
+
+        for mode in ('truncate', 'merge'):
+            with pytest.raises(ValueError, match="unique pn"):
+                DataLoader().save_results(duplicated, sink=LocalSink(tmp_path / 'out', merge_key='pn'),
+                                          mode=mode, snapshot=snapshot)
+
+        assert not (tmp_path / 'out').exists()
+        assert not snapshot.path.exists()
+
+    @patch('part_priority_scoring.core.data_loader.bigquery.Client')
+    def test_merge_statement(self, mock_client_class, tmp_path, scored):
+        """Test that staged changes are merged into an existing table on pn and copied into a new one."""
+        mock_client = Mock()
+        mock_client_class.return_value = mock_client
+        loader = DataLoader(project_id='test-project')
+        snapshot = ScoreSnapshot(tmp_path / 'snapshot.parquet')
+
+        mock_client.get_table.side_effect = NotFound('part_scores')
+        loader.save_results(scored, mode='merge', snapshot=snapshot)
+        assert mock_client.copy_table.call_count == 1
+        mock_client.query.assert_not_called()
+
+        mock_client.get_table.side_effect = None
+        mock_client.get_table.return_value = bigquery.Table('datadojo.part_priority_scoring.part_scores')
+        loader.save_results(_updated(scored), mode='merge', snapshot=snapshot)
+
+        staging = mock_client.create_table.call_args[0][0]
+        query = mock_client.query.call_args[0][0]
+        assert 'MERGE `datadojo.part_priority_scoring.part_scores` T' in query
+        assert f'USING `datadojo.part_priority_scoring.{staging.table_id}` S' in query
+        assert 'ON T.`pn` = S.`pn`' in query
+        assert '`batch_id` = S.`batch_id`' in query and '`pn` = S.`pn`,' not in query
+        assert mock_client.copy_table.call_count == 1
+        mock_client.delete_table.assert_called_with(
+            f'datadojo.part_priority_scoring.{staging.table_id}', not_found_ok=True)
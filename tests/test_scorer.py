@@ -3,7 +3,7 @@
 import pytest
 import pandas as pd
 import numpy as np
-from part_priority_scoring import PartScorer, score_parts
+from part_priority_scoring import PartScorer, FeatureEngineer, score_parts
 
 class TestPartScorer:
     
@@ -62,8 +62,7 @@ class TestPartScorer:
     
     def test_feature_engineering(self, sample_data):
         """Test that features are properly engineered"""
-        scorer = PartScorer()
-        scored_df = scorer.calculate_scores(sample_data)
+        features_df = FeatureEngineer().transform(sample_data)
         
         # Check that engineered features exist (PRICING FEATURES REMOVED)
         expected_features = [
@@ -74,7 +73,17 @@ class TestPartScorer:
         ]
         
         for feature in expected_features:
+            assert feature in features_df.columns, f"Missing feature: {feature}"
+    
+    def test_scorer_builds_only_used_features(self, sample_data):
+        """Test that the scorer skips features no weight or boost rule reads."""
+        scored_df = PartScorer().calculate_scores(sample_data)
+        
+        for feature in ['inv_leadtime_weeks', 'inv_moq', 'is_authorized', 'availability_score', 'demand_score',
+                        'in_stock', 'immediate_availability']:
             assert feature in scored_df.columns, f"Missing feature: {feature}"
+        for feature in ['log_inventory', 'log_moq', 'has_datasheet']:
+            assert feature not in scored_df.columns, f"Unused feature built: {feature}"
     
     def test_boost_application(self, sample_data):
         """Test that business boosts are applied."""
@@ -127,4 +136,168 @@ class TestPartScorer:
         # Check that pricing features are not in engineered features
         engineered_pricing_features = [col for col in scored_df.columns 
                                      if col.startswith(('log_', 'inv_')) and 'price' in col.lower()]
-        assert len(engineered_pricing_features) == 0, f"Found engineered pricing features: {engineered_pricing_features}"
\ No newline at end of file
+        assert len(engineered_pricing_features) == 0, f"Found engineered pricing features: {engineered_pricing_features}"
+
+class TestTopKScoring:
+    
+    @pytest.fixture
+    def category_data(self):
+        """Parts spread over several categories."""
+        rng = np.random.default_rng(11)
+        n = 600
+        return pd.DataFrame({
+            'pn': [f'PART{i:04d}' for i in range(n)],
+            'inventory': rng.integers(0, 1000, n),
+            'leadtime_weeks': rng.integers(0, 20, n),
+            'moq': rng.integers(1, 100, n),
+            'demand_all_time': rng.integers(0, 1000, n),
+            'source_type': rng.choice(['Authorized', 'Other'], n),
+            'category': rng.choice(['IC', 'Connector', 'Resistor', None], n)
+        })
+    
+    @pytest.mark.parametrize('engine', ['pandas', 'numpy'])
+    def test_top_k_matches_full_scoring(self, category_data, engine):
+        """Test that top-k returns the head of the full ranking with the same percentiles."""
+        scorer = PartScorer({**PartScorer().config, 'engine': engine})
+        full = scorer.calculate_scores(category_data)
+        top = scorer.calculate_scores(category_data, top_k=25)
+        
+        assert len(top) == 25
+        assert top['priority_score'].is_monotonic_decreasing
+        np.testing.assert_array_equal(top['priority_score'].values, full['priority_score'].values[:25])
+        np.testing.assert_array_equal(top['score_percentile'].values,
+                                      full.loc[top.index, 'score_percentile'].values)
+    
+    @pytest.mark.parametrize('engine', ['pandas', 'numpy'])
+    def test_top_k_per_category(self, category_data, engine):
+        """Test that top-k per category keeps k parts from every category."""
+        scorer = PartScorer({**PartScorer().config, 'engine': engine})
+        full = scorer.calculate_scores(category_data)
+        top = scorer.calculate_scores(category_data, top_k=5, top_k_by='category', rank_all=True)
+        
+        counts = top['category'].value_counts(dropna=False)
+        assert len(counts) == 4
+        assert (counts == 5).all()
+        
+        expected = full.groupby('category', dropna=False)['priority_score'].nlargest(5)
+        assert sorted(top['priority_score']) == sorted(expected)
+        np.testing.assert_array_equal(top['score_percentile'].values,
+                                      full.loc[top.index, 'score_percentile'].values)
+    
+    def test_invalid_top_k(self, category_data):
+        """Test that invalid top-k options are rejected."""
+        scorer = PartScorer()
+        
+        with pytest.raises(ValueError, match="top_k must be a positive integer"):
+            scorer.calculate_scores(category_data, top_k=0)
+        with pytest.raises(ValueError, match="not found for top_k_by"):
+            scorer.calculate_scores(category_data, top_k=5, top_k_by='family')
+
+
+class TestStrategyScoring:
+    
+    @pytest.fixture
+    def strategy_data(self):
+        """Parts for comparing weight strategies."""
+        rng = np.random.default_rng(5)
+        n = 300
+        return pd.DataFrame({
+            'pn': [f'PART{i:04d}' for i in range(n)],
+            'inventory': rng.integers(0, 1000, n),
+            'leadtime_weeks': rng.integers(0, 20, n),
+            'moq': rng.integers(1, 100, n),
+            'demand_all_time': rng.integers(0, 1000, n),
+            'source_type': rng.choice(['Authorized', 'Other'], n)
+        })
+    
+    def test_matches_single_strategy_scoring(self, strategy_data):
+        """Test that each strategy column matches scoring with those weights alone."""
+        scorer = PartScorer()
+        wide = scorer.calculate_strategy_scores(strategy_data)
+        
+        assert list(wide.columns) == ['pn', 'balanced_score', 'demand_focused_score',
+                                      'availability_focused_score']
+        
+        for name, weights in scorer.config['weight_variants'].items():
+            single = PartScorer({**scorer.config, 'weights': weights}).calculate_scores(strategy_data)
+            np.testing.assert_allclose(wide[f'{name}_score'].values,
+                                       single.sort_index()['priority_score'].values, atol=0.011)
+    
+    def test_custom_strategies(self, strategy_data):
+        """Test strategies with different feature sets."""
+        strategies = {
+            'demand_only': {'demand_score': 1.0},
+            'stock_only': {'availability_score': 0.5, 'in_stock': 0.5}
+        }
+        wide = PartScorer().calculate_strategy_scores(strategy_data, strategies)
+        
+        assert wide['demand_only_score'].between(0, 100).all()
+        assert not np.array_equal(wide['demand_only_score'].values, wide['stock_only_score'].values)
+    
+    def test_empty_dataframe(self):
+        """Test that an empty frame yields empty strategy columns."""
+        wide = PartScorer().calculate_strategy_scores(pd.DataFrame({'pn': []}))
+        
+        assert len(wide) == 0
+        assert 'balanced_score' in wide.columns
+
+
+class TestScoreExplanation:
+    
+    @pytest.fixture
+    def explain_data(self):
+        """Parts including unavailable ones and every boost condition."""
+        rng = np.random.default_rng(31)
+        n = 300
+        return pd.DataFrame({
+            'pn': [f'PART{i:04d}' for i in range(n)],
+            'inventory': rng.choice([0, 5, 50, 5000], n),
+            'leadtime_weeks': rng.choice([0, 4, 16], n),
+            'moq': rng.integers(1, 100, n),
+            'demand_all_time': rng.integers(0, 1500, n),
+            'source_type': rng.choice(['Authorized', 'Other'], n)
+        }, index=pd.RangeIndex(1000, 1000 + n))
+    
+    @staticmethod
+    def _scorer(engine):
+        from part_priority_scoring.config.settings import get_default_config
+        config = get_default_config()
+        config['engine'] = engine
+        return PartScorer(config)
+    
+    @pytest.mark.parametrize('engine', ['pandas', 'numpy'])
+    def test_explanation_reconstructs_scores(self, explain_data, engine):
+        """Test that contributions and multipliers add back up to the scores."""
+        result, explanation = self._scorer(engine).calculate_scores(explain_data, explain=True)
+        
+        assert explanation.index.equals(result.index)
+        assert explanation.contributions.dtype == np.float32
+        assert explanation.features == list(self._scorer(engine).weights)
+        assert explanation.unavailable.any()
+        
+        base = np.where(explanation.unavailable, 0.0, explanation.contributions.sum(axis=1, dtype=np.float64))
+        np.testing.assert_allclose(base, result['base_score'].values, atol=1e-5)
+        boosted = result['base_score'].values * explanation.boost_multipliers.astype(np.float64).prod(axis=1)
+        np.testing.assert_allclose(boosted, result['boosted_score'].values, rtol=1e-6)
+    
+    def test_engines_agree(self, explain_data):
+        """Test that both engines explain rows identically."""
+        _, pandas_explanation = self._scorer('pandas').calculate_scores(explain_data, explain=True)
+        _, numpy_explanation = self._scorer('numpy').calculate_scores(explain_data, explain=True)
+        
+        pd.testing.assert_frame_equal(pandas_explanation.to_frame().sort_index(),
+                                      numpy_explanation.to_frame().sort_index())
+    
+    def test_explain_top_and_top_k(self, explain_data):
+        """Test that explanations follow the returned rows and can be truncated."""
+        scorer = self._scorer('numpy')
+        
+        result, explanation = scorer.calculate_scores(explain_data, top_k=20, explain=True, explain_top=5)
+        
+        assert len(result) == 20
+        assert list(explanation.index) == list(result.index[:5])
+        assert explanation.contributions.shape == (5, len(explanation.features))
+    
+    def test_without_explain_returns_frame(self, explain_data):
+        """Test that the default return value is unchanged."""
+        assert isinstance(PartScorer().calculate_scores(explain_data), pd.DataFrame)
@@ -0,0 +1,208 @@
+"""Tests for the local asyncio scoring server."""
+
+import json
+import asyncio
+import pytest
+import pandas as pd
+import numpy as np
+from part_priority_scoring import PartScorer
+from part_priority_scoring.config.settings import get_default_config
+from part_priority_scoring.server import ScoringServer, MicroBatcher
+
+
+@pytest.fixture
+def reference_data():
+    rng = np.random.default_rng(23)
+    n = 400
+    return pd.DataFrame({
+        'pn': [f'PART{i:04d}' for i in range(n)],
+        'inventory': rng.integers(0, 2000, n),
+        'leadtime_weeks': rng.integers(0, 20, n),
+        'moq': rng.integers(1, 200, n),
+        'demand_all_time': rng.integers(0, 1500, n),
+        'source_type': rng.choice(['Authorized', 'Other'], n),
+        'datasheet': rng.choice(['url', None], n)
+    })
+
+
+@pytest.fixture
+def scorer(reference_data):
+    config = get_default_config()
+    config['engine'] = 'numpy'
+    return PartScorer(config).fit(reference_data)
+
+
+async def _request(method, path, payload=None, port=None, unix_socket=None):
+    """Send one HTTP request and return the status and decoded JSON body."""
+    if unix_socket:
+        reader, writer = await asyncio.open_unix_connection(unix_socket)
+    else:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    body = json.dumps(payload).encode() if payload is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: local\r\nContent-Length: {len(body)}\r\n"
+                 f"Connection: close\r\n\r\n".encode() + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, content = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(content)
+
+
+def _records(df):
+    return json.loads(df.to_json(orient='records'))
+
+
+class TestScoringServer:
+
+    def test_concurrent_requests_are_batched(self, reference_data, scorer):
+        """Test that concurrent requests share batches and get their own scores back."""
+        expected = scorer.score(reference_data).set_index('pn')
+        records = _records(reference_data.iloc[:40])
+
+        async def run():
+            server = ScoringServer(scorer, max_batch_size=64, max_wait=0.05)
+            await server.start(port=0)
+            try:
+                responses = await asyncio.gather(*[
+                    _request('POST', '/score', {'records': [record]}, port=server.port)
+                    for record in records
+                ])
+                metrics = await _request('GET', '/metrics', port=server.port)
+            finally:
+                await server.stop()
+            return responses, metrics
+
+        responses, (status, metrics) = asyncio.run(run())
+
+        for record, (status_code, body) in zip(records, responses):
+            assert status_code == 200
+            score = body['scores'][0]
+            assert score['pn'] == record['pn']
+            assert score['priority_score'] == expected.loc[record['pn'], 'priority_score']
+            assert score['score_percentile'] == expected.loc[record['pn'], 'score_percentile']
+
+        assert status == 200
+        assert metrics['requests'] == 40
+        assert metrics['batches'] < 40
+        assert metrics['batch_size']['max'] > 1
+        assert metrics['latency_ms']['p99'] >= metrics['latency_ms']['p50'] > 0
+
+    def test_max_batch_size(self, reference_data, scorer):
+        """Test that no batch exceeds the configured size."""
+        records = _records(reference_data.iloc[:30])
+
+        async def run():
+            batcher = MicroBatcher(scorer, max_batch_size=4, max_wait=0.05)
+            batcher.start()
+            try:
+                results = await asyncio.gather(*[batcher.score([r]) for r in records])
+            finally:
+                await batcher.stop()
+            return results, batcher.metrics
+
+        results, metrics = asyncio.run(run())
+
+        assert [r[0]['pn'] for r in results] == [r['pn'] for r in records]
+        assert max(metrics.batch_sizes) == 4
+        assert sum(metrics.batch_sizes) == 30
+
+    def test_unix_socket(self, reference_data, scorer, tmp_path):
+        """Test that the server answers on a Unix socket."""
+        path = str(tmp_path / 'scoring.sock')
+        record = _records(reference_data.iloc[:1])[0]
+
+        async def run():
+            server = ScoringServer(scorer)
+            await server.start(unix_socket=path)
+            try:
+                return await _request('POST', '/score', record, unix_socket=path)
+            finally:
+                await server.stop()
+
+        status, body = asyncio.run(run())
+
+        assert status == 200
+        assert body['scores'][0]['pn'] == record['pn']
+
+    def test_bad_requests(self, scorer):
+        """Test that malformed bodies and unknown routes get error statuses."""
+        async def run():
+            server = ScoringServer(scorer)
+            await server.start(port=0)
+            try:
+                return [
+                    await _request('POST', '/score', [1, 2], port=server.port),
+                    await _request('GET', '/score', port=server.port),
+                    await _request('GET', '/missing', port=server.port),
+                ]
+            finally:
+                await server.stop()
+
+        statuses = [status for status, _ in asyncio.run(run())]
+
+        assert statuses == [400, 405, 404]
+
+    @pytest.mark.parametrize('length', ['abc', '-5'])
+    def test_malformed_content_length(self, scorer, length):
+        """Test that an unparseable Content-Length gets a 400 response."""
+        async def run():
+            server = ScoringServer(scorer)
+            await server.start(port=0)
+            try:
+                reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+                writer.write(f"POST /score HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode())
+                await writer.drain()
+                response = await reader.read()
+                writer.close()
+                return response
+            finally:
+                await server.stop()
+
+        head, _, content = asyncio.run(run()).partition(b'\r\n\r\n')
+
+        assert int(head.split()[1]) == 400
+        assert 'Content-Length' in json.loads(content)['error']
+
+    @pytest.mark.parametrize('line, status', [
+        ("POST /score?" + "x" * 70000 + " HTTP/1.1\r\n\r\n", 400),
+        ("POST /score HTTP/1.1\r\nX-Long: " + "x" * 70000 + "\r\n\r\n", 431),
+    ])
+    def test_oversized_lines(self, scorer, line, status):
+        """Test that a request or header line past the stream limit gets an error response."""
+        async def run():
+            server = ScoringServer(scorer)
+            await server.start(port=0)
+            try:
+                reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+                writer.write(line.encode())
+                await writer.drain()
+                response = await reader.read()
+                writer.close()
+                return response
+            finally:
+                await server.stop()
+
+        head, _, content = asyncio.run(run()).partition(b'\r\n\r\n')
+
+        assert int(head.split()[1]) == status
+        assert 'too long' in json.loads(content)['error']
+
+    def test_leaves_scorer_unchanged(self, scorer):
+        """Test that serving with reference percentiles does not change the caller's scorer."""
+        server = ScoringServer(scorer)
+
+        assert scorer.percentile == 'rank'
+        assert server.batcher.scorer.percentile == 'reference'
+        assert server.batcher.scorer.state is scorer.state
+
+    def test_requires_fitted_scorer(self):
+        """Test that the server needs frozen state."""
+        with pytest.raises(ValueError, match="Scorer not fitted"):
+            ScoringServer(PartScorer())
+
+    def test_requires_reference_histogram(self, scorer):
+        """Test that a state without a reference histogram is rejected."""
+        scorer.state.score_histogram = None
+
+        with pytest.raises(ValueError, match="score_histogram"):
+            ScoringServer(scorer)
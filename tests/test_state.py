@@ -0,0 +1,176 @@
+"""Tests for fit-once / score-many scaling state."""
+
+import pytest
+import pandas as pd
+import numpy as np
+from part_priority_scoring import PartScorer, FeatureEngineer, ScalingState
+from part_priority_scoring.config.settings import get_default_config
+
+
+def _scorer(engine):
+    config = get_default_config()
+    config['engine'] = engine
+    return PartScorer(config)
+
+
+class TestScalingState:
+
+    @pytest.fixture
+    def reference_data(self):
+        """Reference population of parts."""
+        rng = np.random.default_rng(7)
+        n = 500
+        return pd.DataFrame({
+            'pn': [f'PART{i:04d}' for i in range(n)],
+            'inventory': rng.integers(0, 2000, n),
+            'leadtime_weeks': rng.integers(0, 20, n),
+            'moq': rng.integers(1, 200, n),
+            'demand_all_time': rng.integers(0, 1500, n),
+            'source_type': rng.choice(['Authorized', 'Other'], n),
+            'datasheet': rng.choice(['url', None], n)
+        })
+
+    @pytest.mark.parametrize('engine', ['pandas', 'numpy'])
+    def test_score_reference_matches_calculate_scores(self, reference_data, engine):
+        """Test that scoring the reference population reproduces batch scoring."""
+        scorer = _scorer(engine).fit(reference_data)
+
+        expected = scorer.calculate_scores(reference_data).sort_index()
+        actual = scorer.score(reference_data).sort_index()
+
+        np.testing.assert_array_equal(actual['priority_score'].values, expected['priority_score'].values)
+
+    @pytest.mark.parametrize('engine', ['pandas', 'numpy'])
+    def test_small_batch_is_comparable(self, reference_data, engine):
+        """Test that a part's score does not depend on the rest of the batch."""
+        scorer = _scorer(engine).fit(reference_data)
+
+        full = scorer.score(reference_data).set_index('pn')
+        batch = scorer.score(reference_data.iloc[10:13]).set_index('pn')
+
+        for col in ['base_score', 'boosted_score', 'priority_score']:
+            np.testing.assert_array_equal(batch[col].values, full.loc[batch.index, col].values)
+
+    def test_new_parts_clipped_to_range(self, reference_data):
+        """Test that parts outside the reference range stay within 0-100."""
+        scorer = _scorer('pandas').fit(reference_data)
+        outlier = reference_data.iloc[:1].assign(pn='NEW', demand_all_time=10 ** 9)
+
+        scored = scorer.score(outlier)
+
+        assert scored['priority_score'].iloc[0] == 100.0
+
+    def test_score_without_fit(self, reference_data):
+        """Test that scoring without fitted state raises an error."""
+        with pytest.raises(ValueError, match="Scorer not fitted"):
+            PartScorer().score(reference_data)
+
+    def test_save_and_load(self, reference_data, tmp_path):
+        """Test that state round-trips through JSON."""
+        scorer = _scorer('pandas').fit(reference_data)
+        path = tmp_path / 'state.json'
+        scorer.state.save(path)
+
+        restored = PartScorer(scorer.config, state=ScalingState.load(path))
+
+        assert restored.state == scorer.state
+        pd.testing.assert_frame_equal(restored.score(reference_data), scorer.score(reference_data))
+
+    def test_feature_engineer_frozen_transform(self, reference_data):
+        """Test that a fitted FeatureEngineer reuses its medians and IQRs."""
+        engineer = FeatureEngineer().fit(reference_data)
+        batch = reference_data.iloc[:5]
+
+        frozen = engineer.transform(batch)
+        expected = (batch['demand_all_time'] - engineer.state.centers['demand_score']) \
+            / engineer.state.scales['demand_score']
+
+        np.testing.assert_allclose(frozen['demand_score'].values, expected.values)
+
+
+class TestPercentileModes:
+
+    @pytest.fixture
+    def reference_data(self):
+        """Reference population with many tied scores."""
+        rng = np.random.default_rng(11)
+        n = 400
+        return pd.DataFrame({
+            'pn': [f'PART{i:04d}' for i in range(n)],
+            'inventory': rng.integers(0, 50, n),
+            'leadtime_weeks': rng.integers(0, 5, n),
+            'moq': rng.integers(1, 10, n),
+            'demand_all_time': rng.integers(0, 30, n),
+            'source_type': rng.choice(['Authorized', 'Other'], n),
+            'datasheet': rng.choice(['url', None], n)
+        })
+
+    @staticmethod
+    def _scorer(engine, percentile):
+        config = get_default_config()
+        config['engine'] = engine
+        config['percentile'] = percentile
+        return PartScorer(config)
+
+    @pytest.mark.parametrize('engine', ['pandas', 'numpy'])
+    def test_histogram_matches_rank(self, reference_data, engine):
+        """Test that histogram percentiles equal rank percentiles exactly."""
+        ranked = self._scorer(engine, 'rank').calculate_scores(reference_data).sort_index()
+        counted = self._scorer(engine, 'histogram').calculate_scores(reference_data).sort_index()
+
+        np.testing.assert_allclose(counted['score_percentile'].values,
+                                   ranked['score_percentile'].values, rtol=1e-12)
+
+    @pytest.mark.parametrize('engine', ['pandas', 'numpy'])
+    def test_reference_on_reference_population(self, reference_data, engine):
+        """Test that reference percentiles of the fitted population equal its ranks."""
+        scorer = self._scorer(engine, 'reference').fit(reference_data)
+        ranked = self._scorer(engine, 'rank').calculate_scores(reference_data).sort_index()
+
+        scored = scorer.score(reference_data).sort_index()
+
+        np.testing.assert_allclose(scored['score_percentile'].values,
+                                   ranked['score_percentile'].values, rtol=1e-12)
+
+    def test_reference_percentile_independent_of_batch(self, reference_data):
+        """Test that a part's reference percentile does not depend on its batch."""
+        scorer = self._scorer('numpy', 'reference').fit(reference_data)
+
+        full = scorer.score(reference_data).set_index('pn')
+        batch = scorer.score(reference_data.iloc[5:8]).set_index('pn')
+
+        np.testing.assert_array_equal(batch['score_percentile'].values,
+                                      full.loc[batch.index, 'score_percentile'].values)
+
+    def test_reference_top_k(self, reference_data):
+        """Test that top-k rows keep their reference percentiles."""
+        scorer = self._scorer('numpy', 'reference').fit(reference_data)
+
+        full = scorer.score(reference_data).set_index('pn')
+        top = scorer.score(reference_data, top_k=10).set_index('pn')
+
+        np.testing.assert_array_equal(top['score_percentile'].values,
+                                      full.loc[top.index, 'score_percentile'].values)
+
+    @pytest.mark.parametrize('engine', ['pandas', 'numpy', 'arrow'])
+    @pytest.mark.parametrize('percentile', ['histogram', 'reference'])
+    def test_unnormalized_scores_are_ranked(self, reference_data, engine, percentile):
+        """Test that grid percentile modes rank unnormalized scores exactly."""
+        scorer = self._scorer(engine, percentile).fit(reference_data)
+        full = scorer.score(reference_data, normalize=False)
+        expected = full['priority_score'].rank(pct=True) * 100
+
+        for scored in (full, scorer.calculate_scores(reference_data, normalize=False),
+                       scorer.score(reference_data, normalize=False, top_k=20, rank_all=True)):
+            np.testing.assert_allclose(scored['score_percentile'].values,
+                                       expected.loc[scored.index].values, rtol=1e-12)
+
+    def test_reference_without_fit(self, reference_data):
+        """Test that reference mode needs a fitted histogram."""
+        with pytest.raises(ValueError, match="Call fit"):
+            self._scorer('numpy', 'reference').calculate_scores(reference_data)
+
+    def test_unknown_mode(self):
+        """Test that an unknown percentile mode is rejected."""
+        with pytest.raises(ValueError, match="Unknown percentile mode"):
+            self._scorer('numpy', 'approximate')
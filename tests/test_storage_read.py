@@ -0,0 +1,184 @@
+"""Tests for streaming query results over the Storage Read API."""
+
+import threading
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+import pandas as pd
+import numpy as np
+import pyarrow as pa
+from part_priority_scoring import DataLoader, PartScorer, score_parts_iter
+from part_priority_scoring.config.settings import get_default_config
+from part_priority_scoring.core.storage_read import read_table_batches, QueryResultStream
+
+TABLE = SimpleNamespace(project='test-project', dataset_id='_anon', table_id='result')
+
+
+class FakeReadClient:
+    """Serves a table as serialized Arrow batches like ``BigQueryReadClient``."""
+
+    def __init__(self, table: pa.Table, batch_rows: int = 100, fail_stream: int = None):
+        self.table = table
+        self.batch_rows = batch_rows
+        self.fail_stream = fail_stream
+        self.sessions = []
+        self.active = 0
+        self.lock = threading.Lock()
+
+    def create_read_session(self, parent, read_session, max_stream_count):
+        columns = read_session['read_options'].get('selected_fields') or self.table.column_names
+        table = self.table.select(columns)
+        batches = table.to_batches(max_chunksize=self.batch_rows)
+        n_streams = min(max_stream_count, len(batches))
+        self.streams = {f'stream/{i}': batches[i::n_streams] for i in range(n_streams)}
+        session = SimpleNamespace(
+            table=read_session['table'],
+            streams=[SimpleNamespace(name=name) for name in self.streams],
+            arrow_schema=SimpleNamespace(serialized_schema=table.schema.serialize().to_pybytes())
+        )
+        self.sessions.append((parent, read_session, max_stream_count))
+        return session
+
+    def read_rows(self, name):
+        with self.lock:
+            self.active += 1
+        try:
+            for i, batch in enumerate(self.streams[name]):
+                if name == f'stream/{self.fail_stream}' and i == 1:
+                    raise RuntimeError("stream reset")
+                yield SimpleNamespace(arrow_record_batch=SimpleNamespace(
+                    serialized_record_batch=batch.serialize().to_pybytes()))
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def _parts(n, seed=0):
+    """Query result rows: part numbers and scoring inputs."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'pn': [f'PART{i:05d}' for i in range(n)],
+        'inventory': rng.integers(0, 2000, n),
+        'leadtime_weeks': rng.integers(0, 20, n),
+        'moq': rng.integers(1, 200, n).astype(float),
+        'demand_all_time': rng.integers(0, 1500, n),
+        'source_type': rng.choice(['Authorized', 'Other', None], n),
+        'datasheet': rng.choice(['url', None], n)
+    })
+
+
+def _sorted(df):
+    return df.sort_values('pn').reset_index(drop=True)
+
+
+class TestReadTableBatches:
+
+    def test_reads_every_row_over_parallel_streams(self):
+        """Test that all rows arrive once across the streams of one session."""
+        parts = _parts(1000)
+        client = FakeReadClient(pa.Table.from_pandas(parts, preserve_index=False))
+
+        batches = list(read_table_batches(client, TABLE, max_streams=4))
+
+        parent, read_session, max_streams = client.sessions[0]
+        assert parent == 'projects/test-project'
+        assert read_session['table'] == 'projects/test-project/datasets/_anon/tables/result'
+        assert read_session['data_format'] == 'ARROW'
+        assert len(batches) == 10 and len(client.streams) == 4
+        pd.testing.assert_frame_equal(_sorted(pa.Table.from_batches(batches).to_pandas()), parts)
+
+    def test_column_projection(self):
+        """Test that only the selected columns are requested and returned."""
+        client = FakeReadClient(pa.Table.from_pandas(_parts(50), preserve_index=False))
+
+        batches = list(read_table_batches(client, TABLE, columns=['pn', 'inventory']))
+
+        assert client.sessions[0][1]['read_options'] == {'selected_fields': ['pn', 'inventory']}
+        assert batches[0].schema.names == ['pn', 'inventory']
+
+    def test_empty_table(self):
+        """Test that a session without streams yields nothing."""
+        client = FakeReadClient(pa.Table.from_pandas(_parts(0), preserve_index=False))
+
+        assert list(read_table_batches(client, TABLE)) == []
+
+    def test_stream_error_is_raised(self):
+        """Test that a failing read stream surfaces in the consumer."""
+        client = FakeReadClient(pa.Table.from_pandas(_parts(1000), preserve_index=False), fail_stream=2)
+
+        with pytest.raises(RuntimeError, match="stream reset"):
+            list(read_table_batches(client, TABLE, max_streams=4))
+
+    def test_early_close_stops_readers(self):
+        """Test that closing the iterator stops blocked reader threads."""
+        client = FakeReadClient(pa.Table.from_pandas(_parts(5000), preserve_index=False), batch_rows=10)
+
+        batches = read_table_batches(client, TABLE, max_streams=4, prefetch=2)
+        next(batches)
+        batches.close()
+
+        assert client.active == 0
+
+    def test_invalid_max_streams(self):
+        """Test that max_streams must be positive."""
+        with pytest.raises(ValueError, match="max_streams"):
+            list(read_table_batches(FakeReadClient(pa.table({'pn': ['A']})), TABLE, max_streams=0))
+
+
+class TestStreamSampleData:
+
+    @patch('part_priority_scoring.core.data_loader.bigquery.Client')
+    def test_chunked_scoring_matches_in_memory(self, mock_client_class):
+        """Test that scoring the stream equals scoring the materialized result."""
+        parts = _parts(1500)
+        mock_client = Mock()
+        mock_client.query.return_value.destination = TABLE
+        mock_client_class.return_value = mock_client
+        read_client = FakeReadClient(pa.Table.from_pandas(parts, preserve_index=False))
+
+        stream = DataLoader(project_id='test-project').stream_sample_data(limit=1500, read_client=read_client)
+        scored = pd.concat(score_parts_iter(stream), ignore_index=True)
+
+        assert isinstance(stream, QueryResultStream)
+        mock_client.query.return_value.result.assert_called_once()
+        assert len(read_client.sessions) == 3  # one read session per ChunkedScorer pass
+        config = get_default_config()
+        config['engine'] = 'numpy'
+        expected = PartScorer(config).calculate_scores(parts)
+        for col in ['priority_score', 'score_percentile']:
+            np.testing.assert_array_equal(_sorted(scored)[col], _sorted(expected)[col])
+
+    @patch('part_priority_scoring.core.data_loader.bigquery.Client')
+    def test_prefitted_state_reads_once(self, mock_client_class):
+        """Test that scoring chunks against a fitted state opens a single read session."""
+        parts = _parts(1500)
+        mock_client_class.return_value.query.return_value.destination = TABLE
+        read_client = FakeReadClient(pa.Table.from_pandas(parts, preserve_index=False))
+        config = get_default_config()
+        config['engine'] = 'numpy'
+        scorer = PartScorer(config).fit(parts)
+
+        stream = DataLoader(project_id='test-project').stream_sample_data(limit=1500, read_client=read_client)
+        scored = pd.concat([scorer.score(chunk) for chunk in stream], ignore_index=True)
+
+        assert len(read_client.sessions) == 1
+        expected = scorer.score(parts)
+        np.testing.assert_array_equal(_sorted(scored)['priority_score'], _sorted(expected)['priority_score'])
+
+    @patch('part_priority_scoring.core.data_loader.default_read_client')
+    @patch('part_priority_scoring.core.data_loader.bigquery.Client')
+    def test_read_client_uses_loader_credentials(self, mock_client_class, mock_read_client):
+        """Test that the default read client gets the loader's credentials."""
+        credentials = object()
+        mock_client_class.return_value.query.return_value.destination = TABLE
+
+        DataLoader(project_id='test-project', credentials=credentials).stream_sample_data()
+
+        mock_client_class.assert_called_once_with(project='test-project', credentials=credentials)
+        mock_read_client.assert_called_once_with(credentials)
+
+    def test_no_client(self):
+        """Test that streaming without a BigQuery client raises."""
+        with pytest.raises(ValueError, match="BigQuery client not initialized"):
+            DataLoader().stream_sample_data()
@@ -0,0 +1,88 @@
+"""Tests for out-of-core chunked scoring."""
+
+import pytest
+import pandas as pd
+import numpy as np
+from part_priority_scoring import PartScorer, ChunkedScorer, score_parts_iter
+from part_priority_scoring.config.settings import get_default_config
+from part_priority_scoring.core.sketch import QuantileSketch
+
+
+def _parts(n, seed=3):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'pn': [f'PART{i:05d}' for i in range(n)],
+        'inventory': rng.integers(0, 2000, n),
+        'leadtime_weeks': rng.integers(0, 20, n),
+        'moq': rng.integers(1, 200, n),
+        'demand_all_time': rng.integers(0, 1500, n),
+        'source_type': rng.choice(['Authorized', 'Other'], n)
+    })
+
+
+def _chunks(df, size):
+    return [df.iloc[i:i + size] for i in range(0, len(df), size)]
+
+
+class TestChunkedScoring:
+
+    def test_matches_in_memory_scoring(self):
+        """Test that chunked scores equal scoring the concatenated table."""
+        df = _parts(900)
+        config = get_default_config()
+        config['engine'] = 'numpy'
+        expected = PartScorer(config).calculate_scores(df).sort_index()
+
+        actual = pd.concat(score_parts_iter(_chunks(df, 200)))
+
+        for col in ['base_score', 'boosted_score', 'priority_score', 'score_percentile']:
+            np.testing.assert_array_equal(actual[col].values, expected[col].values)
+
+    def test_large_table_is_approximately_global(self):
+        """Test that scores stay globally consistent once sketches compact."""
+        df = _parts(20000)
+        config = get_default_config()
+        config['engine'] = 'numpy'
+        expected = PartScorer(config).calculate_scores(df).sort_index()
+
+        scorer = ChunkedScorer(sketch_k=256).fit(lambda: iter(_chunks(df, 3000)))
+        actual = pd.concat(scorer.score_iter(lambda: iter(_chunks(df, 3000))))
+
+        assert not scorer.score_sketch.is_exact
+        global_rank = actual['priority_score'].rank(pct=True) * 100
+        assert np.abs(actual['score_percentile'] - global_rank).max() < 1.0
+        assert np.corrcoef(actual['priority_score'], expected['priority_score'])[0, 1] > 0.99
+
+    def test_one_shot_iterator_rejected(self):
+        """Test that a generator cannot be used for multiple passes."""
+        chunks = iter(_chunks(_parts(10), 5))
+
+        with pytest.raises(ValueError, match="one-shot iterator"):
+            ChunkedScorer().fit(chunks)
+
+    def test_score_without_fit(self):
+        """Test that emitting before fitting raises an error."""
+        with pytest.raises(ValueError, match="Scorer not fitted"):
+            next(ChunkedScorer().score_iter([_parts(5)]))
+
+
+class TestQuantileSketch:
+
+    def test_exact_before_compaction(self):
+        """Test that small inputs give np.percentile results."""
+        values = np.random.default_rng(0).normal(size=500)
+        sketch = QuantileSketch(k=1024).update(values[:300]).merge(QuantileSketch(k=1024).update(values[300:]))
+
+        assert sketch.is_exact
+        np.testing.assert_array_equal(sketch.quantiles([0.25, 0.5, 0.75]),
+                                      np.percentile(values, [25, 50, 75]))
+
+    def test_rank_error_after_compaction(self):
+        """Test that compacted quantiles stay within the rank error bound."""
+        values = np.random.default_rng(1).lognormal(size=200000)
+        sketch = QuantileSketch(k=512)
+        for chunk in np.array_split(values, 10):
+            sketch.update(chunk)
+
+        for q in [0.25, 0.5, 0.75]:
+            assert abs((values < sketch.quantile(q)).mean() - q) < 0.01